@@ -0,0 +1 @@
+default_app_config = 'burnout_prevention.analytics.apps.AnalyticsConfig' 
\ No newline at end of file
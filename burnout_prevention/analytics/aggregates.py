@@ -0,0 +1,61 @@
+from django.db.models import Avg, Count, FloatField, Max, Min, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def window_metrics(avg_fields=(), extreme_fields=(), condition=None, rollup=None):
+    """
+    Возвращает агрегаты count, avg_<поле> для avg_fields, min_<поле> и max_<поле>
+    для extreme_fields по записям, удовлетворяющим условию condition.
+
+    Если задано описание сводки rollup (см. analytics.rollups.DAILY_METRICS_ROLLUPS),
+    выборка состоит из предварительно агрегированных строк: количество и средние
+    считаются по полям сумм и количеств, минимум и максимум - по полям экстремумов.
+    """
+    if rollup is None:
+        metrics = {'count': Count('pk', filter=condition)}
+        for field in avg_fields:
+            metrics[f'avg_{field}'] = Avg(field, filter=condition)
+        for field in extreme_fields:
+            metrics[f'min_{field}'] = Min(field, filter=condition)
+            metrics[f'max_{field}'] = Max(field, filter=condition)
+        return metrics
+
+    metrics = {'count': Coalesce(Sum(rollup['count'], filter=condition), 0)}
+    for field in avg_fields:
+        sum_field, count_field = rollup['averages'][field]
+        metrics[f'avg_{field}'] = Cast(Sum(sum_field, filter=condition), FloatField()) / NullIf(
+            Sum(count_field, filter=condition), 0
+        )
+    for field in extreme_fields:
+        min_field, max_field = rollup['extremes'][field]
+        metrics[f'min_{field}'] = Min(min_field, filter=condition)
+        metrics[f'max_{field}'] = Max(max_field, filter=condition)
+    return metrics
+
+
+def aggregate_windows(queryset, windows, avg_fields=(), extreme_fields=(), rollup=None):
+    """
+    Считает показатели выборки сразу для нескольких временных окон одним запросом
+    (условной агрегацией).
+
+    windows - словарь {название окна: Q-условие попадания записи в окно}.
+    Для каждого окна возвращаются показатели window_metrics.
+
+    Returns:
+        dict: {название окна: {название показателя: значение}}
+    """
+    aggregates = {}
+    targets = {}
+    for window, condition in windows.items():
+        metrics = window_metrics(avg_fields, extreme_fields, condition, rollup)
+        for name, aggregate in metrics.items():
+            alias = f'{window}_{name}'
+            aggregates[alias] = aggregate
+            targets[alias] = (window, name)
+
+    result = {window: {} for window in windows}
+    for alias, value in queryset.aggregate(**aggregates).items():
+        window, name = targets[alias]
+        result[window][name] = value
+    return result
+
@@ -0,0 +1,166 @@
+import math
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from burnout_prevention.users.models import User
+from .models import StressLevel, StressBaseline
+
+
+# Вес новой оценки в экспоненциально взвешенных среднем и дисперсии
+STRESS_EWMA_ALPHA = 0.1
+# Оценка аномальна, если отклоняется от среднего больше чем на указанное число стандартных отклонений
+STRESS_ANOMALY_THRESHOLD = 3.0
+# Количество оценок, после которого базовый уровень считается установившимся
+STRESS_ANOMALY_MIN_READINGS = 5
+# Начальное стандартное отклонение (начальное среднее - User.stress_level_base)
+# и нижняя граница стандартного отклонения, чтобы серия одинаковых оценок
+# не делала аномальными небольшие колебания
+STRESS_BASELINE_INITIAL_STD = 15.0
+STRESS_BASELINE_MIN_STD = 5.0
+# Период (в днях, включая день расчета), за который аномалии учитываются в риске выгорания
+STRESS_ANOMALY_WINDOW_DAYS = 7
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def new_stress_baseline(user_id, stress_level_base):
+    """
+    Возвращает несохраненный начальный базовый уровень стресса пользователя.
+    """
+    return StressBaseline(
+        user_id=user_id,
+        mean=float(stress_level_base),
+        variance=STRESS_BASELINE_INITIAL_STD ** 2,
+        readings_count=0
+    )
+
+
+def observe_stress_level(baseline, level):
+    """
+    Оценивает отклонение оценки стресса от базового уровня и обновляет базовый
+    уровень этой оценкой (за O(1), без обращения к базе данных).
+
+    Returns:
+        tuple: (z_score, is_anomaly)
+    """
+    diff = level - baseline.mean
+    z_score = diff / max(math.sqrt(baseline.variance), STRESS_BASELINE_MIN_STD)
+    is_anomaly = (
+        baseline.readings_count >= STRESS_ANOMALY_MIN_READINGS
+        and abs(z_score) >= STRESS_ANOMALY_THRESHOLD
+    )
+
+    increment = STRESS_EWMA_ALPHA * diff
+    baseline.mean += increment
+    baseline.variance = (1 - STRESS_EWMA_ALPHA) * (baseline.variance + diff * increment)
+    baseline.readings_count += 1
+    return z_score, is_anomaly
+
+
+def detect_stress_anomalies(user, records):
+    """
+    Обновляет базовый уровень стресса пользователя новыми записями (в порядке списка)
+    и заполняет их поля z_score и is_anomaly. Записи не сохраняются.
+
+    Базовый уровень блокируется на время обновления, поэтому одновременные записи
+    пользователя учитываются последовательно.
+    """
+    with transaction.atomic():
+        baseline, _ = StressBaseline.objects.select_for_update().get_or_create(
+            user_id=user.pk,
+            defaults={
+                'mean': float(user.stress_level_base),
+                'variance': STRESS_BASELINE_INITIAL_STD ** 2,
+            }
+        )
+        for record in records:
+            record.z_score, record.is_anomaly = observe_stress_level(baseline, record.level)
+        baseline.save(update_fields=['mean', 'variance', 'readings_count', 'updated_at'])
+
+
+def is_backdated_stress_reading(user, created_at):
+    """
+    Проверяет, раньше ли created_at последней оценки стресса пользователя. Такую оценку
+    нельзя учесть обновлением базового уровня: он уже включает более поздние оценки.
+    """
+    latest = StressLevel.objects.filter(user_id=user.pk).aggregate(latest=Max('created_at'))['latest']
+    return latest is not None and created_at < latest
+
+
+def rebuild_stress_baselines(user_ids=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Пересчитывает базовые уровни и отметки аномалий указанных пользователей
+    (по умолчанию - всех), последовательно проходя историю их записей о стрессе.
+    Пользователи обрабатываются порциями по chunk_size, записи читаются потоком;
+    сохраняются только изменившиеся отметки.
+
+    Returns:
+        int: Количество записей, у которых изменились отметки
+    """
+    users = User.objects.order_by('pk')
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    users = list(users.values_list('pk', 'stress_level_base'))
+
+    changed = 0
+    for start in range(0, len(users), chunk_size):
+        chunk = dict(users[start:start + chunk_size])
+        baselines = {}
+        updates = []
+        rows = StressLevel.objects.filter(user_id__in=chunk).order_by(
+            'user_id', 'created_at', 'id'
+        ).values_list('id', 'user_id', 'level', 'z_score', 'is_anomaly').iterator(chunk_size=2000)
+
+        for record_id, user_id, level, z_score, is_anomaly in rows:
+            if user_id not in baselines:
+                baselines[user_id] = new_stress_baseline(user_id, chunk[user_id])
+            new_z_score, new_is_anomaly = observe_stress_level(baselines[user_id], level)
+            if new_z_score != z_score or new_is_anomaly != is_anomaly:
+                updates.append(StressLevel(id=record_id, z_score=new_z_score, is_anomaly=new_is_anomaly))
+
+        with transaction.atomic():
+            StressLevel.objects.bulk_update(updates, ['z_score', 'is_anomaly'], batch_size=1000)
+            StressBaseline.objects.filter(user_id__in=chunk).delete()
+            StressBaseline.objects.bulk_create(baselines.values(), batch_size=1000)
+        changed += len(updates)
+    return changed
+
+
+def stress_anomaly_counts(user, dates):
+    """
+    Для каждой даты возвращает количество аномальных оценок стресса пользователя
+    за STRESS_ANOMALY_WINDOW_DAYS дней, заканчивая этой датой.
+
+    dates - отсортированный по возрастанию список дат.
+    """
+    if not dates:
+        return []
+    window = timedelta(days=STRESS_ANOMALY_WINDOW_DAYS - 1)
+    by_day = Counter(StressLevel.objects.filter(
+        user=user,
+        is_anomaly=True,
+        local_date__gte=dates[0] - window,
+        local_date__lte=dates[-1]
+    ).values_list('local_date', flat=True))
+    return [
+        sum(count for day, count in by_day.items() if date - window <= day <= date)
+        for date in dates
+    ]
+
+
+def population_stress_anomaly_counts(queryset, as_of):
+    """
+    Количество аномальных оценок стресса за STRESS_ANOMALY_WINDOW_DAYS дней,
+    заканчивая датой as_of, по пользователям (одним сгруппированным запросом).
+
+    Returns:
+        dict: user_id -> количество
+    """
+    return dict(queryset.filter(
+        is_anomaly=True,
+        local_date__gte=as_of - timedelta(days=STRESS_ANOMALY_WINDOW_DAYS - 1),
+        local_date__lte=as_of
+    ).order_by().values('user_id').annotate(count=Count('id')).values_list('user_id', 'count'))
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from burnout_prevention.users.models import User
+from .anomalies import population_stress_anomaly_counts
+from .models import BurnoutRisk, StressLevel, UserDailyMetrics
+from .risk_models import get_risk_model
+from .sharding import run_sharded, shard_queryset
+from .signals import burnout_risk_updated
+
+
+DEFAULT_CHUNK_SIZE = 2000
+# Период (в днях, включая дату расчета), сводки за который читаются потоком
+DEFAULT_LOOKBACK_DAYS = 30
+
+# Потоки данных дневных сводок: поле количества записей -> поля значений последней записи
+DAILY_METRICS_STREAMS = {
+    'work_count': ('work_duration_last',),
+    'sleep_count': ('sleep_duration_last', 'sleep_quality_last'),
+    'stress_count': ('stress_last',),
+}
+
+
+def _latest_daily_metrics(queryset, user_ids, as_of, lookback_days, chunk_size):
+    """
+    Значения последних на дату as_of записей о работе, сне и стрессе каждого
+    пользователя из дневных сводок (как при расчете риска по одному пользователю).
+
+    Потоком читаются только сводки за lookback_days дней, заканчивая as_of, поэтому
+    время расчета не зависит от длины истории. Для пользователей без данных потока
+    в этом периоде последняя сводка ищется отдельным запросом.
+
+    Returns:
+        dict: поле количества записей потока -> {user_id: кортеж значений}
+    """
+    window_start = as_of - timedelta(days=lookback_days - 1)
+    count_fields = list(DAILY_METRICS_STREAMS)
+    value_fields = [field for fields in DAILY_METRICS_STREAMS.values() for field in fields]
+    latest = {count_field: {} for count_field in count_fields}
+
+    positions = {}
+    offset = 1 + len(count_fields)
+    for count_field, fields in DAILY_METRICS_STREAMS.items():
+        positions[count_field] = (1 + count_fields.index(count_field), offset, offset + len(fields))
+        offset += len(fields)
+
+    rows = queryset.filter(date__gte=window_start, date__lte=as_of).order_by('user_id', '-date').values_list(
+        'user_id', *count_fields, *value_fields
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        for count_field, (count_position, start, end) in positions.items():
+            if row[count_position] and row[0] not in latest[count_field]:
+                latest[count_field][row[0]] = row[start:end]
+
+    for count_field, fields in DAILY_METRICS_STREAMS.items():
+        missing = [user_id for user_id in user_ids if user_id not in latest[count_field]]
+        last_date = UserDailyMetrics.objects.filter(
+            user_id=OuterRef('user_id'),
+            date__lt=window_start,
+            **{f'{count_field}__gt': 0}
+        ).order_by('-date').values('date')[:1]
+        for start in range(0, len(missing), chunk_size):
+            rows = UserDailyMetrics.objects.filter(
+                user_id__in=missing[start:start + chunk_size],
+                date=Subquery(last_date)
+            ).values_list('user_id', *fields)
+            latest[count_field].update((row[0], row[1:]) for row in rows)
+    return latest
+
+
+def score_burnout_risk_shard(as_of, shard_index=0, shard_count=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                             save=True, model_version=None, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    """
+    Рассчитывает риск выгорания на дату as_of для всех активных пользователей шарда
+    векторно (массивами numpy) и сохраняет результаты в BurnoutRisk.
+    После сохранения каждого пакета отправляется burnout_risk_updated.
+
+    Returns:
+        int: Количество обработанных пользователей
+    """
+    model = get_risk_model(model_version)
+    user_ids = list(shard_queryset(
+        User.objects.filter(is_active=True), shard_index, shard_count
+    ).order_by('id').values_list('id', flat=True))
+    if not user_ids:
+        return 0
+
+    latest = _latest_daily_metrics(
+        shard_queryset(UserDailyMetrics.objects.all(), shard_index, shard_count, field='user_id'),
+        user_ids, as_of, lookback_days, chunk_size
+    )
+    latest_work, latest_sleep, latest_stress = latest['work_count'], latest['sleep_count'], latest['stress_count']
+
+    def column(latest, position):
+        values = [latest.get(user_id, (None, None))[position] for user_id in user_ids]
+        return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+    inputs = {
+        'work_hours': column(latest_work, 0),
+        'stress_level': column(latest_stress, 0),
+        'sleep_hours': column(latest_sleep, 0),
+        'sleep_quality': column(latest_sleep, 1),
+    }
+    if 'stress_anomalies' in model.inputs:
+        anomalies = population_stress_anomaly_counts(
+            shard_queryset(StressLevel.objects.all(), shard_index, shard_count, field='user_id'), as_of
+        )
+        inputs['stress_anomalies'] = np.array([anomalies.get(user_id, 0) for user_id in user_ids], dtype=float)
+
+    risk_level, points, _ = model.score(**inputs)
+
+    if not save:
+        return len(user_ids)
+
+    risk_level = risk_level.tolist()
+    points = {name: factor_points.tolist() for name, factor_points in points.items()}
+
+    for start in range(0, len(user_ids), chunk_size):
+        snapshots = []
+        for index in range(start, min(start + chunk_size, len(user_ids))):
+            user_points = {name: factor_points[index] for name, factor_points in points.items()}
+            snapshots.append(BurnoutRisk(
+                user_id=user_ids[index],
+                date=as_of,
+                risk_level=risk_level[index],
+                factors=model.build_factors(user_points),
+                recommendations=model.build_recommendations(user_points),
+                model_version=model.version
+            ))
+        BurnoutRisk.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=['risk_level', 'factors', 'recommendations', 'model_version']
+        )
+        burnout_risk_updated.send(sender=BurnoutRisk, user_ids=user_ids[start:start + chunk_size])
+
+    return len(user_ids)
+
+
+def score_burnout_risk_population(as_of=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, save=True,
+                                  model_version=None):
+    """
+    Рассчитывает риск выгорания на дату as_of для всех активных пользователей.
+    При workers > 1 пользователи распределяются по шардам, которые обрабатываются
+    в отдельных процессах. Если версия модели не указана, используется активная.
+
+    Returns:
+        int: Количество обработанных пользователей
+    """
+    if as_of is None:
+        as_of = timezone.localdate()
+
+    return run_sharded(
+        score_burnout_risk_shard,
+        workers,
+        as_of=as_of,
+        chunk_size=chunk_size,
+        save=save,
+        model_version=model_version
+    )
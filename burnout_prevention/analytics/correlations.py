@@ -0,0 +1,240 @@
+from datetime import datetime, timedelta
+from itertools import groupby
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import UserDailyMetrics
+from .rollups import DAILY_METRICS_ROLLUPS
+
+
+# Показатели сна, влияние которых оценивается, и показатели, на которые оно оценивается
+# (поток данных, показатель из DAILY_METRICS_ROLLUPS)
+CORRELATION_PREDICTORS = [('sleep', 'duration_hours'), ('sleep', 'quality')]
+CORRELATION_TARGETS = [('stress', 'level'), ('work', 'productivity')]
+
+# Период анализа - полные недели перед неделей расчета
+CORRELATION_PERIOD_DAYS = 84
+DEFAULT_CORRELATION_LAGS = (1,)
+MAX_CORRELATION_LAG = 7
+# Минимальное количество пар наблюдений для расчета корреляции
+MIN_CORRELATION_SAMPLES = 5
+
+CORRELATION_CACHE_TIMEOUT = 8 * 24 * 60 * 60
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _feature_fields():
+    """
+    Возвращает список (название показателя, поле суммы, поле количества) в сводке.
+    """
+    return [
+        (f'{stream}.{metric}', *DAILY_METRICS_ROLLUPS[stream]['averages'][metric])
+        for stream, metric in CORRELATION_PREDICTORS + CORRELATION_TARGETS
+    ]
+
+
+def correlation_period(as_of=None):
+    """
+    Возвращает неделю расчета и период анализа для даты as_of (по умолчанию сегодня).
+    Период заканчивается в последний день предыдущей недели, поэтому результаты
+    не меняются в течение недели и могут храниться в кэше до ее окончания.
+
+    Returns:
+        tuple: (week_start, start_date, end_date)
+    """
+    if as_of is None:
+        as_of = timezone.localdate()
+    week_start = as_of - timedelta(days=as_of.weekday())
+    end_date = week_start - timedelta(days=1)
+    start_date = end_date - timedelta(days=CORRELATION_PERIOD_DAYS - 1)
+    return week_start, start_date, end_date
+
+
+def parse_correlation_params(params):
+    """
+    Разбирает параметры запроса корреляций: date (YYYY-MM-DD, любой день недели расчета)
+    и lags (сдвиги в днях через запятую).
+
+    Raises:
+        ValueError: Неверный формат даты или сдвигов
+
+    Returns:
+        tuple: (as_of, lags)
+    """
+    date_str = params.get('date')
+    try:
+        as_of = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else timezone.localdate()
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+    lags_str = params.get('lags')
+    try:
+        lags = tuple(sorted({int(lag) for lag in lags_str.split(',')})) if lags_str else DEFAULT_CORRELATION_LAGS
+    except ValueError:
+        lags = ()
+    if not lags or not all(0 <= lag <= MAX_CORRELATION_LAG for lag in lags):
+        raise ValueError(f"Invalid lags. Use comma-separated integers from 0 to {MAX_CORRELATION_LAG}")
+    return as_of, lags
+
+
+def _rankdata(values):
+    """
+    Ранги значений (начиная с 1); одинаковым значениям присваивается средний ранг.
+    """
+    sorter = np.argsort(values, kind='mergesort')
+    inverse = np.empty(sorter.size, dtype=np.intp)
+    inverse[sorter] = np.arange(sorter.size)
+
+    ordered = values[sorter]
+    is_first = np.r_[True, ordered[1:] != ordered[:-1]]
+    group = is_first.cumsum()[inverse]
+    bounds = np.r_[np.nonzero(is_first)[0], is_first.size]
+    return 0.5 * (bounds[group] + bounds[group - 1] + 1)
+
+
+def _pearson(x, y):
+    """
+    Коэффициент корреляции Пирсона или None, если один из рядов постоянен.
+    """
+    x = x - x.mean()
+    y = y - y.mean()
+    denominator = np.sqrt(np.dot(x, x) * np.dot(y, y))
+    if denominator == 0:
+        return None
+    return float(np.clip(np.dot(x, y) / denominator, -1.0, 1.0))
+
+
+def _daily_series(rows, start_date, days):
+    """
+    Раскладывает сводки по дням периода в массивы средних значений показателей
+    (NaN - нет данных за день).
+
+    rows - кортежи (дата, поля суммы и количества показателей в порядке _feature_fields).
+
+    Returns:
+        dict: название показателя -> массив длины days
+    """
+    features = _feature_fields()
+    series = {name: np.full(days, np.nan) for name, _, _ in features}
+    if not rows:
+        return series
+
+    offsets = np.fromiter(((row[0] - start_date).days for row in rows), dtype=np.intp, count=len(rows))
+    values = np.array([row[1:] for row in rows], dtype=float)
+    for position, (name, _, _) in enumerate(features):
+        sums, counts = values[:, 2 * position], values[:, 2 * position + 1]
+        present = counts > 0
+        series[name][offsets[present]] = sums[present] / counts[present]
+    return series
+
+
+def correlate_series(series, lags):
+    """
+    Считает корреляции Пирсона и Спирмена между показателями сна за день и
+    показателями стресса и работы через lag дней.
+
+    Returns:
+        list: [{'x', 'y', 'lag', 'samples', 'pearson', 'spearman'}]
+    """
+    results = []
+    for x_stream, x_metric in CORRELATION_PREDICTORS:
+        x_name = f'{x_stream}.{x_metric}'
+        for y_stream, y_metric in CORRELATION_TARGETS:
+            y_name = f'{y_stream}.{y_metric}'
+            for lag in lags:
+                x = series[x_name][:series[x_name].size - lag]
+                y = series[y_name][lag:]
+                paired = ~(np.isnan(x) | np.isnan(y))
+                x, y = x[paired], y[paired]
+
+                pearson = spearman = None
+                if x.size >= MIN_CORRELATION_SAMPLES:
+                    pearson = _pearson(x, y)
+                    spearman = _pearson(_rankdata(x), _rankdata(y))
+                results.append({
+                    'x': x_name,
+                    'y': y_name,
+                    'lag': lag,
+                    'samples': int(x.size),
+                    'pearson': pearson,
+                    'spearman': spearman,
+                })
+    return results
+
+
+def _metrics_rows(queryset):
+    """
+    Выборка сводок в формате строк для _daily_series (с id пользователя в начале).
+    """
+    fields = [field for _, sum_field, count_field in _feature_fields() for field in (sum_field, count_field)]
+    return queryset.order_by('user_id', 'date').values_list('user_id', 'date', *fields)
+
+
+def _build_result(week_start, start_date, end_date, lags, rows):
+    return {
+        'week_start': week_start,
+        'start_date': start_date,
+        'end_date': end_date,
+        'lags': list(lags),
+        'correlations': correlate_series(
+            _daily_series([row[1:] for row in rows], start_date, CORRELATION_PERIOD_DAYS), lags
+        ),
+    }
+
+
+def correlations_cache_key(user_id, week_start, lags):
+    """
+    Ключ кэша корреляций пользователя за неделю расчета.
+    """
+    return f"correlations:{user_id}:{week_start.isoformat()}:{'-'.join(map(str, lags))}"
+
+
+def user_correlations(user, as_of=None, lags=DEFAULT_CORRELATION_LAGS):
+    """
+    Возвращает корреляции показателей пользователя для недели, в которую входит as_of.
+    Результат хранится в кэше до конца недели расчета.
+
+    Returns:
+        dict: {'week_start', 'start_date', 'end_date', 'lags', 'correlations'}
+    """
+    week_start, start_date, end_date = correlation_period(as_of)
+    key = correlations_cache_key(user.pk, week_start, lags)
+    result = cache.get(key)
+    if result is None:
+        rows = _metrics_rows(UserDailyMetrics.objects.filter(
+            user=user, date__gte=start_date, date__lte=end_date
+        ))
+        result = _build_result(week_start, start_date, end_date, lags, list(rows))
+        cache.set(key, result, CORRELATION_CACHE_TIMEOUT)
+    return result
+
+
+def compute_population_correlations(as_of=None, lags=DEFAULT_CORRELATION_LAGS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Рассчитывает и кэширует корреляции всех активных пользователей, у которых есть
+    сводки за период анализа, одним потоковым проходом по сводкам.
+
+    Returns:
+        int: Количество обработанных пользователей
+    """
+    week_start, start_date, end_date = correlation_period(as_of)
+    rows = _metrics_rows(UserDailyMetrics.objects.filter(
+        user__is_active=True, date__gte=start_date, date__lte=end_date
+    )).iterator(chunk_size=chunk_size)
+
+    processed = 0
+    pending = {}
+    for user_id, user_rows in groupby(rows, key=lambda row: row[0]):
+        pending[correlations_cache_key(user_id, week_start, lags)] = _build_result(
+            week_start, start_date, end_date, lags, list(user_rows)
+        )
+        if len(pending) >= chunk_size:
+            cache.set_many(pending, CORRELATION_CACHE_TIMEOUT)
+            processed += len(pending)
+            pending = {}
+    if pending:
+        cache.set_many(pending, CORRELATION_CACHE_TIMEOUT)
+        processed += len(pending)
+    return processed
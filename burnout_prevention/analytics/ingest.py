@@ -0,0 +1,59 @@
+from django.db import transaction
+
+from .anomalies import detect_stress_anomalies, is_backdated_stress_reading, rebuild_stress_baselines
+from .models import StressLevel
+from .rollups import refresh_daily_metrics
+from .signals import record_day, records_bulk_created, schedule_burnout_risk_recompute
+
+
+BULK_CREATE_BATCH_SIZE = 500
+
+
+def bulk_create_records(model, user, records, batch_size=BULK_CREATE_BATCH_SIZE):
+    """
+    Создает записи о стрессе, сне или работе пользователя пакетно (bulk_create порциями
+    по batch_size) в одной транзакции.
+
+    bulk_create не отправляет pre_save и post_save, поэтому здесь же оценки стресса
+    сравниваются с базовым уровнем пользователя, обновляются дневные сводки
+    за затронутые дни, ставится в очередь пересчет риска выгорания с самого раннего дня
+    и после фиксации транзакции отправляется сигнал records_bulk_created.
+
+    Если среди оценок стресса есть более ранние, чем уже сохраненные, базовый уровень
+    и отметки аномалий пользователя пересчитываются по всей его истории.
+
+    records - список словарей с проверенными значениями полей (для записей о стрессе
+    может быть указано время создания created_at).
+
+    Returns:
+        list: Созданные объекты
+    """
+    if not records:
+        return []
+
+    instances = [model(user=user, **record) for record in records]
+    backdated = False
+    with transaction.atomic():
+        if model is StressLevel:
+            # Базовый уровень обновляется в порядке времени оценок (оно может быть указано в записях)
+            readings = sorted(instances, key=lambda instance: instance.created_at)
+            backdated = is_backdated_stress_reading(user, readings[0].created_at)
+            if not backdated:
+                detect_stress_anomalies(user, readings)
+        instances = model.objects.bulk_create(instances, batch_size=batch_size)
+        if backdated:
+            rebuild_stress_baselines(user_ids=[user.id])
+            scores = {
+                pk: (z_score, is_anomaly)
+                for pk, z_score, is_anomaly in StressLevel.objects.filter(
+                    pk__in=[instance.pk for instance in instances]
+                ).values_list('pk', 'z_score', 'is_anomaly')
+            }
+            for instance in instances:
+                instance.z_score, instance.is_anomaly = scores[instance.pk]
+        days = {record_day(instance) for instance in instances}
+        refresh_daily_metrics(user.id, days)
+        schedule_burnout_risk_recompute(user.id, min(days))
+        # Кэши сбрасываются после фиксации, иначе параллельный запрос может закэшировать старые данные
+        transaction.on_commit(lambda: records_bulk_created.send(sender=model, user_id=user.id, days=days))
+    return instances
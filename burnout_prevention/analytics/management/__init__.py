@@ -0,0 +1 @@
+# Initialize management package 
\ No newline at end of file
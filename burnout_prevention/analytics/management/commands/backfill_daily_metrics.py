@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from burnout_prevention.analytics.rollups import DEFAULT_CHUNK_SIZE, rebuild_daily_metrics
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает дневные сводки пользователей по записям о стрессе, сне и работе'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='ID пользователя (можно указать несколько раз; по умолчанию все пользователи)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Количество пользователей в порции')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_daily_metrics(options['user_ids'], chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Сохранено {count} дневных сводок за {elapsed:.2f} с'
+        ))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from burnout_prevention.analytics.anomalies import DEFAULT_CHUNK_SIZE, rebuild_stress_baselines
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает базовые уровни стресса пользователей и отметки аномальных оценок, '
+        'последовательно проходя историю записей о стрессе'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='ID пользователя (можно указать несколько раз; по умолчанию все пользователи)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Количество пользователей в порции')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_stress_baselines(options['user_ids'], chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлены отметки {count} записей о стрессе за {elapsed:.2f} с'
+        ))
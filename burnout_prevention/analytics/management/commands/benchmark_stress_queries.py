@@ -0,0 +1,118 @@
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Avg, Count
+from django.utils import timezone
+
+from burnout_prevention.users.models import User
+from burnout_prevention.analytics.ingest import bulk_create_records
+from burnout_prevention.analytics.models import StressLevel
+
+
+BENCHMARK_EMAIL_DOMAIN = 'benchmark.local'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает планы выполнения и время запросов к StressLevel по created_at__date '
+        '(преобразование столбца) и по условиям, использующим составные индексы '
+        '(local_date, граница created_at). Для наполнения используйте отдельную базу данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help=(
+                'Создать тестовых пользователей и записать в базу данных указанное количество записей '
+                'о стрессе (с дневными сводками и оценкой аномалий)'
+            )
+        )
+        parser.add_argument('--users', type=int, default=1000, help='Количество тестовых пользователей при наполнении')
+        parser.add_argument('--days', type=int, default=365, help='Глубина наполнения и период запросов в днях')
+        parser.add_argument('--user', type=int, help='ID пользователя для запросов (по умолчанию первый тестовый)')
+        parser.add_argument('--repeat', type=int, default=20, help='Количество повторов каждого запроса')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'], options['users'], options['days'])
+
+        if options['user']:
+            user = User.objects.filter(pk=options['user']).first()
+        else:
+            user = User.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").order_by('pk').first()
+        if user is None:
+            raise CommandError('Пользователь не найден. Укажите --user или выполните наполнение (--seed)')
+
+        today = timezone.localdate()
+        start_date = today - timedelta(days=options['days'])
+        user_records = StressLevel.objects.filter(user=user)
+
+        queries = [
+            ('Статистика за период (created_at__date)', user_records.filter(
+                created_at__date__gte=start_date,
+                created_at__date__lte=today
+            )),
+            ('Статистика за период (local_date)', user_records.filter(
+                local_date__gte=start_date,
+                local_date__lte=today
+            )),
+            ('Последняя запись на дату (created_at__date)', user_records.filter(
+                created_at__date__lte=today
+            ).order_by('-created_at', '-id')[:1]),
+            ('Последняя запись на дату (created_at < начала следующего дня)', user_records.filter(
+                created_at__lt=timezone.make_aware(datetime.combine(today + timedelta(days=1), datetime.min.time()))
+            ).order_by('-created_at', '-id')[:1]),
+        ]
+
+        self.stdout.write(f'Записей о стрессе всего: {StressLevel.objects.count()}, у пользователя {user.pk}: {user_records.count()}')
+        for title, queryset in queries:
+            if queryset.query.is_sliced:
+                run = lambda queryset=queryset: list(queryset.all())
+            else:
+                run = lambda queryset=queryset: queryset.aggregate(avg=Avg('level'), count=Count('pk'))
+                queryset = queryset.order_by()
+
+            run()
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                run()
+            elapsed = (time.perf_counter() - started) / options['repeat'] * 1000
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{title}: {elapsed:.2f} мс'))
+            self.stdout.write(queryset.explain())
+
+    def seed(self, count, users_count, days):
+        """
+        Создает тестовых пользователей и записи о стрессе за последние days дней.
+        Записи создаются через bulk_create_records, поэтому дневные сводки, базовый уровень
+        стресса и кэш обновляются так же, как при пакетной загрузке через API.
+        """
+        users = [
+            User(email=f'stress{index}@{BENCHMARK_EMAIL_DOMAIN}', username=f'stress_benchmark_{index}')
+            for index in range(users_count)
+        ]
+        User.objects.bulk_create(users, batch_size=1000, ignore_conflicts=True)
+        users = list(User.objects.filter(email__endswith=f'@{BENCHMARK_EMAIL_DOMAIN}').order_by('pk'))
+
+        rnd = random.Random(0)
+        now = timezone.now()
+        records = defaultdict(list)
+        for _ in range(count):
+            records[rnd.randrange(len(users))].append({
+                'level': rnd.randint(0, 100),
+                'created_at': now - timedelta(seconds=rnd.randint(0, days * 86400))
+            })
+
+        started = time.perf_counter()
+        for index, user_records in records.items():
+            bulk_create_records(StressLevel, users[index], user_records)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано {count} записей о стрессе для {len(users)} пользователей '
+            f'за {time.perf_counter() - started:.1f} с'
+        ))
@@ -0,0 +1,90 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from burnout_prevention.users.models import User
+from burnout_prevention.analytics.batch_scoring import (
+    DEFAULT_CHUNK_SIZE,
+    score_burnout_risk_population
+)
+from burnout_prevention.analytics.risk_engine import calculate_burnout_risk
+from burnout_prevention.analytics.risk_models import get_risk_model
+
+
+class Command(BaseCommand):
+    help = 'Рассчитывает и сохраняет риск выгорания всех активных пользователей на указанную дату'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=str, help='Дата расчета в формате YYYY-MM-DD (по умолчанию сегодня)')
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Количество дней для пересчета, заканчивая датой --date (для заполнения истории)'
+        )
+        parser.add_argument(
+            '--model-version',
+            type=str,
+            help='Версия модели риска (по умолчанию активная, BURNOUT_RISK_MODEL_VERSION)'
+        )
+        parser.add_argument('--workers', type=int, default=1, help='Количество процессов для параллельного расчета')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Размер пакета при чтении и записи')
+        parser.add_argument(
+            '--benchmark',
+            action='store_true',
+            help='Сравнить скорость пакетного расчета с расчетом по одному пользователю (без сохранения)'
+        )
+
+    def handle(self, *args, **options):
+        if options['date']:
+            try:
+                as_of = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Неверный формат даты. Используйте YYYY-MM-DD')
+        else:
+            as_of = timezone.localdate()
+
+        try:
+            model = get_risk_model(options['model_version'])
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        save = not options['benchmark']
+        action = 'Рассчитан и сохранен' if save else 'Рассчитан'
+
+        for offset in range(options['days'] - 1, -1, -1):
+            date = as_of - timedelta(days=offset)
+
+            started = time.perf_counter()
+            count = score_burnout_risk_population(
+                date,
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+                save=save,
+                model_version=model.version
+            )
+            elapsed = time.perf_counter() - started
+            rate = count / elapsed if elapsed else 0
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{action} риск выгорания (модель {model.version}) на {date} для {count} пользователей '
+                f'за {elapsed:.2f} с ({rate:.0f} пользователей/с)'
+            ))
+
+        if options['benchmark']:
+            # Прежний способ: отдельный расчет для каждого пользователя
+            started = time.perf_counter()
+            legacy_count = 0
+            for user_id in User.objects.filter(is_active=True).values_list('id', flat=True).iterator():
+                calculate_burnout_risk(user_id, as_of, model)
+                legacy_count += 1
+            legacy_elapsed = time.perf_counter() - started
+            legacy_rate = legacy_count / legacy_elapsed if legacy_elapsed else 0
+
+            self.stdout.write(
+                f'Расчет по одному пользователю: {legacy_count} пользователей '
+                f'за {legacy_elapsed:.2f} с ({legacy_rate:.0f} пользователей/с)'
+            )
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0003_burnoutrisk_factors_burnoutrisk_recommendations'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='burnoutrisk',
+            options={'ordering': ['-date']},
+        ),
+        migrations.AlterField(
+            model_name='burnoutrisk',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate, help_text='Дата, на которую рассчитан риск'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='burnoutrisk',
+            unique_together={('user', 'date')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_burnoutrisk_daily_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='burnoutrisk',
+            name='model_version',
+            field=models.CharField(default='v1', help_text='Версия модели риска, по которой выполнен расчет', max_length=20),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0005_burnoutrisk_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='дата')),
+                ('stress_count', models.PositiveIntegerField(default=0)),
+                ('stress_sum', models.IntegerField(default=0)),
+                ('stress_min', models.IntegerField(blank=True, null=True)),
+                ('stress_max', models.IntegerField(blank=True, null=True)),
+                ('stress_last', models.IntegerField(blank=True, null=True)),
+                ('sleep_count', models.PositiveIntegerField(default=0)),
+                ('sleep_duration_sum', models.FloatField(default=0)),
+                ('sleep_quality_sum', models.IntegerField(default=0)),
+                ('sleep_quality_count', models.PositiveIntegerField(default=0)),
+                ('sleep_duration_last', models.FloatField(blank=True, null=True)),
+                ('sleep_quality_last', models.IntegerField(blank=True, null=True)),
+                ('work_count', models.PositiveIntegerField(default=0)),
+                ('work_duration_sum', models.FloatField(default=0)),
+                ('work_breaks_count_sum', models.IntegerField(default=0)),
+                ('work_breaks_minutes_sum', models.IntegerField(default=0)),
+                ('work_productivity_sum', models.IntegerField(default=0)),
+                ('work_productivity_count', models.PositiveIntegerField(default=0)),
+                ('work_duration_last', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'дневная сводка',
+                'verbose_name_plural': 'дневные сводки',
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:41
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+CHUNK_SIZE = 500
+
+
+def backfill_daily_metrics(apps, schema_editor):
+    """
+    Строит дневные сводки по всем записям о стрессе, сне и работе.
+    Копия логики rollups.rebuild_daily_metrics на момент миграции: использует только
+    исторические модели, чтобы последующие изменения кода не влияли на миграцию.
+    """
+    StressLevel = apps.get_model('analytics', 'StressLevel')
+    SleepRecord = apps.get_model('analytics', 'SleepRecord')
+    WorkActivity = apps.get_model('analytics', 'WorkActivity')
+    UserDailyMetrics = apps.get_model('analytics', 'UserDailyMetrics')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(user_ids), CHUNK_SIZE):
+        chunk = user_ids[start:start + CHUNK_SIZE]
+        metrics = {}
+
+        def day_metrics(user_id, day):
+            key = (user_id, day)
+            if key not in metrics:
+                metrics[key] = UserDailyMetrics(user_id=user_id, date=day)
+            return metrics[key]
+
+        stress_rows = StressLevel.objects.filter(user_id__in=chunk).order_by(
+            'user_id', 'created_at', 'id'
+        ).values_list('user_id', 'created_at', 'level').iterator(chunk_size=2000)
+        for user_id, created_at, level in stress_rows:
+            day = day_metrics(user_id, timezone.localdate(created_at))
+            day.stress_count += 1
+            day.stress_sum += level
+            day.stress_min = level if day.stress_min is None else min(day.stress_min, level)
+            day.stress_max = level if day.stress_max is None else max(day.stress_max, level)
+            day.stress_last = level
+
+        sleep_rows = SleepRecord.objects.filter(user_id__in=chunk).order_by(
+            'user_id', 'date', 'id'
+        ).values_list('user_id', 'date', 'duration_hours', 'quality').iterator(chunk_size=2000)
+        for user_id, date, duration_hours, quality in sleep_rows:
+            day = day_metrics(user_id, date)
+            day.sleep_count += 1
+            day.sleep_duration_sum += duration_hours
+            if quality is not None:
+                day.sleep_quality_sum += quality
+                day.sleep_quality_count += 1
+            day.sleep_duration_last = duration_hours
+            day.sleep_quality_last = quality
+
+        work_rows = WorkActivity.objects.filter(user_id__in=chunk).order_by(
+            'user_id', 'date', 'id'
+        ).values_list(
+            'user_id', 'date', 'duration_hours', 'breaks_count', 'breaks_total_minutes', 'productivity'
+        ).iterator(chunk_size=2000)
+        for user_id, date, duration_hours, breaks_count, breaks_total_minutes, productivity in work_rows:
+            day = day_metrics(user_id, date)
+            day.work_count += 1
+            day.work_duration_sum += duration_hours
+            day.work_breaks_count_sum += breaks_count
+            day.work_breaks_minutes_sum += breaks_total_minutes
+            if productivity is not None:
+                day.work_productivity_sum += productivity
+                day.work_productivity_count += 1
+            day.work_duration_last = duration_hours
+
+        UserDailyMetrics.objects.filter(user_id__in=chunk).delete()
+        UserDailyMetrics.objects.bulk_create(metrics.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_userdailymetrics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_metrics, migrations.RunPython.noop),
+    ]
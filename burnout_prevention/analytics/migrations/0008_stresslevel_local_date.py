@@ -0,0 +1,24 @@
+# Generated by Django 4.2.10 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_backfill_userdailymetrics'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stresslevel',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='stresslevel',
+            name='local_date',
+            field=models.DateField(editable=False, null=True, verbose_name='локальная дата'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.10 on 2026-10-18 10:12
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_local_date(apps, schema_editor):
+    StressLevel = apps.get_model('analytics', 'StressLevel')
+
+    batch = []
+    for stress_level in StressLevel.objects.only('pk', 'created_at').iterator(chunk_size=2000):
+        stress_level.local_date = timezone.localdate(stress_level.created_at)
+        batch.append(stress_level)
+        if len(batch) >= 2000:
+            StressLevel.objects.bulk_update(batch, ['local_date'])
+            batch = []
+    if batch:
+        StressLevel.objects.bulk_update(batch, ['local_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_stresslevel_local_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_local_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.10 on 2026-10-18 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0009_backfill_stresslevel_local_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stresslevel',
+            name='local_date',
+            field=models.DateField(editable=False, verbose_name='локальная дата'),
+        ),
+        migrations.AddIndex(
+            model_name='stresslevel',
+            index=models.Index(fields=['user', 'local_date'], name='stress_user_local_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stresslevel',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='stress_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sleeprecord',
+            index=models.Index(fields=['user', 'date', 'id'], name='sleep_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workactivity',
+            index=models.Index(fields=['user', 'date', 'id'], name='work_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.10 on 2026-10-18 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0010_analytics_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StressBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.FloatField(verbose_name='среднее')),
+                ('variance', models.FloatField(verbose_name='дисперсия')),
+                ('readings_count', models.PositiveIntegerField(default=0, verbose_name='количество оценок')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'базовый уровень стресса',
+                'verbose_name_plural': 'базовые уровни стресса',
+            },
+        ),
+        migrations.AddField(
+            model_name='stresslevel',
+            name='is_anomaly',
+            field=models.BooleanField(default=False, editable=False, verbose_name='аномальное значение'),
+        ),
+        migrations.AddField(
+            model_name='stresslevel',
+            name='z_score',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='отклонение от базового уровня'),
+        ),
+        migrations.AddIndex(
+            model_name='stresslevel',
+            index=models.Index(condition=models.Q(('is_anomaly', True)), fields=['user', 'local_date'], name='stress_user_anomaly_idx'),
+        ),
+        migrations.AddField(
+            model_name='stressbaseline',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stress_baseline', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
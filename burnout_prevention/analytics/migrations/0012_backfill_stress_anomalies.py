@@ -0,0 +1,75 @@
+# Generated by Django 4.2.10 on 2026-10-18 14:20
+
+import math
+
+from django.conf import settings
+from django.db import migrations
+
+
+CHUNK_SIZE = 500
+
+STRESS_EWMA_ALPHA = 0.1
+STRESS_ANOMALY_THRESHOLD = 3.0
+STRESS_ANOMALY_MIN_READINGS = 5
+STRESS_BASELINE_INITIAL_STD = 15.0
+STRESS_BASELINE_MIN_STD = 5.0
+
+
+def backfill_stress_anomalies(apps, schema_editor):
+    """
+    Рассчитывает базовые уровни стресса и отметки аномалий по истории записей о стрессе.
+    Копия логики anomalies.rebuild_stress_baselines на момент миграции: использует только
+    исторические модели, чтобы последующие изменения кода не влияли на миграцию.
+    """
+    StressLevel = apps.get_model('analytics', 'StressLevel')
+    StressBaseline = apps.get_model('analytics', 'StressBaseline')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    users = list(User.objects.order_by('pk').values_list('pk', 'stress_level_base'))
+    for start in range(0, len(users), CHUNK_SIZE):
+        chunk = dict(users[start:start + CHUNK_SIZE])
+        baselines = {}
+        updates = []
+        rows = StressLevel.objects.filter(user_id__in=chunk).order_by(
+            'user_id', 'created_at', 'id'
+        ).values_list('id', 'user_id', 'level', 'z_score', 'is_anomaly').iterator(chunk_size=2000)
+
+        for record_id, user_id, level, z_score, is_anomaly in rows:
+            if user_id not in baselines:
+                baselines[user_id] = StressBaseline(
+                    user_id=user_id,
+                    mean=float(chunk[user_id]),
+                    variance=STRESS_BASELINE_INITIAL_STD ** 2,
+                    readings_count=0
+                )
+            baseline = baselines[user_id]
+
+            diff = level - baseline.mean
+            new_z_score = diff / max(math.sqrt(baseline.variance), STRESS_BASELINE_MIN_STD)
+            new_is_anomaly = (
+                baseline.readings_count >= STRESS_ANOMALY_MIN_READINGS
+                and abs(new_z_score) >= STRESS_ANOMALY_THRESHOLD
+            )
+            increment = STRESS_EWMA_ALPHA * diff
+            baseline.mean += increment
+            baseline.variance = (1 - STRESS_EWMA_ALPHA) * (baseline.variance + diff * increment)
+            baseline.readings_count += 1
+
+            if new_z_score != z_score or new_is_anomaly != is_anomaly:
+                updates.append(StressLevel(id=record_id, z_score=new_z_score, is_anomaly=new_is_anomaly))
+
+        StressLevel.objects.bulk_update(updates, ['z_score', 'is_anomaly'], batch_size=1000)
+        StressBaseline.objects.filter(user_id__in=chunk).delete()
+        StressBaseline.objects.bulk_create(baselines.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('analytics', '0011_stress_anomalies'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stress_anomalies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.10 on 2026-10-18 09:49
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0012_backfill_stress_anomalies'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='burnoutrisk',
+            name='risk_level',
+            field=models.FloatField(help_text='Уровень риска выгорания (0-100)', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
@@ -1,9 +1,21 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from burnout_prevention.users.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
+class StressLevelQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Заполняет локальную дату записей перед пакетной вставкой (save() при ней не вызывается).
+        """
+        objs = list(objs)
+        for obj in objs:
+            obj.local_date = timezone.localdate(obj.created_at)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class StressLevel(models.Model):
     """
     Модель для отслеживания уровня стресса пользователя.
@@ -21,15 +33,44 @@ class StressLevel(models.Model):
     )
     
     notes = models.TextField(_('заметки'), blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Локальная дата created_at: фильтры по дню используют индекс вместо преобразования created_at
+    local_date = models.DateField(_('локальная дата'), editable=False)
+    # Отклонение от базового уровня пользователя (см. anomalies) на момент записи
+    z_score = models.FloatField(_('отклонение от базового уровня'), null=True, blank=True, editable=False)
+    is_anomaly = models.BooleanField(_('аномальное значение'), default=False, editable=False)
+    
+    objects = StressLevelQuerySet.as_manager()
     
     class Meta:
         verbose_name = _('уровень стресса')
         verbose_name_plural = _('уровни стресса')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'local_date'], name='stress_user_local_date_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='stress_user_created_idx'),
+            models.Index(
+                fields=['user', 'local_date'],
+                name='stress_user_anomaly_idx',
+                condition=models.Q(is_anomaly=True)
+            ),
+        ]
         
     def __str__(self):
         return f"{self.user.email} - {self.level} ({self.created_at.strftime('%d.%m.%Y %H:%M')})"
+    
+    def save(self, *args, **kwargs):
+        self.local_date = timezone.localdate(self.created_at)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'created_at' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'local_date'}
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        # Новая оценка обновляет базовый уровень стресса пользователя (сигнал pre_save):
+        # обновление и вставка записи фиксируются или откатываются вместе
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class SleepRecord(models.Model):
@@ -59,6 +100,9 @@ class SleepRecord(models.Model):
         verbose_name = _('запись о сне')
         verbose_name_plural = _('записи о сне')
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['user', 'date', 'id'], name='sleep_user_date_idx'),
+        ]
         
     def __str__(self):
         return f"{self.user.email} - {self.duration_hours} ч ({self.date})"
@@ -94,6 +138,9 @@ class WorkActivity(models.Model):
         verbose_name = _('рабочая активность')
         verbose_name_plural = _('рабочие активности')
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['user', 'date', 'id'], name='work_user_date_idx'),
+        ]
         
     def __str__(self):
         return f"{self.user.email} - {self.duration_hours} ч ({self.date})"
@@ -104,8 +151,9 @@ class BurnoutRisk(models.Model):
     Модель для отслеживания риска выгорания пользователя
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='burnout_risks')
-    date = models.DateField(auto_now_add=True)
-    risk_level = models.IntegerField(
+    date = models.DateField(default=timezone.localdate, help_text="Дата, на которую рассчитан риск")
+    # Хранится без округления, как рассчитывается динамически
+    risk_level = models.FloatField(
         validators=[MinValueValidator(0), MaxValueValidator(100)],
         help_text="Уровень риска выгорания (0-100)"
     )
@@ -113,7 +161,79 @@ class BurnoutRisk(models.Model):
                               help_text="Факторы риска выгорания и их значения")
     recommendations = models.JSONField(default=list, blank=True, null=True,
                                      help_text="Рекомендации по предотвращению выгорания")
+    model_version = models.CharField(max_length=20, default='v1',
+                                     help_text="Версия модели риска, по которой выполнен расчет")
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        ordering = ['-date']
+        # Один снимок риска на пользователя за день
+        unique_together = ('user', 'date')
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.risk_level}% ({self.date.strftime('%Y-%m-%d')})"
+
+
+class UserDailyMetrics(models.Model):
+    """
+    Сводка записей пользователя о стрессе, сне и работе за день.
+
+    Хранит суммы и количества (для точного расчета средних за любой период),
+    минимум и максимум стресса, а также значения последней записи дня,
+    по которым рассчитывается риск выгорания. Поддерживается сигналами при изменении
+    записей; полностью перестраивается командой backfill_daily_metrics.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_metrics')
+    date = models.DateField(_('дата'))
+
+    stress_count = models.PositiveIntegerField(default=0)
+    stress_sum = models.IntegerField(default=0)
+    stress_min = models.IntegerField(null=True, blank=True)
+    stress_max = models.IntegerField(null=True, blank=True)
+    stress_last = models.IntegerField(null=True, blank=True)
+
+    sleep_count = models.PositiveIntegerField(default=0)
+    sleep_duration_sum = models.FloatField(default=0)
+    sleep_quality_sum = models.IntegerField(default=0)
+    sleep_quality_count = models.PositiveIntegerField(default=0)
+    sleep_duration_last = models.FloatField(null=True, blank=True)
+    sleep_quality_last = models.IntegerField(null=True, blank=True)
+
+    work_count = models.PositiveIntegerField(default=0)
+    work_duration_sum = models.FloatField(default=0)
+    work_breaks_count_sum = models.IntegerField(default=0)
+    work_breaks_minutes_sum = models.IntegerField(default=0)
+    work_productivity_sum = models.IntegerField(default=0)
+    work_productivity_count = models.PositiveIntegerField(default=0)
+    work_duration_last = models.FloatField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('дневная сводка')
+        verbose_name_plural = _('дневные сводки')
+        ordering = ['-date']
+        unique_together = ('user', 'date')
+
+    def __str__(self):
+        return f"{self.user_id} - {self.date}"
+
+
+class StressBaseline(models.Model):
+    """
+    Базовый уровень стресса пользователя: экспоненциально взвешенные среднее и дисперсия
+    его оценок стресса. Обновляется при каждой новой записи (см. anomalies);
+    полностью пересчитывается командой backfill_stress_anomalies.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='stress_baseline')
+    mean = models.FloatField(_('среднее'))
+    variance = models.FloatField(_('дисперсия'))
+    readings_count = models.PositiveIntegerField(_('количество оценок'), default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('базовый уровень стресса')
+        verbose_name_plural = _('базовые уровни стресса')
+
     def __str__(self):
-        return f"{self.user.username} - {self.risk_level}% ({self.created_at.strftime('%Y-%m-%d')})"
+        return f"{self.user_id} - {self.mean:.1f}"
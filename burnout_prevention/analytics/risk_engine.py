@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.db.models import Q, Subquery
+from django.utils import timezone
+
+from .anomalies import stress_anomaly_counts
+from .models import UserDailyMetrics
+from .risk_models import get_risk_model
+
+
+def build_burnout_risk(date, work_hours=None, stress_level=None, sleep_hours=None, sleep_quality=None, model=None,
+                       stress_anomalies=None):
+    """
+    Рассчитывает риск выгорания по уже полученным исходным данным.
+    Не выполняет запросов к базе данных.
+    Факторы, веса и пороги рекомендаций задаются моделью риска
+    (по умолчанию - активной, см. risk_models).
+
+    Returns:
+        dict: Словарь с данными о риске выгорания
+    """
+    if model is None:
+        model = get_risk_model()
+
+    risk_level, points, values = model.score(
+        work_hours=work_hours,
+        stress_level=stress_level,
+        sleep_hours=sleep_hours,
+        sleep_quality=sleep_quality,
+        stress_anomalies=stress_anomalies
+    )
+
+    raw_data = {
+        'work_hours': values['work_hours'],
+        'stress_level': stress_level,
+        'sleep_hours': values['sleep_hours'],
+        'sleep_quality': values['sleep_quality']
+    }
+    if 'stress_anomalies' in values:
+        raw_data['stress_anomalies'] = values['stress_anomalies']
+
+    return {
+        'date': date,
+        'risk_level': risk_level,
+        'factors': model.build_factors(points),
+        'recommendations': model.build_recommendations(points),
+        'model_version': model.version,
+        'raw_data': raw_data
+    }
+
+
+def calculate_burnout_risk(user, date=None, model=None):
+    """
+    Рассчитывает риск выгорания пользователя на указанную дату.
+    Если дата не указана, используется текущая дата.
+    Исходные данные - последние записи о работе, стрессе и сне на дату -
+    берутся из дневных сводок одним запросом.
+    """
+    if date is None:
+        date = timezone.localdate()
+    return calculate_burnout_risk_range(user, date, date, model)[0]
+
+
+def _forward_fill(rows, dates):
+    """
+    Для каждой даты возвращает значение последней записи на эту дату или раньше.
+
+    rows - список пар (дата, значение), отсортированный по возрастанию.
+    dates - отсортированный по возрастанию список дат.
+    """
+    values = []
+    current = None
+    index = 0
+    for date in dates:
+        while index < len(rows) and rows[index][0] <= date:
+            current = rows[index][1]
+            index += 1
+        values.append(current)
+    return values
+
+
+def calculate_burnout_risk_range(user, start_date, end_date, model=None):
+    """
+    Рассчитывает риск выгорания пользователя для каждого дня диапазона [start_date, end_date].
+
+    Выполняет один запрос к дневным сводкам: сводки внутри диапазона и последние
+    сводки с данными о работе, сне и стрессе до его начала. Для каждого дня
+    используются значения последней записи на этот день или раньше.
+
+    Returns:
+        list: Список словарей с данными о риске выгорания, по возрастанию даты
+    """
+    if start_date > end_date:
+        return []
+    if model is None:
+        model = get_risk_model()
+
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    # Дата последней сводки с данными потока до начала диапазона (если есть)
+    def lookback(count_field):
+        return UserDailyMetrics.objects.filter(
+            user=user,
+            date__lt=start_date,
+            **{f'{count_field}__gt': 0}
+        ).order_by('-date').values('date')[:1]
+
+    rows = UserDailyMetrics.objects.filter(
+        user=user,
+        date__lte=end_date
+    ).filter(
+        Q(date__gte=start_date)
+        | Q(date=Subquery(lookback('work_count')))
+        | Q(date=Subquery(lookback('sleep_count')))
+        | Q(date=Subquery(lookback('stress_count')))
+    ).order_by('date').values_list(
+        'date', 'work_count', 'work_duration_last',
+        'sleep_count', 'sleep_duration_last', 'sleep_quality_last',
+        'stress_count', 'stress_last'
+    )
+
+    work_rows, sleep_rows, stress_rows = [], [], []
+    for date, work_count, work_hours, sleep_count, sleep_hours, sleep_quality, stress_count, stress_level in rows:
+        if work_count:
+            work_rows.append((date, work_hours))
+        if sleep_count:
+            sleep_rows.append((date, (sleep_hours, sleep_quality)))
+        if stress_count:
+            stress_rows.append((date, stress_level))
+
+    work_by_day = _forward_fill(work_rows, dates)
+    sleep_by_day = _forward_fill(sleep_rows, dates)
+    stress_by_day = _forward_fill(stress_rows, dates)
+    # Аномальные оценки стресса запрашиваются, только если модель их учитывает
+    if 'stress_anomalies' in model.inputs:
+        anomalies_by_day = stress_anomaly_counts(user, dates)
+    else:
+        anomalies_by_day = [None] * len(dates)
+
+    results = []
+    for date, work_hours, sleep, stress_level, stress_anomalies in zip(
+        dates, work_by_day, sleep_by_day, stress_by_day, anomalies_by_day
+    ):
+        sleep_hours, sleep_quality = sleep if sleep else (None, None)
+        results.append(build_burnout_risk(
+            date,
+            work_hours=work_hours,
+            stress_level=stress_level,
+            sleep_hours=sleep_hours,
+            sleep_quality=sleep_quality,
+            stress_anomalies=stress_anomalies,
+            model=model
+        ))
+    return results
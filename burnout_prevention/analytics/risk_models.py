@@ -0,0 +1,262 @@
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class RiskInput:
+    """
+    Исходный показатель модели риска (часы работы, уровень стресса и т.д.).
+    Отсутствующее значение (None или NaN в массивах) заменяется значением по умолчанию.
+    """
+
+    def __init__(self, name, default, zero_is_missing=False):
+        self.name = name
+        self.default = default
+        # Нулевое значение считается отсутствующим (например, неуказанное качество сна)
+        self.zero_is_missing = zero_is_missing
+
+    def fill(self, value):
+        if value is None or (self.zero_is_missing and not value):
+            return self.default
+        return value
+
+    def fill_array(self, values):
+        values = np.asarray(values, dtype=float)
+        missing = np.isnan(values)
+        if self.zero_is_missing:
+            missing |= values == 0
+        return np.where(missing, self.default, values)
+
+
+class RiskFactor:
+    """
+    Фактор риска выгорания.
+
+    Баллы фактора = (значение - offset) * scale / divisor, ограниченные снизу lower
+    и сверху upper (если заданы).
+    """
+
+    def __init__(self, name, source, weight, offset=0, scale=1, divisor=1, lower=None, upper=None):
+        self.name = name
+        self.source = source
+        self.weight = weight
+        self.offset = offset
+        self.scale = scale
+        self.divisor = divisor
+        self.lower = lower
+        self.upper = upper
+
+
+class RiskRule:
+    """
+    Правило формирования рекомендации: срабатывает, если баллы любого из факторов
+    превышают порог.
+    """
+
+    def __init__(self, factors, threshold, recommendation):
+        self.factors = tuple(factors)
+        self.threshold = threshold
+        self.recommendation = recommendation
+
+
+class RiskModel:
+    """
+    Версия модели риска выгорания: исходные показатели, факторы с весами и пороги рекомендаций.
+
+    Итоговый риск = сумма (баллы фактора * вес) * risk_scale, ограниченная диапазоном [0, max_risk].
+    """
+
+    def __init__(self, version, inputs, factors, rules, risk_scale=10, max_risk=100):
+        self.version = version
+        self.inputs = {risk_input.name: risk_input for risk_input in inputs}
+        self.factors = list(factors)
+        self.rules = list(rules)
+        self.risk_scale = risk_scale
+        self.max_risk = max_risk
+        self._scalar_scorer, self._array_scorer = self._compile()
+
+    @property
+    def weights(self):
+        """
+        Веса факторов в порядке их объявления.
+        """
+        return {factor.name: factor.weight for factor in self.factors}
+
+    def _compile(self):
+        """
+        Собирает параметры факторов в кортежи и возвращает функции расчета
+        для одной записи и для массивов.
+        """
+        inputs = tuple(self.inputs.values())
+        factors = tuple(
+            (factor.name, factor.source, factor.offset, factor.scale, factor.divisor,
+             factor.lower, factor.upper, factor.weight)
+            for factor in self.factors
+        )
+        risk_scale = self.risk_scale
+        max_risk = self.max_risk
+
+        def score_scalar(values):
+            values = {risk_input.name: risk_input.fill(values.get(risk_input.name)) for risk_input in inputs}
+            points = {}
+            total_risk = 0
+            for name, source, offset, scale, divisor, lower, upper, weight in factors:
+                value = (values[source] - offset) * scale / divisor
+                if lower is not None:
+                    value = max(lower, value)
+                if upper is not None:
+                    value = min(value, upper)
+                points[name] = value
+                total_risk = total_risk + value * weight
+            return min(max(total_risk * risk_scale, 0), max_risk), points, values
+
+        def score_array(values):
+            values = {risk_input.name: risk_input.fill_array(values[risk_input.name]) for risk_input in inputs}
+            points = {}
+            total_risk = 0
+            for name, source, offset, scale, divisor, lower, upper, weight in factors:
+                value = (values[source] - offset) * scale / divisor
+                if lower is not None:
+                    value = np.maximum(lower, value)
+                if upper is not None:
+                    value = np.minimum(value, upper)
+                points[name] = value
+                total_risk = total_risk + value * weight
+            return np.clip(total_risk * risk_scale, 0, max_risk), points, values
+
+        return score_scalar, score_array
+
+    def score(self, **values):
+        """
+        Рассчитывает риск для одной записи (скалярные значения, None - нет данных)
+        или для массивов (numpy, NaN - нет данных).
+
+        Returns:
+            tuple: (risk_level, баллы факторов по имени, исходные значения после подстановки умолчаний)
+        """
+        if any(isinstance(value, np.ndarray) for value in values.values()):
+            return self._array_scorer(values)
+        return self._scalar_scorer(values)
+
+    def build_factors(self, points):
+        """
+        Формирует словарь факторов риска с их значениями и весами.
+        """
+        return {
+            factor.name: {
+                'value': points[factor.name],
+                'weight': factor.weight
+            }
+            for factor in self.factors
+        }
+
+    def build_recommendations(self, points):
+        """
+        Формирует рекомендации по сработавшим правилам.
+        """
+        return [
+            dict(rule.recommendation)
+            for rule in self.rules
+            if any(points[name] > rule.threshold for name in rule.factors)
+        ]
+
+
+_registry = {}
+
+
+def register_risk_model(model):
+    """
+    Регистрирует версию модели риска.
+    """
+    _registry[model.version] = model
+    return model
+
+
+def get_risk_model(version=None):
+    """
+    Возвращает модель риска указанной версии или активную модель
+    (settings.BURNOUT_RISK_MODEL_VERSION).
+    """
+    if version is None:
+        version = settings.BURNOUT_RISK_MODEL_VERSION
+    try:
+        return _registry[version]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown burnout risk model version '{version}'. Available: {', '.join(sorted(_registry))}"
+        )
+
+
+def get_risk_model_versions():
+    """
+    Возвращает список зарегистрированных версий моделей риска.
+    """
+    return sorted(_registry)
+
+
+# Исходная модель риска выгорания
+#
+# Баллы переработки = фактические часы переработки
+# Баллы Длительности рабочего дня = max(0, (фактические часы - 8) * 0.4)
+# Баллы Собственной оценка стресса = Оценка стресса пользователя / 10
+# Баллы Качества сна = 10 - оценка качества сна пользователем
+# Баллы недосыпа = min((8 - кол-во часов сна)*0.4, 10)
+v1 = register_risk_model(RiskModel(
+    version='v1',
+    inputs=[
+        RiskInput('work_hours', default=8),
+        RiskInput('stress_level', default=0),
+        RiskInput('sleep_hours', default=8),
+        RiskInput('sleep_quality', default=7, zero_is_missing=True),
+    ],
+    factors=[
+        RiskFactor('overtime', 'work_hours', weight=0.15, offset=8, lower=0),
+        RiskFactor('workday_duration', 'work_hours', weight=0.10, offset=8, scale=0.4, lower=0),
+        RiskFactor('stress', 'stress_level', weight=0.20, divisor=10),
+        RiskFactor('sleep_quality', 'sleep_quality', weight=0.20, offset=10, scale=-1),
+        RiskFactor('sleep_deprivation', 'sleep_hours', weight=0.20, offset=8, scale=-0.4, upper=10),
+    ],
+    rules=[
+        RiskRule(['overtime', 'workday_duration'], 2, {
+            'type': 'work',
+            'title': 'Сокращение рабочего времени',
+            'description': 'Постарайтесь ограничить рабочее время до 8 часов в день, делегируйте задачи, если возможно.'
+        }),
+        RiskRule(['stress'], 5, {
+            'type': 'stress',
+            'title': 'Снижение уровня стресса',
+            'description': 'Рекомендуется практиковать техники релаксации и медитации для снижения уровня стресса.'
+        }),
+        RiskRule(['sleep_quality'], 5, {
+            'type': 'sleep',
+            'title': 'Улучшение качества сна',
+            'description': 'Создайте комфортные условия для сна: тихая комната, удобная кровать, отсутствие яркого света.'
+        }),
+        RiskRule(['sleep_deprivation'], 3, {
+            'type': 'sleep',
+            'title': 'Увеличение продолжительности сна',
+            'description': 'Старайтесь спать не менее 7-8 часов в сутки для полноценного отдыха.'
+        }),
+    ],
+))
+
+
+# Модель v1 с дополнительным фактором резких скачков стресса
+#
+# Баллы скачков стресса = min(аномальные оценки стресса за последние 7 дней * 2, 10)
+v2_rules = list(v1.rules)
+# Правило скачков стресса - сразу после правила уровня стресса
+v2_rules.insert(
+    next(index for index, rule in enumerate(v2_rules) if 'stress' in rule.factors) + 1,
+    RiskRule(['stress_anomalies'], 3, {
+        'type': 'stress',
+        'title': 'Резкие скачки стресса',
+        'description': 'Уровень стресса в последние дни заметно выше обычного. Отметьте, какие события к этому привели, и запланируйте время на восстановление.'
+    })
+)
+register_risk_model(RiskModel(
+    version='v2',
+    inputs=[*v1.inputs.values(), RiskInput('stress_anomalies', default=0)],
+    factors=[*v1.factors, RiskFactor('stress_anomalies', 'stress_anomalies', weight=0.15, scale=2, upper=10)],
+    rules=v2_rules,
+))
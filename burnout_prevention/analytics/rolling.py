@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.db.models import F, FloatField, Func, IntegerField, Q, Subquery, Sum, Window
+from django.db.models.expressions import ValueRange
+from django.db.models.functions import Cast, Lag
+
+from .models import UserDailyMetrics
+from .rollups import DAILY_METRICS_ROLLUPS
+from .statistics import parse_statistics_period
+
+
+# Показатель по умолчанию для каждого потока данных
+DEFAULT_ROLLING_METRICS = {
+    'stress': 'level',
+    'sleep': 'duration_hours',
+    'work': 'duration_hours',
+}
+
+DEFAULT_ROLLING_WINDOW = 7
+MAX_ROLLING_WINDOW = 90
+
+
+class DayNumber(Func):
+    """
+    Порядковый номер календарного дня: оконные рамки RANGE задаются в днях,
+    поэтому дни без записей не сдвигают окно.
+    """
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="CAST(julianday(%(expressions)s) - julianday('1970-01-01') AS INTEGER)",
+            **extra_context
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="(%(expressions)s - DATE '1970-01-01')",
+            **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='TO_DAYS', **extra_context)
+
+
+def parse_rolling_params(params, default_days=30):
+    """
+    Разбирает параметры запроса скользящих показателей: stream, metric, window,
+    start_date и end_date (YYYY-MM-DD).
+
+    Raises:
+        ValueError: Неизвестный поток данных или показатель, неверный размер окна или формат даты
+
+    Returns:
+        tuple: (stream, metric, window, start_date, end_date)
+    """
+    stream = params.get('stream') or 'stress'
+    if stream not in DAILY_METRICS_ROLLUPS:
+        raise ValueError(f"Invalid stream. Use {', '.join(DAILY_METRICS_ROLLUPS)}")
+
+    metrics = DAILY_METRICS_ROLLUPS[stream]['averages']
+    metric = params.get('metric') or DEFAULT_ROLLING_METRICS[stream]
+    if metric not in metrics:
+        raise ValueError(f"Invalid metric for stream {stream}. Use {', '.join(metrics)}")
+
+    try:
+        window = int(params.get('window') or DEFAULT_ROLLING_WINDOW)
+    except ValueError:
+        window = 0
+    if not 1 <= window <= MAX_ROLLING_WINDOW:
+        raise ValueError(f"Invalid window. Use an integer from 1 to {MAX_ROLLING_WINDOW}")
+
+    start_date, end_date, _ = parse_statistics_period({
+        'start_date': params.get('start_date'),
+        'end_date': params.get('end_date'),
+    }, default_days=default_days)
+    return stream, metric, window, start_date, end_date
+
+
+def rolling_metrics(user, stream, start_date, end_date, window=7, metric=None):
+    """
+    Возвращает скользящие показатели потока данных пользователя за каждый день
+    диапазона, в котором есть записи.
+
+    Скользящие сумма и среднее за window календарных дней (включая текущий) и
+    изменение среднего за день относительно предыдущего дня с записями (в том числе
+    дня до начала диапазона) считаются в базе данных оконными функциями по дневным сводкам.
+
+    Returns:
+        list: [{'date', 'value', 'count', 'rolling_sum', 'rolling_count', 'rolling_avg', 'delta'}]
+    """
+    if metric is None:
+        metric = DEFAULT_ROLLING_METRICS[stream]
+    sum_field, count_field = DAILY_METRICS_ROLLUPS[stream]['averages'][metric]
+
+    frame = ValueRange(start=-(window - 1), end=0)
+    by_day = DayNumber('date').asc()
+    day_value = Cast(sum_field, FloatField()) / F(count_field)
+    records = UserDailyMetrics.objects.filter(user=user, **{f'{count_field}__gt': 0})
+
+    # Сводки за window - 1 дней до начала диапазона нужны для первых окон, а последний
+    # день с записями перед ними - для изменения за первый день (в окна он не попадает)
+    lookback_start = start_date - timedelta(days=window - 1)
+    previous_day = records.filter(date__lt=lookback_start).order_by('-date').values('date')[:1]
+    rows = records.filter(
+        Q(date__gte=lookback_start) | Q(date=Subquery(previous_day)),
+        date__lte=end_date
+    ).annotate(
+        value=day_value,
+        day_count=F(count_field),
+        rolling_sum=Window(Sum(sum_field), order_by=by_day, frame=frame),
+        rolling_count=Window(Sum(count_field), order_by=by_day, frame=frame),
+        delta=day_value - Window(Lag(day_value), order_by=F('date').asc()),
+    ).order_by('date').values('date', 'value', 'day_count', 'rolling_sum', 'rolling_count', 'delta')
+
+    return [
+        {
+            'date': row['date'],
+            'value': row['value'],
+            'count': row['day_count'],
+            'rolling_sum': row['rolling_sum'],
+            'rolling_count': row['rolling_count'],
+            'rolling_avg': row['rolling_sum'] / row['rolling_count'],
+            'delta': row['delta'],
+        }
+        for row in rows
+        if row['date'] >= start_date
+    ]
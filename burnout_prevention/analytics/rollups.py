@@ -0,0 +1,219 @@
+from django.db import transaction
+from django.utils import timezone
+
+from burnout_prevention.users.models import User
+from .models import StressLevel, SleepRecord, WorkActivity, UserDailyMetrics
+from .statistics import time_series_statistics
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Поля сводки, пересчитываемые при обновлении дня
+METRIC_FIELDS = [
+    'stress_count', 'stress_sum', 'stress_min', 'stress_max', 'stress_last',
+    'sleep_count', 'sleep_duration_sum', 'sleep_quality_sum', 'sleep_quality_count',
+    'sleep_duration_last', 'sleep_quality_last',
+    'work_count', 'work_duration_sum', 'work_breaks_count_sum', 'work_breaks_minutes_sum',
+    'work_productivity_sum', 'work_productivity_count', 'work_duration_last',
+    'updated_at',
+]
+
+# Описание потоков данных в сводке для движка статистики:
+# count - поле количества записей, averages - {показатель: (поле суммы, поле количества)},
+# extremes - {показатель: (поле минимума, поле максимума)}
+DAILY_METRICS_ROLLUPS = {
+    'stress': {
+        'count': 'stress_count',
+        'averages': {'level': ('stress_sum', 'stress_count')},
+        'extremes': {'level': ('stress_min', 'stress_max')},
+    },
+    'sleep': {
+        'count': 'sleep_count',
+        'averages': {
+            'duration_hours': ('sleep_duration_sum', 'sleep_count'),
+            'quality': ('sleep_quality_sum', 'sleep_quality_count'),
+        },
+        'extremes': {},
+    },
+    'work': {
+        'count': 'work_count',
+        'averages': {
+            'duration_hours': ('work_duration_sum', 'work_count'),
+            'breaks_count': ('work_breaks_count_sum', 'work_count'),
+            'breaks_total_minutes': ('work_breaks_minutes_sum', 'work_count'),
+            'productivity': ('work_productivity_sum', 'work_productivity_count'),
+        },
+        'extremes': {},
+    },
+}
+
+
+def _collect_metrics(metrics_model, stress_rows, sleep_rows, work_rows):
+    """
+    Сворачивает записи в дневные сводки. Записи каждого потока должны быть упорядочены
+    по времени создания, чтобы значения последней записи дня были корректными.
+
+    stress_rows - кортежи (user_id, created_at, level),
+    sleep_rows - (user_id, date, duration_hours, quality),
+    work_rows - (user_id, date, duration_hours, breaks_count, breaks_total_minutes, productivity).
+
+    Returns:
+        dict: (user_id, дата) -> несохраненный объект сводки
+    """
+    metrics = {}
+
+    def day_metrics(user_id, day):
+        key = (user_id, day)
+        if key not in metrics:
+            metrics[key] = metrics_model(user_id=user_id, date=day)
+        return metrics[key]
+
+    for user_id, created_at, level in stress_rows:
+        day = day_metrics(user_id, timezone.localdate(created_at))
+        day.stress_count += 1
+        day.stress_sum += level
+        day.stress_min = level if day.stress_min is None else min(day.stress_min, level)
+        day.stress_max = level if day.stress_max is None else max(day.stress_max, level)
+        day.stress_last = level
+
+    for user_id, date, duration_hours, quality in sleep_rows:
+        day = day_metrics(user_id, date)
+        day.sleep_count += 1
+        day.sleep_duration_sum += duration_hours
+        if quality is not None:
+            day.sleep_quality_sum += quality
+            day.sleep_quality_count += 1
+        day.sleep_duration_last = duration_hours
+        day.sleep_quality_last = quality
+
+    for user_id, date, duration_hours, breaks_count, breaks_total_minutes, productivity in work_rows:
+        day = day_metrics(user_id, date)
+        day.work_count += 1
+        day.work_duration_sum += duration_hours
+        day.work_breaks_count_sum += breaks_count
+        day.work_breaks_minutes_sum += breaks_total_minutes
+        if productivity is not None:
+            day.work_productivity_sum += productivity
+            day.work_productivity_count += 1
+        day.work_duration_last = duration_hours
+
+    return metrics
+
+
+def _record_rows(stress_records, sleep_records, work_records):
+    """
+    Возвращает выборки значений записей в порядке, необходимом для _collect_metrics.
+    """
+    return (
+        stress_records.order_by('user_id', 'created_at', 'id').values_list(
+            'user_id', 'created_at', 'level'
+        ),
+        sleep_records.order_by('user_id', 'date', 'id').values_list(
+            'user_id', 'date', 'duration_hours', 'quality'
+        ),
+        work_records.order_by('user_id', 'date', 'id').values_list(
+            'user_id', 'date', 'duration_hours', 'breaks_count', 'breaks_total_minutes', 'productivity'
+        ),
+    )
+
+
+def refresh_daily_metrics(user_id, days):
+    """
+    Пересчитывает сводки пользователя за указанные дни по его записям.
+    Сводки дней, за которые не осталось записей, удаляются.
+
+    Returns:
+        int: Количество сохраненных сводок
+    """
+    days = {day for day in days if day is not None}
+    if not days:
+        return 0
+
+    metrics = _collect_metrics(UserDailyMetrics, *_record_rows(
+        StressLevel.objects.filter(user_id=user_id, local_date__in=days),
+        SleepRecord.objects.filter(user_id=user_id, date__in=days),
+        WorkActivity.objects.filter(user_id=user_id, date__in=days)
+    ))
+
+    empty_days = days - {day for _, day in metrics}
+    if empty_days:
+        UserDailyMetrics.objects.filter(user_id=user_id, date__in=empty_days).delete()
+    if metrics:
+        UserDailyMetrics.objects.bulk_create(
+            metrics.values(),
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=METRIC_FIELDS
+        )
+    return len(metrics)
+
+
+def rebuild_daily_metrics(user_ids=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Полностью перестраивает сводки указанных пользователей (по умолчанию - всех).
+    Пользователи обрабатываются порциями по chunk_size, записи читаются потоком.
+
+    Returns:
+        int: Количество сохраненных сводок
+    """
+    if user_ids is None:
+        user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    user_ids = list(user_ids)
+
+    saved = 0
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        rows = _record_rows(
+            StressLevel.objects.filter(user_id__in=chunk),
+            SleepRecord.objects.filter(user_id__in=chunk),
+            WorkActivity.objects.filter(user_id__in=chunk)
+        )
+        metrics = _collect_metrics(
+            UserDailyMetrics, *(queryset.iterator(chunk_size=2000) for queryset in rows)
+        )
+        with transaction.atomic():
+            UserDailyMetrics.objects.filter(user_id__in=chunk).delete()
+            UserDailyMetrics.objects.bulk_create(metrics.values(), batch_size=1000)
+        saved += len(metrics)
+    return saved
+
+
+def daily_metrics_statistics(user, stream, start_date, end_date, granularity='day'):
+    """
+    Возвращает статистику потока данных пользователя ('stress', 'sleep' или 'work')
+    по дневным сводкам: не более одной строки на день вместо всех записей.
+    Формат результата совпадает с time_series_statistics.
+    """
+    rollup = DAILY_METRICS_ROLLUPS[stream]
+    return time_series_statistics(
+        UserDailyMetrics.objects.filter(user=user, **{f"{rollup['count']}__gt": 0}),
+        'date',
+        list(rollup['averages']),
+        start_date,
+        end_date,
+        granularity=granularity,
+        extreme_fields=list(rollup['extremes']),
+        rollup=rollup
+    )
+
+
+def summarize_daily_metrics(rows):
+    """
+    Считает средние показатели (и минимум/максимум стресса) по уже загруженным сводкам.
+
+    Returns:
+        dict: {'stress'|'sleep'|'work': {'count', 'avg_<показатель>', 'min_<показатель>', 'max_<показатель>'}}
+    """
+    summary = {}
+    for stream, rollup in DAILY_METRICS_ROLLUPS.items():
+        stream_summary = {'count': sum(getattr(row, rollup['count']) for row in rows)}
+        for name, (sum_field, count_field) in rollup['averages'].items():
+            count = sum(getattr(row, count_field) for row in rows)
+            stream_summary[f'avg_{name}'] = sum(getattr(row, sum_field) for row in rows) / count if count else None
+        for name, (min_field, max_field) in rollup['extremes'].items():
+            minimums = [getattr(row, min_field) for row in rows if getattr(row, min_field) is not None]
+            maximums = [getattr(row, max_field) for row in rows if getattr(row, max_field) is not None]
+            stream_summary[f'min_{name}'] = min(minimums) if minimums else None
+            stream_summary[f'max_{name}'] = max(maximums) if maximums else None
+        summary[stream] = stream_summary
+    return summary
@@ -0,0 +1,38 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+from django.db.models import F
+
+
+def shard_queryset(queryset, shard_index, shard_count, field='id'):
+    """
+    Оставляет в выборке только строки указанного шарда (по остатку от деления
+    id пользователя в поле field на количество шардов).
+    """
+    if shard_count <= 1:
+        return queryset
+    return queryset.annotate(shard=F(field) % shard_count).filter(shard=shard_index)
+
+
+def run_sharded(shard_function, workers=1, **kwargs):
+    """
+    Вызывает shard_function(shard_index=..., shard_count=workers, **kwargs) для каждого
+    шарда и возвращает сумму результатов. При workers > 1 шарды обрабатываются
+    в отдельных процессах (fork), иначе - один шард в текущем процессе.
+
+    shard_function должна быть функцией уровня модуля, чтобы ее можно было передать
+    в дочерний процесс.
+    """
+    if workers <= 1:
+        return shard_function(shard_index=0, shard_count=1, **kwargs)
+
+    # Дочерние процессы должны открыть собственные соединения с БД
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(shard_function, shard_index=shard_index, shard_count=workers, **kwargs)
+            for shard_index in range(workers)
+        ]
+        return sum(future.result() for future in futures)
@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from burnout_prevention.users.models import User
+from .anomalies import detect_stress_anomalies
+from .models import StressLevel, SleepRecord, WorkActivity
+from .rollups import refresh_daily_metrics
+
+
+# Отправляется после пересчета снимков риска выгорания пользователей (аргумент user_ids)
+burnout_risk_updated = Signal()
+
+# Отправляется после пакетного создания записей пользователя, для которых не вызываются
+# post_save (аргументы user_id и days - дни созданных записей)
+records_bulk_created = Signal()
+
+
+def record_day(instance):
+    """
+    Возвращает день, к которому относится запись о стрессе, сне или работе.
+    """
+    if isinstance(instance, StressLevel):
+        return instance.local_date
+    return instance.date
+
+
+def schedule_burnout_risk_recompute(user_id, day):
+    """
+    Ставит в очередь пересчет снимков риска выгорания начиная с указанного дня
+    (после фиксации транзакции).
+    """
+    from .tasks import recompute_burnout_risk
+
+    transaction.on_commit(
+        lambda: recompute_burnout_risk.delay(user_id, day.isoformat())
+    )
+
+
+@receiver(pre_save, sender=StressLevel)
+@receiver(pre_save, sender=SleepRecord)
+@receiver(pre_save, sender=WorkActivity)
+def remember_previous_day(sender, instance, **kwargs):
+    """
+    Запоминает прежнюю дату записи, чтобы при ее изменении пересчитать риск с более ранней даты.
+    """
+    instance._previous_day = None
+    if instance.pk:
+        day_field = 'local_date' if sender is StressLevel else 'date'
+        instance._previous_day = sender.objects.filter(pk=instance.pk).values_list(day_field, flat=True).first()
+
+
+@receiver(pre_save, sender=StressLevel)
+def detect_stress_anomaly(sender, instance, raw=False, **kwargs):
+    """
+    Сравнивает новую оценку стресса с базовым уровнем пользователя и обновляет его
+    в транзакции вставки записи (см. StressLevel.save). Изменение и удаление записей
+    базовый уровень не пересчитывают (для этого используется команда backfill_stress_anomalies).
+    """
+    if instance._state.adding and not raw:
+        detect_stress_anomalies(instance.user, [instance])
+
+
+@receiver(post_save, sender=StressLevel)
+@receiver(post_save, sender=SleepRecord)
+@receiver(post_save, sender=WorkActivity)
+@receiver(post_delete, sender=StressLevel)
+@receiver(post_delete, sender=SleepRecord)
+@receiver(post_delete, sender=WorkActivity)
+def refresh_daily_metrics_on_change(sender, instance, **kwargs):
+    """
+    Пересчитывает дневную сводку за день изменившейся записи (и за прежний день,
+    если дата записи изменилась).
+    """
+    # При удалении пользователя его сводки удаляются каскадно
+    origin = kwargs.get('origin')
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is User:
+        return
+    refresh_daily_metrics(instance.user_id, {record_day(instance), getattr(instance, '_previous_day', None)})
+
+
+@receiver(post_save, sender=StressLevel)
+@receiver(post_save, sender=SleepRecord)
+@receiver(post_save, sender=WorkActivity)
+@receiver(post_delete, sender=StressLevel)
+@receiver(post_delete, sender=SleepRecord)
+@receiver(post_delete, sender=WorkActivity)
+def recompute_burnout_risk_on_change(sender, instance, **kwargs):
+    """
+    Пересчитывает риск выгорания за день изменившейся записи и все последующие дни.
+    """
+    day = record_day(instance)
+    previous_day = getattr(instance, '_previous_day', None)
+    if previous_day and previous_day < day:
+        day = previous_day
+    schedule_burnout_risk_recompute(instance.user_id, day)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from .models import BurnoutRisk
+from .risk_engine import calculate_burnout_risk_range
+from .risk_models import get_risk_model
+from .signals import burnout_risk_updated
+
+
+def burnout_risk_from_data(user, risk_data):
+    """
+    Создает несохраненный объект BurnoutRisk из рассчитанных данных.
+    """
+    date = risk_data['date']
+    burnout_risk = BurnoutRisk(
+        user=user,
+        date=date,
+        risk_level=risk_data['risk_level'],
+        factors=risk_data['factors'],
+        recommendations=risk_data['recommendations'],
+        model_version=risk_data['model_version']
+    )
+    # created_at устанавливаем на начало дня для правильного отображения
+    burnout_risk.created_at = timezone.make_aware(datetime.combine(date, datetime.min.time()))
+    return burnout_risk
+
+
+def refresh_burnout_risk_snapshots(user_id, start_date, end_date=None, model=None):
+    """
+    Пересчитывает и сохраняет снимки риска выгорания за каждый день диапазона.
+    Если конечная дата не указана, пересчет выполняется по сегодняшний день.
+    Если модель не указана, используется активная модель риска.
+
+    Returns:
+        int: Количество сохраненных снимков
+    """
+    if end_date is None:
+        end_date = timezone.localdate()
+
+    snapshots = [
+        BurnoutRisk(
+            user_id=user_id,
+            date=risk_data['date'],
+            risk_level=risk_data['risk_level'],
+            factors=risk_data['factors'],
+            recommendations=risk_data['recommendations'],
+            model_version=risk_data['model_version']
+        )
+        for risk_data in calculate_burnout_risk_range(user_id, start_date, end_date, model)
+    ]
+
+    BurnoutRisk.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=['risk_level', 'factors', 'recommendations', 'model_version']
+    )
+    burnout_risk_updated.send(sender=BurnoutRisk, user_ids=[user_id])
+    return len(snapshots)
+
+
+def get_burnout_risk_history(user, start_date, end_date):
+    """
+    Возвращает риск выгорания за каждый день диапазона [start_date, end_date].
+
+    Используются сохраненные снимки активной модели риска; дни без такого снимка
+    рассчитываются динамически (и не сохраняются). Уровень риска в обоих случаях -
+    неокругленное дробное число.
+
+    Returns:
+        list: Список объектов BurnoutRisk по возрастанию даты
+    """
+    if start_date > end_date:
+        return []
+
+    model = get_risk_model()
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    risks = {
+        risk.date: risk
+        for risk in BurnoutRisk.objects.filter(
+            user=user,
+            date__gte=start_date,
+            date__lte=end_date,
+            model_version=model.version
+        )
+    }
+
+    missing = [date for date in dates if date not in risks]
+    if missing:
+        for risk_data in calculate_burnout_risk_range(user, missing[0], missing[-1], model):
+            if risk_data['date'] not in risks:
+                risks[risk_data['date']] = burnout_risk_from_data(user, risk_data)
+
+    return [risks[date] for date in dates]
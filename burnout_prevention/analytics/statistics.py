@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .aggregates import aggregate_windows, window_metrics
+
+
+# Допустимые шаги группировки временных рядов
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def parse_statistics_period(params, default_days):
+    """
+    Разбирает параметры start_date, end_date (YYYY-MM-DD) и granularity запроса статистики.
+    Если даты не указаны, используется период последних default_days дней.
+
+    Raises:
+        ValueError: Неверный формат даты или неизвестный шаг группировки
+
+    Returns:
+        tuple: (start_date, end_date, granularity)
+    """
+    today = timezone.localdate()
+    start_date_str = params.get('start_date')
+    end_date_str = params.get('end_date')
+    try:
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else today - timedelta(days=default_days)
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else today
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+    granularity = params.get('granularity') or 'day'
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Invalid granularity. Use {', '.join(GRANULARITIES)}")
+    return start_date, end_date, granularity
+
+
+def _trend(value):
+    """
+    Возвращает изменение показателя и его направление.
+    """
+    value = value or 0
+    direction = 'stable'
+    if value > 0:
+        direction = 'up'
+    elif value < 0:
+        direction = 'down'
+    return {'value': value, 'direction': direction}
+
+
+def time_series_statistics(queryset, date_field, value_fields, start_date, end_date,
+                           granularity='day', extreme_fields=(), rollup=None):
+    """
+    Считает статистику временного ряда за период [start_date, end_date].
+
+    date_field может быть DateField или DateTimeField (тогда используется локальная дата).
+    Для value_fields считаются средние значения и тренд (разница средних с предыдущим
+    периодом такой же длительности), для extreme_fields - минимум и максимум.
+    Ряд группируется в базе данных по дням, неделям или месяцам (granularity).
+    Если задано описание сводки rollup, queryset содержит дневные сводки
+    (см. analytics.rollups.daily_metrics_statistics).
+
+    Returns:
+        dict: {
+            'summary': {'count', 'avg_<поле>', 'min_<поле>', 'max_<поле>'},
+            'trend': {поле: {'value', 'direction'}},
+            'buckets': [{'date', 'count', 'avg_<поле>'}] по возрастанию даты
+        }
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}'")
+
+    field = queryset.model._meta.get_field(date_field)
+    date_lookup = f'{date_field}__date' if isinstance(field, models.DateTimeField) else date_field
+
+    period_days = (end_date - start_date).days + 1
+    previous_start_date = start_date - timedelta(days=period_days)
+    previous_end_date = start_date - timedelta(days=1)
+
+    current = Q(**{f'{date_lookup}__gte': start_date, f'{date_lookup}__lte': end_date})
+    previous = Q(**{f'{date_lookup}__gte': previous_start_date, f'{date_lookup}__lte': previous_end_date})
+
+    # Текущий и предыдущий периоды считаются одним запросом
+    windows = aggregate_windows(
+        queryset.filter(**{f'{date_lookup}__gte': previous_start_date, f'{date_lookup}__lte': end_date}),
+        {'current': current, 'previous': previous},
+        avg_fields=value_fields,
+        extreme_fields=extreme_fields,
+        rollup=rollup
+    )
+    summary = windows['current']
+
+    trend = {}
+    for name in value_fields:
+        previous_avg = windows['previous'][f'avg_{name}']
+        trend[name] = _trend((summary[f'avg_{name}'] or 0) - (previous_avg or 0))
+
+    # Группировка ряда по периодам в базе данных
+    bucket = Trunc(date_field, granularity, output_field=models.DateField())
+    rows = queryset.filter(current).annotate(bucket=bucket).values('bucket').annotate(
+        **window_metrics(value_fields, rollup=rollup)
+    ).order_by('bucket')
+
+    buckets = []
+    for row in rows:
+        row['date'] = row.pop('bucket')
+        buckets.append(row)
+
+    return {
+        'summary': summary,
+        'trend': trend,
+        'buckets': buckets
+    }
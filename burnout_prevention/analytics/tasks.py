@@ -0,0 +1,45 @@
+from datetime import date as date_cls
+
+from celery import shared_task
+from django.utils import timezone
+
+from burnout_prevention.users.models import User
+from .batch_scoring import score_burnout_risk_population
+from .correlations import compute_population_correlations
+from .snapshots import refresh_burnout_risk_snapshots
+
+
+@shared_task
+def recompute_burnout_risk(user_id, start_date):
+    """
+    Пересчитывает снимки риска выгорания пользователя начиная с указанной даты
+    (в формате YYYY-MM-DD) и по сегодняшний день.
+    """
+    # Пользователь мог быть удален вместе со всеми записями
+    if not User.objects.filter(pk=user_id).exists():
+        return 0
+    return refresh_burnout_risk_snapshots(user_id, date_cls.fromisoformat(start_date))
+
+
+@shared_task
+def compute_daily_burnout_risk(as_of=None, model_version=None):
+    """
+    Ночная задача: сохраняет снимок риска выгорания для всех активных пользователей
+    на указанную дату (в формате YYYY-MM-DD, по умолчанию сегодня) пакетным расчетом.
+    Если версия модели риска не указана, используется активная.
+    """
+    as_of = date_cls.fromisoformat(as_of) if as_of else timezone.localdate()
+    # Воркеры Celery не могут порождать дочерние процессы, поэтому расчет идет в одном процессе;
+    # для параллельного расчета используйте команду score_burnout_risk --workers
+    return score_burnout_risk_population(as_of, model_version=model_version)
+
+
+@shared_task
+def compute_weekly_correlations(as_of=None):
+    """
+    Еженедельная задача: рассчитывает и кэширует корреляции показателей сна
+    с показателями стресса и работы для всех активных пользователей
+    на неделю, в которую входит дата as_of (в формате YYYY-MM-DD, по умолчанию сегодня).
+    """
+    as_of = date_cls.fromisoformat(as_of) if as_of else timezone.localdate()
+    return compute_population_correlations(as_of)
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from burnout_prevention.analytics.models import StressBaseline, StressLevel
+from burnout_prevention.users.models import User
+
+
+class StressAnomalyBaselineTests(TestCase):
+    """
+    Базовый уровень стресса обновляется только вместе с вставкой новой оценки.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='baseline@example.com', username='baseline', password='password')
+        StressLevel.objects.create(user=self.user, level=50)
+
+    def baseline(self):
+        return StressBaseline.objects.values_list('mean', 'variance', 'readings_count').get(user=self.user)
+
+    def test_failed_insert_does_not_update_baseline(self):
+        before = self.baseline()
+        with mock.patch.object(StressLevel, '_do_insert', side_effect=IntegrityError('insert failed')):
+            with self.assertRaises(IntegrityError):
+                StressLevel.objects.create(user=self.user, level=95)
+        self.assertEqual(self.baseline(), before)
+        self.assertEqual(StressLevel.objects.filter(user=self.user).count(), 1)
+
+    def test_rolled_back_transaction_does_not_update_baseline(self):
+        before = self.baseline()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                StressLevel.objects.create(user=self.user, level=95)
+                raise RuntimeError('request failed')
+        self.assertEqual(self.baseline(), before)
+
+    def test_resave_does_not_update_baseline(self):
+        record = StressLevel.objects.create(user=self.user, level=80)
+        before = self.baseline()
+        self.assertEqual(before[2], 2)
+
+        record.notes = 'после работы'
+        record.save()
+        StressLevel.objects.get(pk=record.pk).save()
+        self.assertEqual(self.baseline(), before)
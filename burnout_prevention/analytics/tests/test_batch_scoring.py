@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from burnout_prevention.analytics.batch_scoring import DEFAULT_LOOKBACK_DAYS, score_burnout_risk_shard
+from burnout_prevention.analytics.models import BurnoutRisk, SleepRecord, StressLevel, WorkActivity
+from burnout_prevention.analytics.risk_engine import calculate_burnout_risk
+from burnout_prevention.analytics.risk_models import get_risk_model, get_risk_model_versions
+from burnout_prevention.api.cache import dashboard_cache_key, set_cached_dashboard
+from burnout_prevention.users.models import User
+
+
+class BatchScoringTests(TestCase):
+    """
+    Пакетный расчет риска выгорания совпадает с расчетом по одному пользователю.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        now = timezone.now()
+        self.users = []
+        # Свежие данные, данные старше периода чтения сводок, частичные данные и их отсутствие
+        for index, age in enumerate([0, 3, DEFAULT_LOOKBACK_DAYS + 10, None]):
+            user = User.objects.create_user(email=f'batch{index}@example.com', username=f'batch{index}', password='password')
+            self.users.append(user)
+            if age is None:
+                continue
+            for offset in range(age, age + 5):
+                date = self.today - timedelta(days=offset)
+                WorkActivity.objects.create(user=user, date=date, duration_hours=8 + offset % 4, productivity=6)
+                StressLevel.objects.create(user=user, level=40 + 7 * offset % 50, created_at=now - timedelta(days=offset))
+                if index != 1:
+                    SleepRecord.objects.create(user=user, date=date, duration_hours=5 + offset % 3, quality=4 + index)
+
+    def test_scores_match_per_user_calculation(self):
+        for version in get_risk_model_versions():
+            model = get_risk_model(version)
+            self.assertEqual(score_burnout_risk_shard(self.today, chunk_size=2, model_version=version), 4)
+
+            for user in self.users:
+                expected = calculate_burnout_risk(user, self.today, model)
+                snapshot = BurnoutRisk.objects.get(user=user, date=self.today)
+                self.assertEqual(snapshot.model_version, version)
+                self.assertAlmostEqual(snapshot.risk_level, expected['risk_level'])
+                self.assertEqual(snapshot.recommendations, expected['recommendations'])
+                self.assertEqual(snapshot.factors.keys(), expected['factors'].keys())
+                for name, factor in expected['factors'].items():
+                    self.assertAlmostEqual(snapshot.factors[name]['value'], factor['value'])
+
+    def test_sharded_scores_cover_all_users(self):
+        counts = [score_burnout_risk_shard(self.today, shard_index, 3) for shard_index in range(3)]
+
+        self.assertEqual(sum(counts), 4)
+        self.assertEqual(BurnoutRisk.objects.filter(date=self.today).count(), 4)
+
+    def test_saving_invalidates_dashboard_cache(self):
+        for user in self.users:
+            set_cached_dashboard(user.id, {'cached': True})
+
+        score_burnout_risk_shard(self.today, chunk_size=3)
+
+        for user in self.users:
+            self.assertIsNone(cache.get(dashboard_cache_key(user.id)))
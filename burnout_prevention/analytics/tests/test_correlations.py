@@ -0,0 +1,136 @@
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from burnout_prevention.analytics.correlations import (
+    DEFAULT_CORRELATION_LAGS,
+    _rankdata,
+    correlate_series,
+    correlation_period,
+    parse_correlation_params,
+    user_correlations,
+)
+from burnout_prevention.analytics.models import SleepRecord, StressLevel
+from burnout_prevention.users.models import User
+
+
+def empty_series(days):
+    return {
+        name: np.full(days, np.nan)
+        for name in ('sleep.duration_hours', 'sleep.quality', 'stress.level', 'work.productivity')
+    }
+
+
+class CorrelateSeriesTests(SimpleTestCase):
+    """
+    Корреляции Пирсона и Спирмена между показателями сна и показателями следующих дней.
+    """
+
+    def result(self, results, x, y, lag):
+        return next(item for item in results if item['x'] == x and item['y'] == y and item['lag'] == lag)
+
+    def test_spearman_of_monotonic_nonlinear_series(self):
+        series = empty_series(8)
+        series['sleep.duration_hours'][:] = np.arange(1, 9)
+        # Стресс на следующий день - монотонная, но нелинейная функция сна
+        series['stress.level'][1:] = 100 - np.arange(1, 8) ** 3
+
+        result = self.result(correlate_series(series, (1,)), 'sleep.duration_hours', 'stress.level', 1)
+
+        self.assertEqual(result['samples'], 7)
+        self.assertAlmostEqual(result['spearman'], -1.0)
+        self.assertGreater(result['pearson'], -1.0)
+        self.assertAlmostEqual(result['pearson'], float(np.corrcoef(np.arange(1, 8), 100 - np.arange(1, 8) ** 3)[0, 1]))
+
+    def test_known_spearman_with_ties(self):
+        x = np.array([1, 2, 2, 3, 4, 5], dtype=float)
+        y = np.array([2, 1, 4, 3, 6, 5], dtype=float)
+        series = empty_series(6)
+        series['sleep.quality'][:] = x
+        series['work.productivity'][:] = y
+
+        result = self.result(correlate_series(series, (0,)), 'sleep.quality', 'work.productivity', 0)
+
+        # Пирсон по рангам x = [1, 2.5, 2.5, 4, 5, 6] и y = [2, 1, 4, 3, 6, 5]
+        self.assertAlmostEqual(result['spearman'], 0.7537023463)
+
+    def test_not_enough_samples(self):
+        series = empty_series(6)
+        series['sleep.duration_hours'][:] = np.arange(6)
+        series['stress.level'][:4] = np.arange(4)
+
+        result = self.result(correlate_series(series, (0,)), 'sleep.duration_hours', 'stress.level', 0)
+
+        self.assertEqual(result['samples'], 4)
+        self.assertIsNone(result['pearson'])
+        self.assertIsNone(result['spearman'])
+
+    def test_rankdata_ties(self):
+        self.assertEqual(_rankdata(np.array([10, 30, 20, 30, 10.0])).tolist(), [1.5, 4.5, 3.0, 4.5, 1.5])
+
+
+class CorrelationParamsTests(SimpleTestCase):
+    """
+    Разбор параметров запроса корреляций и период анализа.
+    """
+
+    def test_period_ends_before_week_of_calculation(self):
+        week_start, start_date, end_date = correlation_period(date(2024, 4, 18))
+
+        self.assertEqual(week_start, date(2024, 4, 15))
+        self.assertEqual(end_date, date(2024, 4, 14))
+        self.assertEqual((end_date - start_date).days, 83)
+
+    def test_parse(self):
+        self.assertEqual(
+            parse_correlation_params({'date': '2024-04-18', 'lags': '3,0,3'}),
+            (date(2024, 4, 18), (0, 3))
+        )
+        self.assertEqual(parse_correlation_params({'date': '2024-04-18'})[1], DEFAULT_CORRELATION_LAGS)
+
+    def test_invalid_params(self):
+        for params in ({'date': '18.04.2024'}, {'lags': 'a'}, {'lags': '8'}, {'lags': '-1'}):
+            with self.subTest(params=params), self.assertRaises(ValueError):
+                parse_correlation_params(params)
+
+
+class UserCorrelationsTests(TestCase):
+    """
+    Корреляции пользователя по дневным сводкам хранятся в кэше на неделю расчета.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='correlations@example.com', username='correlations', password='password')
+        self.as_of = date(2024, 4, 18)
+        _, start_date, end_date = correlation_period(self.as_of)
+        for offset in range(10):
+            day = end_date - timedelta(days=offset)
+            hours = 5 + offset % 4
+            SleepRecord.objects.create(user=self.user, date=day, duration_hours=hours, quality=7)
+            # Стресс на следующий день тем ниже, чем дольше сон
+            StressLevel.objects.create(
+                user=self.user, level=100 - hours * 10,
+                created_at=timezone.make_aware(datetime.combine(day + timedelta(days=1), time(12)))
+            )
+
+    def test_cached_for_week(self):
+        result = user_correlations(self.user, self.as_of)
+        sleep_stress = next(
+            item for item in result['correlations']
+            if item['x'] == 'sleep.duration_hours' and item['y'] == 'stress.level'
+        )
+        self.assertEqual((result['start_date'], result['end_date']), correlation_period(self.as_of)[1:])
+        # Стресс за день после окончания периода не входит в анализ
+        self.assertEqual(sleep_stress['samples'], 9)
+        self.assertAlmostEqual(sleep_stress['pearson'], -1.0)
+        self.assertAlmostEqual(sleep_stress['spearman'], -1.0)
+
+        SleepRecord.objects.filter(user=self.user).delete()
+        # Другой день той же недели расчета - результат из кэша
+        with self.assertNumQueries(0):
+            cached = user_correlations(self.user, self.as_of + timedelta(days=1))
+        self.assertEqual(cached, result)
@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.forms.models import model_to_dict
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+
+class BackfillMigrationTests(TransactionTestCase):
+    """
+    Миграции заполнения данных на исторических моделях дают тот же результат,
+    что и текущий код пересчета.
+    """
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([target])
+        return executor.loader.project_state([target]).apps
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def tearDown(self):
+        self.migrate_to_latest()
+
+    def test_daily_metrics_backfill_matches_rebuild(self):
+        apps = self.migrate(('analytics', '0006_userdailymetrics'))
+        User = apps.get_model('users', 'User')
+        user = User.objects.create(email='migrate@example.com', username='migrate')
+        start = timezone.make_aware(datetime(2024, 4, 1, 9))
+        StressLevel = apps.get_model('analytics', 'StressLevel')
+        for offset in range(6):
+            stress_level = StressLevel.objects.create(user=user, level=20 + 10 * offset)
+            StressLevel.objects.filter(pk=stress_level.pk).update(created_at=start + timedelta(hours=10 * offset))
+            apps.get_model('analytics', 'SleepRecord').objects.create(
+                user=user, date=date(2024, 4, 1 + offset // 2), duration_hours=6 + offset, quality=offset or None
+            )
+            apps.get_model('analytics', 'WorkActivity').objects.create(
+                user=user, date=date(2024, 4, 1 + offset // 3), duration_hours=7 + offset,
+                breaks_count=offset, breaks_total_minutes=5 * offset, productivity=offset or None
+            )
+
+        apps = self.migrate(('analytics', '0007_backfill_userdailymetrics'))
+        UserDailyMetrics = apps.get_model('analytics', 'UserDailyMetrics')
+
+        def metrics():
+            return {
+                row.date: model_to_dict(row, exclude=['id', 'updated_at'])
+                for row in UserDailyMetrics.objects.filter(user_id=user.pk)
+            }
+
+        backfilled = metrics()
+        self.assertEqual(len(backfilled), 3)
+
+        self.migrate_to_latest()
+        from burnout_prevention.analytics.rollups import rebuild_daily_metrics
+        rebuild_daily_metrics(user_ids=[user.pk])
+        self.assertEqual(metrics(), backfilled)
+
+    def test_stress_anomalies_backfill_matches_rebuild(self):
+        apps = self.migrate(('analytics', '0011_stress_anomalies'))
+        User = apps.get_model('users', 'User')
+        user = User.objects.create(email='anomalies@example.com', username='anomalies', stress_level_base=30)
+        start = timezone.make_aware(datetime(2024, 4, 1, 9))
+        StressLevel = apps.get_model('analytics', 'StressLevel')
+        for offset, level in enumerate([30, 32, 28, 31, 29, 30, 95, 30]):
+            stress_level = StressLevel.objects.create(user=user, level=level, local_date=date(2024, 4, 1))
+            StressLevel.objects.filter(pk=stress_level.pk).update(created_at=start + timedelta(hours=offset))
+
+        apps = self.migrate(('analytics', '0012_backfill_stress_anomalies'))
+        StressLevel = apps.get_model('analytics', 'StressLevel')
+        StressBaseline = apps.get_model('analytics', 'StressBaseline')
+
+        def state():
+            return (
+                list(StressLevel.objects.filter(user_id=user.pk).order_by('created_at').values_list(
+                    'level', 'z_score', 'is_anomaly'
+                )),
+                model_to_dict(StressBaseline.objects.get(user_id=user.pk), exclude=['id', 'updated_at']),
+            )
+
+        backfilled = state()
+        self.assertEqual([level for level, _, is_anomaly in backfilled[0] if is_anomaly], [95])
+
+        self.migrate_to_latest()
+        from burnout_prevention.analytics.anomalies import rebuild_stress_baselines
+        self.assertEqual(rebuild_stress_baselines(user_ids=[user.pk]), 0)
+        self.assertEqual(state(), backfilled)
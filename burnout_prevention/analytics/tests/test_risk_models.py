@@ -0,0 +1,64 @@
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from burnout_prevention.analytics.risk_models import get_risk_model
+
+
+class RiskModelTests(SimpleTestCase):
+    """
+    Версии модели риска выгорания: расчет для одной записи и для массивов, связь v2 с v1.
+    """
+
+    values = [
+        {'work_hours': 11, 'stress_level': 70, 'sleep_hours': 5.5, 'sleep_quality': 3},
+        {'work_hours': None, 'stress_level': None, 'sleep_hours': None, 'sleep_quality': 0},
+        {'work_hours': 6, 'stress_level': 20, 'sleep_hours': 9, 'sleep_quality': 9},
+    ]
+
+    def test_v1_score(self):
+        risk_level, points, _ = get_risk_model('v1').score(**self.values[0])
+
+        self.assertAlmostEqual(points['overtime'], 3)
+        self.assertAlmostEqual(points['workday_duration'], 1.2)
+        self.assertAlmostEqual(points['stress'], 7)
+        self.assertAlmostEqual(points['sleep_quality'], 7)
+        self.assertAlmostEqual(points['sleep_deprivation'], 1)
+        self.assertAlmostEqual(risk_level, (3 * 0.15 + 1.2 * 0.10 + 7 * 0.2 + 7 * 0.2 + 1 * 0.2) * 10)
+
+    def test_array_score_matches_scalar_score(self):
+        for version in ('v1', 'v2'):
+            model = get_risk_model(version)
+            arrays = {
+                name: np.array([np.nan if row.get(name) is None else row[name] for row in self.values], dtype=float)
+                for name in model.inputs
+            }
+            risk_levels, points, _ = model.score(**arrays)
+
+            for index, row in enumerate(self.values):
+                risk_level, row_points, _ = model.score(**row)
+                self.assertAlmostEqual(risk_levels[index], risk_level)
+                for name, value in row_points.items():
+                    self.assertAlmostEqual(points[name][index], value)
+
+    def test_v2_extends_v1(self):
+        v1, v2 = get_risk_model('v1'), get_risk_model('v2')
+
+        self.assertEqual(list(v2.inputs), [*v1.inputs, 'stress_anomalies'])
+        self.assertEqual(v2.factors[:-1], v1.factors)
+        self.assertEqual([rule for rule in v2.rules if 'stress_anomalies' not in rule.factors], v1.rules)
+
+        for row in self.values:
+            self.assertEqual(v2.score(**row, stress_anomalies=0)[0], v1.score(**row)[0])
+        risk_level, points, _ = v2.score(**self.values[2], stress_anomalies=4)
+        self.assertAlmostEqual(points['stress_anomalies'], 8)
+        self.assertAlmostEqual(risk_level, v1.score(**self.values[2])[0] + 8 * 0.15 * 10)
+        self.assertIn('Резкие скачки стресса', [
+            recommendation['title'] for recommendation in v2.build_recommendations(points)
+        ])
+
+    @override_settings(BURNOUT_RISK_MODEL_VERSION='v2')
+    def test_active_and_unknown_versions(self):
+        self.assertEqual(get_risk_model().version, 'v2')
+        with self.assertRaises(ImproperlyConfigured):
+            get_risk_model('v0')
@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import SleepRecord, StressLevel
+from burnout_prevention.analytics.rolling import rolling_metrics
+from burnout_prevention.users.models import User
+
+
+class RollingMetricsTests(TestCase):
+    """
+    Скользящие показатели по дневным сводкам: окна по календарным дням и изменение за день.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='rolling@example.com', username='rolling', password='password')
+        self.start_date, self.end_date = date(2024, 4, 10), date(2024, 4, 16)
+        # День до диапазона, два дня подряд (во втором две записи) и день после пропуска
+        for day, hours in [(5, 8), (10, 6), (11, 7), (11, 9), (14, 5)]:
+            SleepRecord.objects.create(user=self.user, date=date(2024, 4, day), duration_hours=hours, quality=7)
+
+    def points(self, window):
+        return [
+            (point['date'].day, point['value'], point['count'], point['rolling_avg'], point['delta'])
+            for point in rolling_metrics(self.user, 'sleep', self.start_date, self.end_date, window=window)
+        ]
+
+    def test_window_of_one_day(self):
+        # Изменение за первый день считается относительно дня до начала диапазона
+        self.assertEqual(self.points(1), [
+            (10, 6.0, 1, 6.0, -2.0),
+            (11, 8.0, 2, 8.0, 2.0),
+            (14, 5.0, 1, 5.0, -3.0),
+        ])
+
+    def test_calendar_day_windows(self):
+        points = rolling_metrics(self.user, 'sleep', self.start_date, self.end_date, window=3)
+
+        self.assertEqual([point['date'].day for point in points], [10, 11, 14])
+        self.assertEqual([point['rolling_count'] for point in points], [1, 3, 1])
+        self.assertEqual([point['rolling_sum'] for point in points], [6, 22, 5])
+        self.assertAlmostEqual(points[1]['rolling_avg'], 22 / 3)
+        self.assertEqual([point['delta'] for point in points], [-2.0, 2.0, -3.0])
+
+    def test_no_previous_day(self):
+        SleepRecord.objects.filter(user=self.user, date=date(2024, 4, 5)).delete()
+
+        self.assertIsNone(self.points(1)[0][4])
+        self.assertIsNone(self.points(7)[0][4])
+
+    def test_integer_metrics_are_averaged_as_floats(self):
+        created_at = timezone.make_aware(datetime(2024, 4, 12, 12))
+        for minutes, level in [(0, 30), (5, 35), (60 * 24, 40)]:
+            StressLevel.objects.create(user=self.user, level=level, created_at=created_at + timedelta(minutes=minutes))
+
+        points = rolling_metrics(self.user, 'stress', self.start_date, self.end_date, window=1)
+
+        self.assertEqual([(point['value'], point['delta']) for point in points], [(32.5, None), (40.0, 7.5)])
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get('/api/analytics/rolling/', {
+            'stream': 'sleep', 'window': 1, 'start_date': '2024-04-10', 'end_date': '2024-04-16'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['points'][0]['delta'], -2.0)
+        self.assertEqual(client.get('/api/analytics/rolling/', {'window': 0}).status_code, 400)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.forms.models import model_to_dict
+from django.test import TestCase
+from django.utils import timezone
+
+from burnout_prevention.analytics.models import SleepRecord, StressLevel, UserDailyMetrics, WorkActivity
+from burnout_prevention.analytics.rollups import rebuild_daily_metrics
+from burnout_prevention.users.models import User
+
+
+class DailyMetricsRollupTests(TestCase):
+    """
+    Сводки, поддерживаемые сигналами, совпадают с полностью перестроенными.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='rollup@example.com', username='rollup', password='password')
+        self.now = timezone.now()
+        self.today = timezone.localdate()
+
+    def metrics(self):
+        return {
+            row.date: model_to_dict(row, exclude=['id', 'updated_at'])
+            for row in UserDailyMetrics.objects.filter(user=self.user)
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.metrics()
+        rebuild_daily_metrics(user_ids=[self.user.id])
+        self.assertEqual(incremental, self.metrics())
+
+    def create_records(self):
+        stress = [
+            StressLevel.objects.create(user=self.user, level=30 + 10 * index, created_at=self.now - timedelta(days=index // 2, hours=index))
+            for index in range(6)
+        ]
+        sleep = [
+            SleepRecord.objects.create(user=self.user, date=self.today - timedelta(days=index), duration_hours=6 + index, quality=5 + index)
+            for index in range(3)
+        ]
+        work = [
+            WorkActivity.objects.create(user=self.user, date=self.today - timedelta(days=index), duration_hours=8 + index,
+                                        breaks_count=index, breaks_total_minutes=10 * index, productivity=6)
+            for index in range(3)
+        ]
+        return stress, sleep, work
+
+    def test_create(self):
+        self.create_records()
+        self.assertEqual(len(self.metrics()), 3)
+        self.assertMatchesRebuild()
+
+    def test_update(self):
+        stress, sleep, work = self.create_records()
+        stress[0].level = 95
+        stress[0].save()
+        sleep[1].quality = 2
+        sleep[1].save()
+        work[2].productivity = None
+        work[2].save()
+        self.assertMatchesRebuild()
+
+    def test_move_to_another_day(self):
+        stress, sleep, work = self.create_records()
+        # Единственная запись дня переносится на день без записей, последняя запись дня - на другой день
+        stress[5].created_at = self.now - timedelta(days=10)
+        stress[5].save()
+        stress[0].created_at = self.now - timedelta(days=1, minutes=1)
+        stress[0].save()
+        sleep[2].date = self.today - timedelta(days=5)
+        sleep[2].save()
+        work[0].date = self.today - timedelta(days=1)
+        work[0].save()
+        self.assertIn(self.today - timedelta(days=10), self.metrics())
+        self.assertMatchesRebuild()
+
+    def test_delete(self):
+        stress, sleep, work = self.create_records()
+        stress[1].delete()
+        sleep[2].delete()
+        work[2].delete()
+        for record in stress[4:]:
+            record.delete()
+        self.assertNotIn(self.today - timedelta(days=2), self.metrics())
+        self.assertMatchesRebuild()
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+from django.test import SimpleTestCase, TestCase
+
+from burnout_prevention.analytics.models import StressLevel, WorkActivity
+from burnout_prevention.analytics.rollups import daily_metrics_statistics
+from burnout_prevention.analytics.statistics import parse_statistics_period, time_series_statistics
+from burnout_prevention.users.models import User
+
+
+class TimeSeriesStatisticsTests(TestCase):
+    """
+    Статистика временного ряда: итоги периода, тренд и группировка по дням, неделям и месяцам.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='stats@example.com', username='stats', password='password')
+        # Понедельник 1 - воскресенье 14 апреля 2024 и неделя перед ними
+        self.start_date, self.end_date = date(2024, 4, 1), date(2024, 4, 14)
+        for offset in range(-7, 14):
+            day = self.start_date + timedelta(days=offset)
+            WorkActivity.objects.create(
+                user=self.user, date=day, duration_hours=6 if offset < 0 else 8 + offset // 7,
+                productivity=5 + offset % 3
+            )
+
+    def statistics(self, granularity, value_fields=('duration_hours', 'productivity')):
+        return time_series_statistics(
+            WorkActivity.objects.filter(user=self.user), 'date', list(value_fields),
+            self.start_date, self.end_date, granularity=granularity
+        )
+
+    def test_summary_trend_and_weekly_buckets(self):
+        statistics = self.statistics('week')
+
+        self.assertEqual(statistics['summary']['count'], 14)
+        self.assertAlmostEqual(statistics['summary']['avg_duration_hours'], 8.5)
+        self.assertEqual(statistics['trend']['duration_hours']['direction'], 'up')
+        # Предыдущий период такой же длины (14 дней) содержит 7 записей по 6 часов
+        self.assertAlmostEqual(statistics['trend']['duration_hours']['value'], 2.5)
+        self.assertEqual(
+            [(bucket['date'], bucket['count'], bucket['avg_duration_hours']) for bucket in statistics['buckets']],
+            [(date(2024, 4, 1), 7, 8.0), (date(2024, 4, 8), 7, 9.0)]
+        )
+
+    def test_daily_and_monthly_buckets(self):
+        self.assertEqual(len(self.statistics('day')['buckets']), 14)
+        self.assertEqual(
+            [(bucket['date'], bucket['count']) for bucket in self.statistics('month')['buckets']],
+            [(date(2024, 4, 1), 14)]
+        )
+
+    def test_rollup_statistics_match_records(self):
+        for level in (30, 50, 90):
+            StressLevel.objects.create(user=self.user, level=level)
+        today = StressLevel.objects.get(level=30).local_date
+
+        for granularity in ('day', 'week'):
+            self.assertEqual(
+                daily_metrics_statistics(self.user, 'work', self.start_date, self.end_date, granularity),
+                self.statistics(granularity, ['duration_hours', 'breaks_count', 'breaks_total_minutes', 'productivity'])
+            )
+            from_records = time_series_statistics(
+                StressLevel.objects.filter(user=self.user), 'created_at', ['level'],
+                today, today, granularity=granularity, extreme_fields=['level']
+            )
+            self.assertEqual(daily_metrics_statistics(self.user, 'stress', today, today, granularity), from_records)
+        self.assertEqual((from_records['summary']['min_level'], from_records['summary']['max_level']), (30, 90))
+
+
+class ParseStatisticsPeriodTests(SimpleTestCase):
+
+    def test_parses_dates_and_granularity(self):
+        self.assertEqual(
+            parse_statistics_period({'start_date': '2024-04-01', 'end_date': '2024-04-14', 'granularity': 'month'}, 7),
+            (date(2024, 4, 1), date(2024, 4, 14), 'month')
+        )
+
+    def test_rejects_invalid_values(self):
+        with self.assertRaises(ValueError):
+            parse_statistics_period({'start_date': '01.04.2024'}, 7)
+        with self.assertRaises(ValueError):
+            parse_statistics_period({'granularity': 'year'}, 7)
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from burnout_prevention.analytics.models import StressBaseline, StressLevel, UserDailyMetrics
+from burnout_prevention.users.models import User
+
+
+class StressLevelLocalDateTests(TestCase):
+    """
+    Локальная дата оценки стресса совпадает с датой created_at в часовом поясе проекта.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='local@example.com', username='local', password='password')
+
+    def test_local_date_uses_project_time_zone(self):
+        # 22:30 UTC - уже следующий день по местному времени (Europe/Moscow)
+        created_at = datetime(2024, 4, 1, 22, 30, tzinfo=dt_timezone.utc)
+        record = StressLevel.objects.create(user=self.user, level=40, created_at=created_at)
+
+        self.assertEqual(record.local_date, timezone.localdate(created_at))
+        self.assertNotEqual(record.local_date, created_at.date())
+        self.assertEqual(StressLevel.objects.filter(local_date=timezone.localdate(created_at)).get(), record)
+
+    def test_local_date_follows_created_at(self):
+        record = StressLevel.objects.create(user=self.user, level=40)
+        record.created_at = timezone.now() - timedelta(days=3)
+        record.save()
+
+        record.refresh_from_db()
+        self.assertEqual(record.local_date, timezone.localdate(record.created_at))
+
+
+class BenchmarkStressQueriesCommandTests(TestCase):
+
+    def test_seed_maintains_rollups_and_baselines(self):
+        stdout = StringIO()
+        call_command('benchmark_stress_queries', seed=60, users=3, days=30, repeat=1, stdout=stdout)
+
+        self.assertEqual(StressLevel.objects.count(), 60)
+        self.assertEqual(UserDailyMetrics.objects.aggregate(total=Sum('stress_count'))['total'], 60)
+        self.assertEqual(StressBaseline.objects.aggregate(total=Sum('readings_count'))['total'], 60)
+        self.assertIn('Статистика за период (local_date)', stdout.getvalue())
@@ -0,0 +1 @@
+default_app_config = 'burnout_prevention.api.apps.ApiConfig' 
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class ApiConfig(AppConfig):
+    name = 'burnout_prevention.api'
+    verbose_name = _('API')
+    
+    def ready(self):
+        import burnout_prevention.api.signals
@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+DASHBOARD_HITS_KEY = 'dashboard:stats:hits'
+DASHBOARD_MISSES_KEY = 'dashboard:stats:misses'
+
+# Максимальное количество наборов фильтров, для которых хранится статистика рекомендаций пользователя
+RECOMMENDATION_STATS_MAX_ENTRIES = 32
+
+
+def dashboard_cache_key(user_id, date=None):
+    """
+    Ключ кэша панели мониторинга пользователя на локальную дату (по умолчанию сегодня).
+    """
+    if date is None:
+        date = timezone.localdate()
+    return f'dashboard:{user_id}:{date.isoformat()}'
+
+
+def _increment(key):
+    """
+    Увеличивает счетчик в общем кэше, создавая его при необходимости.
+    """
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Счетчик вытеснен из кэша между add и incr
+        cache.set(key, 1, timeout=None)
+
+
+def get_cached_dashboard(user_id):
+    """
+    Возвращает закэшированные данные панели мониторинга или None и учитывает попадание/промах.
+    """
+    data = cache.get(dashboard_cache_key(user_id))
+    _increment(DASHBOARD_HITS_KEY if data is not None else DASHBOARD_MISSES_KEY)
+    return data
+
+
+def set_cached_dashboard(user_id, data):
+    """
+    Сохраняет данные панели мониторинга пользователя в кэш.
+    """
+    cache.set(dashboard_cache_key(user_id), data, settings.DASHBOARD_CACHE_TIMEOUT)
+
+
+def invalidate_dashboard(user_id):
+    """
+    Удаляет закэшированные данные панели мониторинга пользователя.
+    """
+    cache.delete(dashboard_cache_key(user_id))
+
+
+def invalidate_dashboards(user_ids):
+    """
+    Удаляет закэшированные данные панели мониторинга пользователей одной операцией с кэшем.
+    """
+    today = timezone.localdate()
+    cache.delete_many([dashboard_cache_key(user_id, today) for user_id in user_ids])
+
+
+def get_dashboard_cache_stats():
+    """
+    Возвращает счетчики попаданий и промахов кэша панели мониторинга.
+    """
+    counters = cache.get_many([DASHBOARD_HITS_KEY, DASHBOARD_MISSES_KEY])
+    hits = counters.get(DASHBOARD_HITS_KEY, 0)
+    misses = counters.get(DASHBOARD_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0
+    }
+
+
+def reset_dashboard_cache_stats():
+    """
+    Сбрасывает счетчики попаданий и промахов.
+    """
+    cache.delete_many([DASHBOARD_HITS_KEY, DASHBOARD_MISSES_KEY])
+
+
+def recommendation_stats_cache_key(user_id):
+    """
+    Ключ кэша статистики рекомендаций пользователя (все наборы фильтров в одной записи,
+    чтобы сбрасывать их одним удалением).
+    """
+    return f'recommendation-stats:{user_id}'
+
+
+def get_cached_recommendation_stats(user_id, filters):
+    """
+    Возвращает закэшированную статистику рекомендаций для набора фильтров или None.
+    """
+    entries = cache.get(recommendation_stats_cache_key(user_id)) or {}
+    return entries.get(filters)
+
+
+def set_cached_recommendation_stats(user_id, filters, stats):
+    """
+    Сохраняет статистику рекомендаций пользователя для набора фильтров в кэш.
+    """
+    key = recommendation_stats_cache_key(user_id)
+    entries = cache.get(key) or {}
+    if len(entries) >= RECOMMENDATION_STATS_MAX_ENTRIES:
+        entries = {}
+    entries[filters] = stats
+    cache.set(key, entries, settings.RECOMMENDATION_STATS_CACHE_TIMEOUT)
+
+
+def invalidate_recommendation_stats(user_id):
+    """
+    Удаляет закэшированную статистику рекомендаций пользователя.
+    """
+    cache.delete(recommendation_stats_cache_key(user_id))
+
+
+def invalidate_user_recommendation_caches(user_ids):
+    """
+    Удаляет кэши, зависящие от рекомендаций пользователей (панель мониторинга и
+    статистика рекомендаций), одной операцией с кэшем.
+    """
+    today = timezone.localdate()
+    cache.delete_many(
+        [dashboard_cache_key(user_id, today) for user_id in user_ids]
+        + [recommendation_stats_cache_key(user_id) for user_id in user_ids]
+    )
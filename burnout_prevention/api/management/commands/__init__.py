@@ -0,0 +1 @@
+# Initialize commands package 
\ No newline at end of file
@@ -0,0 +1,121 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from burnout_prevention.users.models import User
+from burnout_prevention.analytics.ingest import bulk_create_records
+from burnout_prevention.analytics.models import StressLevel, SleepRecord, WorkActivity
+from burnout_prevention.api.views import StressLevelViewSet, SleepRecordViewSet, WorkActivityViewSet
+
+
+BENCHMARK_EMAIL = 'read@benchmark.local'
+
+ENDPOINTS = [
+    ('stress', StressLevelViewSet, StressLevel),
+    ('sleep', SleepRecordViewSet, SleepRecord),
+    ('work-activity', WorkActivityViewSet, WorkActivity),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает количество запросов в секунду к спискам записей о стрессе, сне и работе '
+        'при сериализации через ModelSerializer и через быстрый путь чтения (values()). '
+        'С --seed создает тестового пользователя и записывает в базу данных до --records записей '
+        'каждого типа (с дневными сводками и оценкой аномалий стресса); для наполнения '
+        'используйте отдельную базу данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            action='store_true',
+            help='Создать тестового пользователя и дополнить его записи до --records записей каждого типа'
+        )
+        parser.add_argument('--records', type=int, default=10000, help='Количество записей каждого типа при наполнении')
+        parser.add_argument('--user', type=int, help='ID пользователя (по умолчанию тестовый)')
+        parser.add_argument('--repeat', type=int, default=10, help='Количество повторов каждого запроса')
+
+    def handle(self, *args, **options):
+        if options['seed'] and options['user']:
+            raise CommandError('Наполнение (--seed) создает записи только тестового пользователя: не указывайте --user')
+
+        if options['seed']:
+            user, _ = User.objects.get_or_create(email=BENCHMARK_EMAIL, defaults={'username': 'read_benchmark'})
+            self.seed(user, options['records'])
+        elif options['user']:
+            user = User.objects.filter(pk=options['user']).first()
+        else:
+            user = User.objects.filter(email=BENCHMARK_EMAIL).first()
+        if user is None:
+            raise CommandError('Пользователь не найден. Укажите --user или выполните наполнение (--seed)')
+
+        factory = APIRequestFactory()
+        for name, viewset, model in ENDPOINTS:
+            count = model.objects.filter(user=user).count()
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n/api/{name}/ ({count} записей в ответе)'))
+
+            contents = {}
+            for title, fast_list in (('ModelSerializer', False), ('values()', True)):
+                # Без постраничной выдачи, чтобы ответ содержал все записи пользователя
+                view = viewset.as_view({'get': 'list'}, pagination_class=None, fast_list=fast_list)
+
+                def run():
+                    request = factory.get(f'/api/{name}/')
+                    force_authenticate(request, user=user)
+                    return view(request).render().content
+
+                contents[title] = run()
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    run()
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{title}: {options["repeat"] / elapsed:.2f} запросов/с '
+                    f'({elapsed / options["repeat"] * 1000:.1f} мс на запрос)'
+                )
+
+            if contents['ModelSerializer'] == contents['values()']:
+                self.stdout.write(self.style.SUCCESS('Ответы совпадают побайтно'))
+            else:
+                self.stdout.write(self.style.ERROR('Ответы различаются'))
+
+    def seed(self, user, count):
+        """
+        Дополняет записи тестового пользователя до count записей каждого типа.
+        Записи создаются через bulk_create_records, поэтому дневные сводки, базовый уровень
+        стресса и кэш обновляются так же, как при пакетной загрузке через API.
+        """
+        rnd = random.Random(0)
+        now = timezone.now()
+        today = timezone.localdate()
+        for _, _, model in ENDPOINTS:
+            missing = count - model.objects.filter(user=user).count()
+            if missing <= 0:
+                continue
+            if model is StressLevel:
+                records = [
+                    {'level': rnd.randint(0, 100), 'notes': 'benchmark',
+                     'created_at': now - timedelta(minutes=rnd.randint(0, 525600))}
+                    for _ in range(missing)
+                ]
+            elif model is SleepRecord:
+                records = [
+                    {'date': today - timedelta(days=rnd.randint(0, 365)),
+                     'duration_hours': rnd.uniform(4, 10), 'quality': rnd.randint(1, 10), 'notes': 'benchmark'}
+                    for _ in range(missing)
+                ]
+            else:
+                records = [
+                    {'date': today - timedelta(days=rnd.randint(0, 365)),
+                     'duration_hours': rnd.uniform(4, 12), 'breaks_count': rnd.randint(0, 5),
+                     'breaks_total_minutes': rnd.randint(0, 90), 'productivity': rnd.randint(1, 10),
+                     'notes': 'benchmark'}
+                    for _ in range(missing)
+                ]
+            bulk_create_records(model, user, records)
+            self.stdout.write(f'Создано {missing} записей {model._meta.verbose_name_plural}')
@@ -0,0 +1,120 @@
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from burnout_prevention.users.models import User
+from burnout_prevention.analytics.ingest import bulk_create_records
+from burnout_prevention.analytics.models import StressLevel, SleepRecord, WorkActivity
+from burnout_prevention.api.renderers import ORJSONRenderer, MessagePackRenderer, msgpack, orjson
+from burnout_prevention.api.views import (
+    DashboardView, StressStatisticsView, SleepStatisticsView, WorkStatisticsView
+)
+
+
+BENCHMARK_EMAIL = 'render@benchmark.local'
+BENCHMARK_DAYS = 365
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время вывода ответов панели управления и статистики за 365 дней '
+        'стандартным JSONRenderer, ORJSONRenderer и MessagePackRenderer. '
+        'С --seed создает тестового пользователя и записывает в базу данных его записи '
+        'за 365 дней; для наполнения используйте отдельную базу данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='Создать тестового пользователя и его записи за 365 дней')
+        parser.add_argument('--user', type=int, help='ID пользователя (по умолчанию тестовый)')
+        parser.add_argument('--repeat', type=int, default=200, help='Количество повторов вывода каждого ответа')
+
+    def handle(self, *args, **options):
+        if options['seed'] and options['user']:
+            raise CommandError('Наполнение (--seed) создает записи только тестового пользователя: не указывайте --user')
+
+        if options['seed']:
+            user, _ = User.objects.get_or_create(email=BENCHMARK_EMAIL, defaults={'username': 'render_benchmark'})
+            self.seed(user)
+        elif options['user']:
+            user = User.objects.filter(pk=options['user']).first()
+        else:
+            user = User.objects.filter(email=BENCHMARK_EMAIL).first()
+        if user is None:
+            raise CommandError('Пользователь не найден. Укажите --user или выполните наполнение (--seed)')
+
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson не установлен: ORJSONRenderer использует стандартный json'))
+
+        renderers = [('JSONRenderer', JSONRenderer()), ('ORJSONRenderer', ORJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(('MessagePackRenderer', MessagePackRenderer()))
+
+        start_date = (timezone.localdate() - timedelta(days=BENCHMARK_DAYS - 1)).isoformat()
+        responses = [
+            ('/api/dashboard/summary/', DashboardView, {}),
+            ('/api/stress/statistics/', StressStatisticsView, {'start_date': start_date, 'granularity': 'day'}),
+            ('/api/sleep/statistics/', SleepStatisticsView, {'start_date': start_date, 'granularity': 'day'}),
+            ('/api/work-activity/statistics/', WorkStatisticsView, {'start_date': start_date, 'granularity': 'day'}),
+        ]
+
+        factory = APIRequestFactory()
+        for url, view_class, params in responses:
+            request = factory.get(url, params)
+            force_authenticate(request, user=user)
+            response = view_class.as_view()(request)
+            if response.status_code != 200:
+                raise CommandError(f'{url}: код ответа {response.status_code}')
+            data = response.data
+
+            contents = {}
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{url}'))
+            for title, renderer in renderers:
+                contents[title] = renderer.render(data)
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    renderer.render(data)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'{title}: {elapsed / options["repeat"] * 1000:.3f} мс на ответ, '
+                    f'{len(contents[title])} байт'
+                )
+
+            if contents['JSONRenderer'] == contents['ORJSONRenderer']:
+                self.stdout.write(self.style.SUCCESS('JSON совпадает побайтно'))
+            elif json.loads(contents['JSONRenderer']) == json.loads(contents['ORJSONRenderer']):
+                self.stdout.write(self.style.SUCCESS('JSON эквивалентен (различается запись чисел)'))
+            else:
+                self.stdout.write(self.style.ERROR('JSON различается'))
+
+    def seed(self, user):
+        """
+        Создает записи тестового пользователя за каждый из BENCHMARK_DAYS дней, если их еще нет.
+        Записи создаются через bulk_create_records вместе с дневными сводками и оценкой аномалий стресса.
+        """
+        if StressLevel.objects.filter(user=user).exists():
+            return
+        rnd = random.Random(0)
+        now = timezone.now()
+        today = timezone.localdate()
+        stress, sleep, work = [], [], []
+        for offset in range(BENCHMARK_DAYS):
+            date = today - timedelta(days=offset)
+            stress.extend(
+                {'level': rnd.randint(0, 100), 'notes': 'benchmark',
+                 'created_at': now - timedelta(days=offset, hours=hour)}
+                for hour in range(3)
+            )
+            sleep.append({'date': date, 'duration_hours': rnd.uniform(4, 10),
+                          'quality': rnd.randint(1, 10), 'notes': 'benchmark'})
+            work.append({'date': date, 'duration_hours': rnd.uniform(4, 12),
+                         'breaks_count': rnd.randint(0, 5), 'breaks_total_minutes': rnd.randint(0, 90),
+                         'productivity': rnd.randint(1, 10), 'notes': 'benchmark'})
+        for model, records in ((StressLevel, stress), (SleepRecord, sleep), (WorkActivity, work)):
+            bulk_create_records(model, user, records)
+        self.stdout.write(f'Созданы записи за {BENCHMARK_DAYS} дней')
@@ -0,0 +1,98 @@
+import math
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Типы, которые orjson не сериализует сам, приводятся так же, как в стандартном JSONRenderer
+# (даты и время - в формате DRF, Decimal, ленивые строки, массивы numpy и т.д.)
+_default = encoders.JSONEncoder().default
+
+
+def _has_non_finite(data):
+    """
+    Проверяет, есть ли в данных (словарях, списках, кортежах и массивах numpy) значения NaN или Infinity.
+    """
+    if isinstance(data, dict):
+        values = data.values()
+    elif isinstance(data, (list, tuple)):
+        values = data
+    elif hasattr(data, 'tolist'):
+        # Массивы и числа numpy выводятся через _default как списки и числа Python
+        return _has_non_finite(data.tolist())
+    else:
+        return isinstance(data, float) and not math.isfinite(data)
+    for value in values:
+        value_type = type(value)
+        if value_type is float:
+            # Разность NaN и бесконечностей с собой - NaN, у конечных чисел - 0
+            if value - value != 0:
+                return True
+        elif value_type is str or value_type is int or value is None or value_type is bool:
+            continue
+        elif _has_non_finite(value):
+            return True
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на основе orjson. Результат эквивалентен JSONRenderer (тот же компактный
+    JSON в UTF-8), но побайтно может отличаться запись чисел в экспоненциальной форме
+    (1e16 вместо 1e+16, 1e-7 вместо 1e-07).
+
+    Если orjson не установлен, запрошен отступ (indent), настройки DRF требуют
+    другого формата (UNICODE_JSON, COMPACT_JSON) или в данных есть NaN и Infinity
+    (orjson выводит их как null), используется стандартный JSONRenderer: при STRICT_JSON
+    он отклоняет такие значения.
+    """
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=self.options)
+        except TypeError:
+            # Например, целые числа больше 64 бит
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Значения NaN и Infinity выводятся orjson как null, поэтому проверяются только ответы с null
+        if b'null' in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Как и JSONRenderer, экранируем \u2028 и \u2029
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Вывод в формате MessagePack (Accept: application/msgpack) для мобильных приложений.
+    Значения, отсутствующие в MessagePack (даты, Decimal и т.д.), приводятся так же, как в JSON.
+    Требует пакет msgpack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -0,0 +1,134 @@
+from operator import attrgetter, itemgetter, methodcaller
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+# Поля, представление которых - преобразование встроенного типа
+_BUILTIN_CONVERTERS = {
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.CharField: str,
+}
+
+
+def _identity(value):
+    return value
+
+
+def _datetime_converter(field):
+    """
+    Представление даты и времени в формате ISO 8601 с часовым поясом поля,
+    определенным один раз (DateTimeField определяет его для каждого значения).
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str):
+            return value
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _converter(field):
+    """
+    Возвращает функцию представления значения поля, совпадающую с field.to_representation,
+    или None, если поле не поддерживается.
+    """
+    field_class = type(field)
+    if field_class in _BUILTIN_CONVERTERS:
+        return _BUILTIN_CONVERTERS[field_class]
+    if field_class is serializers.PrimaryKeyRelatedField:
+        # values() возвращает id связанного объекта, а не PKOnlyObject
+        return None if field.pk_field is not None else _identity
+    if field_class is serializers.ReadOnlyField:
+        return _identity
+    if field_class is serializers.DateTimeField:
+        return _datetime_converter(field)
+    if isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField, serializers.BaseSerializer)):
+        return None
+    return field.to_representation
+
+
+class FastRepresentation:
+    """
+    Быстрое представление объектов в том же виде, что и serializer.data: функции
+    получения и преобразования значений полей выбираются один раз, после чего
+    каждая строка превращается в словарь без механизма полей DRF.
+
+    Строки - словари из QuerySet.values() (from_values=True) или объекты моделей.
+    """
+
+    def __init__(self, fields, lookups):
+        self.fields = fields
+        self.lookups = lookups
+
+    @classmethod
+    def compile(cls, serializer, from_values=True):
+        """
+        Собирает представление для полей сериализатора (с учетом выбора полей запросом).
+
+        Returns:
+            FastRepresentation или None, если сериализатор переопределяет to_representation
+            или содержит неподдерживаемые поля (вложенные сериализаторы, связи, кроме
+            первичного ключа, поля методов при чтении из values())
+        """
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            return None
+
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        fields = []
+        lookups = []
+        for field in serializer._readable_fields:
+            convert = _converter(field)
+            if convert is None:
+                return None
+
+            if isinstance(field, serializers.SerializerMethodField):
+                if from_values:
+                    return None
+                get, convert = _identity, getattr(serializer, field.method_name)
+            elif field.source == '*':
+                return None
+            elif from_values:
+                if model is None or len(field.source_attrs) != 1:
+                    return None
+                try:
+                    model_field = model._meta.get_field(field.source)
+                except FieldDoesNotExist:
+                    return None
+                if not model_field.concrete or model_field.many_to_many:
+                    return None
+                get = itemgetter(field.source)
+                lookups.append(field.source)
+            elif type(field) is serializers.PrimaryKeyRelatedField:
+                # Как и DRF, берем id связанного объекта, не загружая его
+                get = methodcaller('serializable_value', field.source)
+            else:
+                get = attrgetter(field.source)
+
+            fields.append((field.field_name, get, convert))
+        return cls(fields, lookups)
+
+    def __call__(self, rows):
+        """
+        Возвращает список словарей представления строк.
+        """
+        fields = self.fields
+        data = []
+        for row in rows:
+            item = {}
+            for name, get, convert in fields:
+                value = get(row)
+                item[name] = None if value is None else convert(value)
+            data.append(item)
+        return data
@@ -6,6 +6,7 @@ from .recommendation_serializers import RecommendationSerializer, UserRecommenda
 from .burnout_serializers import BurnoutRiskSerializer
 from .dashboard_serializers import DashboardSerializer
 from .calendar_serializers import CalendarIntegrationSerializer, CalendarEventSerializer
+from .analytics_serializers import RollingMetricsSerializer, CorrelationsSerializer
 
 __all__ = [
     'UserSerializer',
@@ -22,4 +23,6 @@ __all__ = [
     'DashboardSerializer',
     'CalendarIntegrationSerializer',
     'CalendarEventSerializer',
+    'RollingMetricsSerializer',
+    'CorrelationsSerializer',
 ] 
\ No newline at end of file
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+
+class RollingPointSerializer(serializers.Serializer):
+    """
+    Сериализатор для точки ряда скользящих показателей.
+    """
+    date = serializers.DateField()
+    value = serializers.FloatField()
+    count = serializers.IntegerField()
+    rolling_sum = serializers.FloatField()
+    rolling_count = serializers.IntegerField()
+    rolling_avg = serializers.FloatField()
+    delta = serializers.FloatField(allow_null=True)
+
+
+class RollingMetricsSerializer(serializers.Serializer):
+    """
+    Сериализатор для ряда скользящих показателей.
+    """
+    stream = serializers.CharField()
+    metric = serializers.CharField()
+    window = serializers.IntegerField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    points = RollingPointSerializer(many=True)
+
+
+class CorrelationSerializer(serializers.Serializer):
+    """
+    Сериализатор для корреляции пары показателей.
+    """
+    x = serializers.CharField()
+    y = serializers.CharField()
+    lag = serializers.IntegerField()
+    samples = serializers.IntegerField()
+    pearson = serializers.FloatField(allow_null=True)
+    spearman = serializers.FloatField(allow_null=True)
+
+
+class CorrelationsSerializer(serializers.Serializer):
+    """
+    Сериализатор для корреляций показателей пользователя.
+    """
+    week_start = serializers.DateField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    lags = serializers.ListField(child=serializers.IntegerField())
+    correlations = CorrelationSerializer(many=True)
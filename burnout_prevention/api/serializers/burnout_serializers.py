@@ -1,13 +1,17 @@
 from rest_framework import serializers
 from burnout_prevention.analytics.models import BurnoutRisk
+from burnout_prevention.analytics.risk_models import get_risk_model
+from .mixins import DynamicFieldsMixin
 
 
-class BurnoutRiskSerializer(serializers.ModelSerializer):
+class BurnoutRiskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для риска выгорания.
     """
     # Добавляем виртуальные поля для удобства использования в API
     date = serializers.SerializerMethodField()
+    # Уровень риска хранится дробным, в истории выводится целым
+    risk_level = serializers.IntegerField(read_only=True)
     overtime_factor = serializers.SerializerMethodField()
     workday_duration_factor = serializers.SerializerMethodField()
     stress_factor = serializers.SerializerMethodField()
@@ -15,6 +19,7 @@ class BurnoutRiskSerializer(serializers.ModelSerializer):
     sleep_deprivation_factor = serializers.SerializerMethodField()
     factors_data = serializers.SerializerMethodField()
     recommendations = serializers.SerializerMethodField(required=False)
+    factors_weights = serializers.SerializerMethodField()
     
     class Meta:
         model = BurnoutRisk
@@ -22,15 +27,19 @@ class BurnoutRiskSerializer(serializers.ModelSerializer):
             'id', 'user', 'date', 'risk_level', 
             'overtime_factor', 'workday_duration_factor', 'stress_factor', 
             'sleep_quality_factor', 'sleep_deprivation_factor',
-            'factors_data', 'recommendations', 'created_at'
+            'factors_data', 'recommendations', 'model_version', 'created_at',
+            'factors_weights'
         ]
-        read_only_fields = ['id', 'user', 'created_at']
+        read_only_fields = ['id', 'user', 'model_version', 'created_at']
+        # Сериализатор только для чтения: проверка unique_together (user, date) не нужна
+        # и иначе заменила бы поле date скрытым полем
+        validators = []
     
     def get_date(self, instance):
         """
-        Возвращает дату создания записи.
+        Возвращает дату, на которую рассчитан риск.
         """
-        return instance.created_at.date() if instance.created_at else None
+        return instance.date
         
     def get_overtime_factor(self, instance):
         """
@@ -92,17 +101,10 @@ class BurnoutRiskSerializer(serializers.ModelSerializer):
             return instance.recommendations
         return []
 
-    def to_representation(self, instance):
-        """
-        Расширенное представление данных модели.
-        """
-        representation = super().to_representation(instance)
-        # Добавляем веса факторов
-        representation['factors_weights'] = {
-            'overtime': 0.15,
-            'workday_duration': 0.10,
-            'stress': 0.20,
-            'sleep_quality': 0.20,
-            'sleep_deprivation': 0.20
-        }
-        return representation 
\ No newline at end of file
+    def get_factors_weights(self, instance):
+        """
+        Возвращает веса факторов той модели, по которой выполнен расчет.
+        """
+        if instance.factors:
+            return {name: factor.get('weight', 0) for name, factor in instance.factors.items()}
+        return get_risk_model().weights
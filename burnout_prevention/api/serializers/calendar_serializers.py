@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from burnout_prevention.integrations.models import CalendarIntegration, CalendarEvent
+from .mixins import DynamicFieldsMixin
 
 
-class CalendarIntegrationSerializer(serializers.ModelSerializer):
+class CalendarIntegrationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для интеграции с календарем.
     """
@@ -12,7 +13,7 @@ class CalendarIntegrationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
 
-class CalendarEventSerializer(serializers.ModelSerializer):
+class CalendarEventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для событий календаря.
     """
@@ -0,0 +1,81 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+FIELDS_QUERY_PARAM = 'fields'
+OMIT_QUERY_PARAM = 'omit'
+
+
+def parse_field_paths(value):
+    """
+    Разбирает список полей через запятую; поля вложенных сериализаторов
+    указываются через точку (recommendation.title).
+
+    Returns:
+        list: Кортежи имен полей
+    """
+    return [tuple(path.split('.')) for path in value.split(',') if path.strip()] if value else []
+
+
+def field_selection(request, path=()):
+    """
+    Возвращает выбранные и исключенные параметрами fields и omit поля сериализатора,
+    вложенного по пути path (для корневого сериализатора - пустой путь).
+
+    Returns:
+        tuple: (множество выбранных полей или None - все поля, множество исключенных полей)
+               или None, если выбор полей не задан
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if FIELDS_QUERY_PARAM not in params and OMIT_QUERY_PARAM not in params:
+        return None
+
+    depth = len(path)
+    selected = None
+    if FIELDS_QUERY_PARAM in params:
+        paths = [
+            field_path for field_path in parse_field_paths(params[FIELDS_QUERY_PARAM])
+            if field_path[:depth] == path
+        ]
+        # Вложенный сериализатор, выбранный целиком (fields=recommendation), не ограничивается
+        if path not in paths:
+            selected = {field_path[depth] for field_path in paths}
+    omitted = {
+        field_path[depth] for field_path in parse_field_paths(params.get(OMIT_QUERY_PARAM))
+        if len(field_path) == depth + 1 and field_path[:depth] == path
+    }
+    return selected, omitted
+
+
+class DynamicFieldsMixin:
+    """
+    Позволяет выбрать поля ответа параметрами запроса fields и omit
+    (?fields=id,date,level, ?omit=notes, ?fields=id,recommendation.title).
+    Невыбранные поля не сериализуются; неизвестные имена полей игнорируются.
+    Применяется только к запросам на чтение.
+    """
+
+    def field_path(self):
+        """
+        Путь к сериализатору от корневого (имена полей вложенных сериализаторов).
+        """
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(path))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = field_selection(self.context.get('request'), self.field_path())
+        if selection is None:
+            return fields
+
+        selected, omitted = selection
+        return {
+            name: field for name, field in fields.items()
+            if (selected is None or name in selected) and name not in omitted
+        }
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from burnout_prevention.recommendations.models import Recommendation, UserRecommendation
+from .mixins import DynamicFieldsMixin
 
 
-class RecommendationSerializer(serializers.ModelSerializer):
+class RecommendationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для рекомендаций.
     """
@@ -12,7 +13,7 @@ class RecommendationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class UserRecommendationSerializer(serializers.ModelSerializer):
+class UserRecommendationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для рекомендаций пользователя.
     """
@@ -39,4 +40,38 @@ class UserRecommendationUpdateSerializer(serializers.ModelSerializer):
         valid_statuses = ['pending', 'accepted', 'completed', 'rejected']
         if value not in valid_statuses:
             raise serializers.ValidationError(f"Status must be one of: {', '.join(valid_statuses)}")
-        return value 
\ No newline at end of file
+        return value 
+
+    def update(self, instance, validated_data):
+        """
+        Обновляет рекомендацию пользователя; при выполнении без указанной даты
+        дата выполнения устанавливается автоматически.
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.set_completed_at()
+        instance.save()
+        return instance
+
+
+class UserRecommendationBulkUpdateSerializer(UserRecommendationUpdateSerializer):
+    """
+    Сериализатор для элемента пакетного обновления статуса и обратной связи
+    рекомендаций пользователя (id рекомендации пользователя и изменяемые поля).
+    """
+    id = serializers.IntegerField()
+
+    class Meta(UserRecommendationUpdateSerializer.Meta):
+        fields = ['id'] + UserRecommendationUpdateSerializer.Meta.fields
+
+
+class RecommendationsStatsSerializer(serializers.Serializer):
+    """
+    Сериализатор для статистики рекомендаций пользователя (RecommendationsStats).
+    """
+    total = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    inProgress = serializers.IntegerField()
+    new = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    completionRate = serializers.IntegerField(help_text='Процент выполнения (0-100)')
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from burnout_prevention.analytics.models import SleepRecord
+from .stress_serializers import TrendSerializer
+from .mixins import DynamicFieldsMixin
 
 
-class SleepRecordSerializer(serializers.ModelSerializer):
+class SleepRecordSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели записи о сне.
     """
@@ -33,6 +35,10 @@ class SleepStatisticsSerializer(serializers.Serializer):
     avg_duration = serializers.FloatField()
     avg_quality = serializers.FloatField()
     total_records = serializers.IntegerField()
+    start_date = serializers.CharField()
+    end_date = serializers.CharField()
+    granularity = serializers.CharField()
+    trend = TrendSerializer()
     statistics = serializers.ListField(
         child=serializers.DictField(
             child=serializers.CharField()
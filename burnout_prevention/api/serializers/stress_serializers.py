@@ -1,5 +1,7 @@
+from django.utils import timezone
 from rest_framework import serializers
 from burnout_prevention.analytics.models import StressLevel
+from .mixins import DynamicFieldsMixin
 
 
 class TrendSerializer(serializers.Serializer):
@@ -10,14 +12,14 @@ class TrendSerializer(serializers.Serializer):
     direction = serializers.CharField()
 
 
-class StressLevelSerializer(serializers.ModelSerializer):
+class StressLevelSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели уровня стресса.
     """
     class Meta:
         model = StressLevel
-        fields = ['id', 'level', 'notes', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'level', 'notes', 'created_at', 'z_score', 'is_anomaly']
+        read_only_fields = ['id', 'created_at', 'z_score', 'is_anomaly']
 
 
 class StressLevelCreateSerializer(serializers.ModelSerializer):
@@ -34,6 +36,22 @@ class StressLevelCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class StressLevelBulkCreateSerializer(StressLevelCreateSerializer):
+    """
+    Сериализатор записи для пакетной загрузки: для оценок, сделанных без подключения к сети,
+    можно указать время создания (по умолчанию - текущее).
+    """
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta(StressLevelCreateSerializer.Meta):
+        fields = ['level', 'notes', 'created_at']
+
+    def validate_created_at(self, value):
+        if value > timezone.now():
+            raise serializers.ValidationError("created_at cannot be in the future")
+        return value
+
+
 class StressStatisticsSerializer(serializers.Serializer):
     """
     Сериализатор для статистики уровня стресса.
@@ -44,6 +62,7 @@ class StressStatisticsSerializer(serializers.Serializer):
     total_records = serializers.IntegerField()
     start_date = serializers.CharField()
     end_date = serializers.CharField()
+    granularity = serializers.CharField()
     trend = TrendSerializer()
     statistics = serializers.ListField(
         child=serializers.DictField(
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from burnout_prevention.users.models import User, UserProfile
+from .mixins import DynamicFieldsMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для пользователей.
     """
@@ -14,7 +15,7 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined', 'last_login']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для профилей пользователей.
     """
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from burnout_prevention.analytics.models import WorkActivity
+from .stress_serializers import TrendSerializer
+from .mixins import DynamicFieldsMixin
 
 
-class WorkActivitySerializer(serializers.ModelSerializer):
+class WorkActivitySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели рабочей активности.
     """
@@ -34,6 +36,7 @@ class DailyWorkDataSerializer(serializers.Serializer):
     duration_hours = serializers.FloatField()
     productivity = serializers.FloatField(allow_null=True)
     notes = serializers.CharField(allow_null=True, allow_blank=True)
+    count = serializers.IntegerField()
 
 
 class WorkStatisticsSerializer(serializers.Serializer):
@@ -47,6 +50,8 @@ class WorkStatisticsSerializer(serializers.Serializer):
     total_records = serializers.IntegerField()
     start_date = serializers.CharField()
     end_date = serializers.CharField()
+    granularity = serializers.CharField()
+    trend = TrendSerializer()
     daily_data = serializers.ListField(
         child=DailyWorkDataSerializer()
     ) 
\ No newline at end of file
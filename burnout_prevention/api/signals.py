@@ -0,0 +1,59 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from burnout_prevention.analytics.models import StressLevel, SleepRecord, WorkActivity
+from burnout_prevention.analytics.signals import burnout_risk_updated, records_bulk_created
+from burnout_prevention.recommendations.models import UserRecommendation
+from burnout_prevention.recommendations.signals import user_recommendations_changed
+from .cache import (
+    invalidate_dashboard, invalidate_dashboards, invalidate_user_recommendation_caches, invalidate_recommendation_stats
+)
+
+
+@receiver(post_save, sender=StressLevel)
+@receiver(post_save, sender=SleepRecord)
+@receiver(post_save, sender=WorkActivity)
+@receiver(post_save, sender=UserRecommendation)
+@receiver(post_delete, sender=StressLevel)
+@receiver(post_delete, sender=SleepRecord)
+@receiver(post_delete, sender=WorkActivity)
+@receiver(post_delete, sender=UserRecommendation)
+def invalidate_dashboard_on_change(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш панели мониторинга пользователя при изменении его данных.
+    """
+    invalidate_dashboard(instance.user_id)
+
+
+@receiver(burnout_risk_updated)
+def invalidate_dashboard_on_burnout_risk_update(sender, user_ids, **kwargs):
+    """
+    Сбрасывает кэш панели мониторинга после пересчета снимков риска выгорания.
+    """
+    invalidate_dashboards(user_ids)
+
+
+@receiver(records_bulk_created)
+def invalidate_dashboard_on_bulk_create(sender, user_id, **kwargs):
+    """
+    Сбрасывает кэш панели мониторинга после пакетного создания записей пользователя.
+    """
+    invalidate_dashboard(user_id)
+
+
+@receiver(post_save, sender=UserRecommendation)
+@receiver(post_delete, sender=UserRecommendation)
+def invalidate_recommendation_stats_on_change(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш статистики рекомендаций пользователя при изменении его рекомендаций.
+    """
+    invalidate_recommendation_stats(instance.user_id)
+
+
+@receiver(user_recommendations_changed)
+def invalidate_on_user_recommendations_change(sender, user_ids, **kwargs):
+    """
+    Сбрасывает кэши панели мониторинга и статистики рекомендаций после пакетного
+    изменения рекомендаций пользователей.
+    """
+    invalidate_user_recommendation_caches(user_ids)
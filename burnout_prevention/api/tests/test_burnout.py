@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import BurnoutRisk, SleepRecord, StressLevel, WorkActivity
+from burnout_prevention.analytics.snapshots import refresh_burnout_risk_snapshots
+from burnout_prevention.users.models import User
+
+
+class BurnoutRiskHistoryTests(TestCase):
+    """
+    История риска выгорания из сохраненных снимков и динамически рассчитанных дней.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='risk@example.com', username='risk', password='password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        today = timezone.localdate()
+        for offset in range(8):
+            date = today - timedelta(days=offset)
+            WorkActivity.objects.create(user=self.user, date=date, duration_hours=9.5 + offset / 10, productivity=6)
+            SleepRecord.objects.create(user=self.user, date=date, duration_hours=6.3, quality=4)
+            StressLevel.objects.create(user=self.user, level=55 + offset)
+
+    def test_stored_and_live_days_have_same_precision(self):
+        today = timezone.localdate()
+        live = self.client.get('/api/burnout-risk/weekly_data/').json()['chart_data']
+
+        # Сохраняем снимки за первые дни недели; остальные дни рассчитываются динамически
+        refresh_burnout_risk_snapshots(self.user.id, today - timedelta(days=7), today - timedelta(days=4))
+        self.assertEqual(BurnoutRisk.objects.filter(user=self.user).count(), 4)
+        mixed = self.client.get('/api/burnout-risk/weekly_data/').json()['chart_data']
+
+        self.assertEqual(mixed, live)
+        self.assertTrue(all(isinstance(item['risk_level'], float) for item in mixed))
+        self.assertTrue(any(item['risk_level'] != int(item['risk_level']) for item in mixed))
+
+    def test_date_window_uses_local_date(self):
+        # 22:30 UTC - уже следующий день по местному времени (Europe/Moscow)
+        local_today = timezone.localdate()
+        now = datetime.combine(local_today, datetime.min.time()).replace(tzinfo=dt_timezone.utc) - timedelta(minutes=90)
+        self.assertEqual(timezone.localdate(now), local_today)
+        self.assertNotEqual(now.date(), local_today)
+
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            chart_data = self.client.get('/api/burnout-risk/weekly_data/').json()['chart_data']
+            history = self.client.get('/api/burnout-risk/history/').json()
+            dashboard = self.client.get('/api/dashboard/summary/').json()
+
+        self.assertEqual(chart_data[-1]['date'], local_today.isoformat())
+        self.assertEqual(len(history), 8)
+        self.assertEqual(dashboard['stress']['end_date'], local_today.isoformat())
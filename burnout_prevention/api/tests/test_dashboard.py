@@ -0,0 +1,191 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import SleepRecord, StressLevel, WorkActivity
+from burnout_prevention.recommendations.models import Recommendation, RecommendationType, UserRecommendation
+from burnout_prevention.users.models import User
+
+
+class DashboardQueryCountTests(TestCase):
+    """
+    Количество запросов панели мониторинга не зависит от количества записей пользователя.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.type = RecommendationType.objects.create(name='Отдых', description='Отдых')
+
+    def create_user(self, email, days, per_day):
+        """
+        Создает пользователя с записями о стрессе, сне, работе и рекомендациями
+        за каждый из days дней (per_day записей о стрессе и рекомендаций в день).
+        """
+        user = User.objects.create_user(email=email, username=email.split('@')[0], password='password')
+        now = timezone.now()
+        today = timezone.localdate()
+        for offset in range(days):
+            date = today - timedelta(days=offset)
+            SleepRecord.objects.create(user=user, date=date, duration_hours=7, quality=7)
+            WorkActivity.objects.create(user=user, date=date, duration_hours=8, productivity=7)
+            for index in range(per_day):
+                StressLevel.objects.create(
+                    user=user, level=40 + index, created_at=now - timedelta(days=offset, minutes=index)
+                )
+                recommendation = Recommendation.objects.create(
+                    type=self.type, title=f'{email} {offset} {index}', description='-'
+                )
+                UserRecommendation.objects.create(user=user, recommendation=recommendation)
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_cache_miss_query_count_is_fixed(self):
+        small = self.create_user('small@example.com', days=1, per_day=1)
+        large = self.create_user('large@example.com', days=14, per_day=5)
+
+        for client in (small, large):
+            with self.assertNumQueries(5):
+                response = client.get('/api/dashboard/summary/')
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(response.json()['stress']['total_records'], 40)
+
+    def test_cache_hit_runs_no_queries(self):
+        client = self.create_user('cached@example.com', days=14, per_day=5)
+        first = client.get('/api/dashboard/summary/')
+
+        with self.assertNumQueries(0):
+            second = client.get('/api/dashboard/summary/')
+        self.assertEqual(second.json(), first.json())
+
+
+class DashboardRecommendationsTests(TestCase):
+    """
+    Блок рекомендаций панели мониторинга: количество по статусам и последние рекомендации.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='recs@example.com', username='recs', password='password')
+        other = User.objects.create_user(email='other@example.com', username='other', password='password')
+        recommendation_type = RecommendationType.objects.create(name='Сон', description='Сон')
+
+        now = timezone.now()
+        statuses = ['pending'] * 4 + ['accepted'] * 3 + ['completed'] * 2 + ['rejected']
+        for index, status in enumerate(statuses):
+            recommendation = Recommendation.objects.create(
+                type=recommendation_type, title=f'Рекомендация {index}', description='-', category='sleep'
+            )
+            user_recommendation = UserRecommendation.objects.create(
+                user=self.user, recommendation=recommendation, status=status
+            )
+            UserRecommendation.objects.filter(pk=user_recommendation.pk).update(
+                created_at=now - timedelta(hours=index)
+            )
+            UserRecommendation.objects.create(user=other, recommendation=recommendation, status='completed')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_counts_match_per_status_queries(self):
+        data = self.client.get('/api/dashboard/summary/').json()['recommendations']
+
+        # Подсчет по отдельному запросу на каждый статус, как до группировки
+        for status in ('pending', 'accepted', 'completed'):
+            self.assertEqual(
+                data[status],
+                UserRecommendation.objects.filter(user=self.user, status=status).count()
+            )
+        self.assertEqual((data['pending'], data['accepted'], data['completed']), (4, 3, 2))
+
+        latest = UserRecommendation.objects.filter(user=self.user).select_related('recommendation')[:5]
+        self.assertEqual(data['latest'], [
+            {
+                'id': rec.id,
+                'title': rec.recommendation.title,
+                'category': rec.recommendation.category,
+                'status': rec.status
+            }
+            for rec in latest
+        ])
+
+    def test_recommendations_block_query_budget(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/dashboard/summary/')
+
+        recommendation_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'recommendations_userrecommendation' in query['sql']
+        ]
+        # Сгруппированный подсчет по статусам и последние рекомендации с JOIN каталога
+        self.assertEqual(len(recommendation_queries), 2)
+        self.assertIn('GROUP BY', recommendation_queries[0])
+        self.assertIn('JOIN', recommendation_queries[1])
+
+
+class DashboardCacheTests(TestCase):
+    """
+    Кэш панели мониторинга: сброс при изменении данных пользователя и счетчики попаданий.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='cache@example.com', username='cache', password='password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_summary(self):
+        return self.client.get('/api/dashboard/summary/').json()
+
+    def test_record_changes_invalidate_cache(self):
+        self.assertEqual(self.get_summary()['stress']['total_records'], 0)
+
+        record = StressLevel.objects.create(user=self.user, level=60)
+        self.assertEqual(self.get_summary()['stress']['total_records'], 1)
+
+        record.delete()
+        self.assertEqual(self.get_summary()['stress']['total_records'], 0)
+
+    def test_recommendation_changes_invalidate_cache(self):
+        recommendation_type = RecommendationType.objects.create(name='Отдых', description='Отдых')
+        recommendation = Recommendation.objects.create(type=recommendation_type, title='Прогулка', description='-')
+        user_recommendation = UserRecommendation.objects.create(user=self.user, recommendation=recommendation)
+        self.assertEqual(self.get_summary()['recommendations']['pending'], 1)
+
+        user_recommendation.status = 'completed'
+        user_recommendation.save()
+        data = self.get_summary()['recommendations']
+        self.assertEqual((data['pending'], data['completed']), (0, 1))
+
+    def test_cache_key_changes_with_local_date(self):
+        self.get_summary()
+        with self.assertNumQueries(0):
+            self.get_summary()
+
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch('django.utils.timezone.now', return_value=tomorrow):
+            with CaptureQueriesContext(connection) as queries:
+                self.get_summary()
+        self.assertTrue(queries.captured_queries)
+
+    def test_cache_stats(self):
+        self.get_summary()
+        self.get_summary()
+        self.get_summary()
+
+        self.assertEqual(self.client.get('/api/dashboard/cache-stats/').status_code, 403)
+
+        admin = APIClient()
+        admin.force_authenticate(User.objects.create_user(
+            email='admin@example.com', username='admin', password='password', is_staff=True
+        ))
+        self.assertEqual(admin.get('/api/dashboard/cache-stats/').json(), {'hits': 2, 'misses': 1, 'hit_rate': 2 / 3})
+        self.assertEqual(admin.delete('/api/dashboard/cache-stats/').status_code, 204)
+        self.assertEqual(admin.get('/api/dashboard/cache-stats/').json(), {'hits': 0, 'misses': 0, 'hit_rate': 0})
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import StressLevel
+from burnout_prevention.recommendations.models import Recommendation, RecommendationType, UserRecommendation
+from burnout_prevention.users.models import User
+
+
+class SparseFieldsetTests(TestCase):
+    """
+    Выбор полей ответа параметрами fields и omit на запросах чтения.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='fields@example.com', username='fields', password='password')
+        StressLevel.objects.create(user=self.user, level=40, notes='утро')
+        recommendation_type = RecommendationType.objects.create(name='Отдых', description='-')
+        recommendation = Recommendation.objects.create(
+            type=recommendation_type, title='Прогулка', description='Длинное описание'
+        )
+        UserRecommendation.objects.create(user=self.user, recommendation=recommendation, reason='Стресс')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_fields_and_omit(self):
+        self.assertEqual(
+            list(self.client.get('/api/stress/?fields=id,level,unknown').json()['results'][0]),
+            ['id', 'level']
+        )
+        self.assertEqual(
+            list(self.client.get('/api/stress/?omit=notes,z_score').json()['results'][0]),
+            ['id', 'level', 'created_at', 'is_anomaly']
+        )
+        # Сериализатор без быстрого пути чтения (с вложенным сериализатором)
+        item = self.client.get('/api/user-recommendations/?fields=id,status&omit=status').json()['results'][0]
+        self.assertEqual(list(item), ['id'])
+
+    def test_nested_fields_load_only_selected_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/user-recommendations/?fields=id,recommendation.title')
+
+        item = response.json()['results'][0]
+        self.assertEqual(item, {'id': item['id'], 'recommendation': {'title': 'Прогулка'}})
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertIn('"recommendations_recommendation"."title"', page_query)
+        self.assertNotIn('"recommendations_recommendation"."description"', page_query)
+        self.assertNotIn('"recommendations_userrecommendation"."reason"', page_query)
+
+        # Вложенный сериализатор, выбранный целиком, возвращается со всеми полями
+        item = self.client.get('/api/user-recommendations/?fields=recommendation').json()['results'][0]
+        self.assertEqual(item['recommendation']['description'], 'Длинное описание')
+
+    def test_write_requests_are_not_affected(self):
+        response = self.client.post('/api/stress/?fields=id', {'level': 50, 'notes': 'вечер'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['notes'], 'вечер')
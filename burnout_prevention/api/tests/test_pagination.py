@@ -0,0 +1,56 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import StressLevel
+from burnout_prevention.api.pagination import KeysetPagination
+from burnout_prevention.users.models import User
+
+
+@mock.patch.object(KeysetPagination, 'page_size', 3)
+class KeysetPaginationTests(TestCase):
+    """
+    Постраничная выдача по ключу: обход страниц вперед и назад без пропусков и повторов.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='pages@example.com', username='pages', password='password')
+        now = timezone.now()
+        # Несколько записей с одинаковым временем создания: порядок между ними задает id
+        for index in range(10):
+            StressLevel.objects.create(user=self.user, level=index, created_at=now - timedelta(minutes=index // 3))
+        self.expected = list(
+            StressLevel.objects.filter(user=self.user).order_by('-created_at', '-pk').values_list('pk', flat=True)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertNotIn('count', data)
+        return data, [item['id'] for item in data['results']]
+
+    def test_forward_and_backward_traversal(self):
+        data, ids = self.get_page('/api/stress/?pagination=cursor')
+        self.assertIsNone(data['previous'])
+        pages = [ids]
+        while data['next']:
+            data, ids = self.get_page(data['next'])
+            pages.append(ids)
+
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 1])
+
+        backward = [ids]
+        while data['previous']:
+            data, ids = self.get_page(data['previous'])
+            backward.append(ids)
+        self.assertEqual(backward, pages[::-1])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/stress/?cursor=not-a-cursor').status_code, 404)
@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import SleepRecord, StressLevel, WorkActivity
+from burnout_prevention.api.representation import FastRepresentation
+from burnout_prevention.api.serializers.recommendation_serializers import UserRecommendationSerializer
+from burnout_prevention.api.views import SleepRecordViewSet, StressLevelViewSet, WorkActivityViewSet
+from burnout_prevention.users.models import User
+
+
+class FastReadPathTests(TestCase):
+    """
+    Списки записей, прочитанные через values(), совпадают с ответами сериализатора.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='read@example.com', username='read', password='password')
+        now = timezone.now().replace(microsecond=123456)
+        for index in range(5):
+            StressLevel.objects.create(
+                user=self.user, level=20 * index, notes='' if index % 2 else f'запись {index}',
+                created_at=now - timedelta(hours=index)
+            )
+            SleepRecord.objects.create(
+                user=self.user, date=date(2024, 4, 1 + index), duration_hours=6.5 + index,
+                quality=index or None
+            )
+            WorkActivity.objects.create(
+                user=self.user, date=date(2024, 4, 1 + index), duration_hours=8.25,
+                breaks_count=index, breaks_total_minutes=10 * index, productivity=index or None
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_responses_match_serializer(self):
+        endpoints = [
+            ('stress', StressLevelViewSet),
+            ('sleep', SleepRecordViewSet),
+            ('work-activity', WorkActivityViewSet),
+        ]
+        for name, viewset in endpoints:
+            for query in ('', '?pagination=cursor', '?fields=id,date,level,quality&omit=id'):
+                url = f'/api/{name}/{query}'
+                with self.subTest(url=url):
+                    fast = self.client.get(url)
+                    with mock.patch.object(viewset, 'fast_list', False):
+                        regular = self.client.get(url)
+                    self.assertEqual(fast.status_code, 200)
+                    self.assertEqual(fast.content, regular.content)
+
+    def test_unsupported_serializer_falls_back(self):
+        self.assertIsNone(FastRepresentation.compile(UserRecommendationSerializer()))
+
+    def test_benchmark_command(self):
+        stdout = StringIO()
+        call_command('benchmark_read_path', seed=True, records=10, repeat=1, stdout=stdout)
+
+        self.assertEqual(stdout.getvalue().count('Ответы совпадают побайтно'), 3)
+        benchmark_user = User.objects.get(email='read@benchmark.local')
+        self.assertEqual(StressLevel.objects.filter(user=benchmark_user).count(), 10)
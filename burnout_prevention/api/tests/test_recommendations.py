@@ -0,0 +1,183 @@
+from datetime import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.api.cache import get_cached_dashboard, set_cached_dashboard
+from burnout_prevention.api.pagination import KeysetPagination, RecordPagination
+from burnout_prevention.recommendations.models import Recommendation, RecommendationType, UserRecommendation
+from burnout_prevention.users.models import User
+
+
+class UserRecommendationListQueryTests(TestCase):
+    """
+    Количество запросов списка рекомендаций пользователя не зависит от размера страницы.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='list@example.com', username='list', password='password')
+        for index in range(60):
+            # У каждой рекомендации свой тип, чтобы обращение к типу без JOIN давало отдельный запрос
+            recommendation_type = RecommendationType.objects.create(name=f'Тип {index}', description='-')
+            recommendation = Recommendation.objects.create(
+                type=recommendation_type, title=f'Рекомендация {index}', description='-'
+            )
+            UserRecommendation.objects.create(user=self.user, recommendation=recommendation)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def count_queries(self, url, page_size):
+        with mock.patch.object(RecordPagination, 'page_size', page_size), \
+                mock.patch.object(KeysetPagination, 'page_size', page_size):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), page_size)
+        return len(queries)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for url in ('/api/user-recommendations/', '/api/user-recommendations/?pagination=cursor'):
+            with self.subTest(url=url):
+                small = self.count_queries(url, 5)
+                self.assertEqual(self.count_queries(url, 50), small)
+
+    def test_page_number_list_query_count(self):
+        # Подсчет общего количества и страница с рекомендациями и типами одним JOIN
+        with mock.patch.object(RecordPagination, 'page_size', 50):
+            with self.assertNumQueries(2):
+                response = self.client.get('/api/user-recommendations/')
+        self.assertEqual(response.json()['count'], 60)
+        self.assertTrue(all(item['recommendation']['title'] for item in response.json()['results']))
+
+
+class RecommendationStatsTests(TestCase):
+    """
+    Статистика рекомендаций пользователя по статусам: фильтры, кэширование и его сброс.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='stats@example.com', username='stats', password='password')
+        recommendation_type = RecommendationType.objects.create(name='Общие', description='-')
+        self.user_recommendations = []
+        for index, (category, status) in enumerate([
+            ('sleep', 'completed'), ('sleep', 'completed'), ('sleep', 'rejected'),
+            ('rest', 'accepted'), ('rest', 'pending'), ('rest', 'pending'),
+        ]):
+            recommendation = Recommendation.objects.create(
+                type=recommendation_type, title=f'Рекомендация {index}', description='-', category=category
+            )
+            self.user_recommendations.append(
+                UserRecommendation.objects.create(user=self.user, recommendation=recommendation, status=status)
+            )
+        UserRecommendation.objects.filter(pk=self.user_recommendations[0].pk).update(
+            created_at=timezone.make_aware(datetime(2024, 4, 1, 12))
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_counts_and_filters(self):
+        def stats(query=''):
+            return self.client.get(f'/api/user-recommendations/stats/?{query}')
+
+        self.assertEqual(stats().json(), {
+            'total': 6, 'completed': 2, 'inProgress': 1, 'new': 2, 'skipped': 1, 'completionRate': 33
+        })
+        self.assertEqual(stats('category=sleep').json()['completionRate'], 67)
+        self.assertEqual(stats('start_date=2024-03-31&end_date=2024-04-01').json()['total'], 1)
+        for query in ('category=unknown', 'start_date=01.04.2024'):
+            with self.subTest(query=query):
+                self.assertEqual(stats(query).status_code, 400)
+
+    def test_cached_until_recommendations_change(self):
+        self.client.get('/api/user-recommendations/stats/')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/user-recommendations/stats/').json()['completed'], 2)
+
+        # Сброс после сохранения рекомендации пользователя
+        self.client.patch(
+            f'/api/user-recommendations/{self.user_recommendations[4].pk}/update_status/',
+            {'status': 'completed'}, format='json'
+        )
+        self.assertEqual(self.client.get('/api/user-recommendations/stats/').json()['completed'], 3)
+
+        # Сброс после пакетного изменения (без post_save)
+        response = self.client.patch('/api/user-recommendations/bulk_update_status/', [
+            {'id': self.user_recommendations[5].pk, 'status': 'completed'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.client.get('/api/user-recommendations/stats/').json()['completed'], 4)
+
+
+class UserRecommendationBulkUpdateTests(TestCase):
+    """
+    Пакетное обновление статуса рекомендаций пользователя одной транзакцией.
+    """
+
+    url = '/api/user-recommendations/bulk_update_status/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='bulk@example.com', username='bulk', password='password')
+        other = User.objects.create_user(email='other@example.com', username='other', password='password')
+        recommendation_type = RecommendationType.objects.create(name='Общие', description='-')
+        recommendations = [
+            Recommendation.objects.create(type=recommendation_type, title=f'Рекомендация {index}', description='-')
+            for index in range(3)
+        ]
+        self.user_recommendations = [
+            UserRecommendation.objects.create(user=self.user, recommendation=recommendation)
+            for recommendation in recommendations
+        ]
+        self.other_recommendation = UserRecommendation.objects.create(user=other, recommendation=recommendations[0])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def statuses(self):
+        return list(
+            UserRecommendation.objects.filter(user=self.user).order_by('pk').values_list('status', flat=True)
+        )
+
+    def test_updates_are_applied(self):
+        first, second, third = self.user_recommendations
+        set_cached_dashboard(self.user.id, {'cached': True})
+
+        response = self.client.patch(self.url, [
+            {'id': third.pk, 'status': 'completed', 'user_rating': 5},
+            {'id': first.pk, 'status': 'rejected', 'user_feedback': 'Нет времени'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([item['id'] for item in response.json()], [third.pk, first.pk])
+        self.assertEqual(response.json()[0]['recommendation']['title'], 'Рекомендация 2')
+        self.assertEqual(self.statuses(), ['rejected', 'pending', 'completed'])
+        third.refresh_from_db()
+        self.assertEqual(third.user_rating, 5)
+        self.assertIsNotNone(third.completed_at)
+        # Пакетное обновление сбрасывает кэш панели мониторинга
+        self.assertIsNone(get_cached_dashboard(self.user.id))
+
+    def test_invalid_batches_are_not_applied(self):
+        first, second, _ = self.user_recommendations
+        batches = [
+            {'id': first.pk, 'status': 'completed'},
+            [{'id': first.pk, 'status': 'completed'}, {'id': second.pk, 'status': 'done'}],
+            [{'id': first.pk, 'status': 'completed'}, {'id': self.other_recommendation.pk, 'status': 'completed'}],
+            [{'id': first.pk, 'status': 'completed'}, {'id': first.pk, 'status': 'rejected'}],
+        ]
+        for batch in batches:
+            with self.subTest(batch=batch):
+                response = self.client.patch(self.url, batch, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(self.statuses(), ['pending', 'pending', 'pending'])
+
+        response = self.client.patch(self.url, batches[1], format='json')
+        self.assertEqual(response.json()['errors'][0]['index'], 1)
+        self.other_recommendation.refresh_from_db()
+        self.assertEqual(self.other_recommendation.status, 'pending')
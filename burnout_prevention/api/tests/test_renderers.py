@@ -0,0 +1,99 @@
+import json
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.models import SleepRecord, StressLevel, WorkActivity
+from burnout_prevention.api.renderers import ORJSONRenderer
+from burnout_prevention.users.models import User
+
+
+PAYLOADS = {
+    'scalars': {'int': 42, 'negative': -7, 'float': 3.14159, 'zero': 0.0, 'true': True, 'false': False, 'null': None},
+    'strings': {'ascii': 'stress', 'cyrillic': 'Уровень стресса', 'emoji': '😴', 'escapes': 'a"b\\c\n\t', 'separators': 'a b c'},
+    'nested': [{'date': '2026-10-18', 'level': 55.5, 'count': 3, 'tags': ['a', 'b']}, [], {}],
+    'drf_types': {
+        'datetime': timezone.make_aware(datetime(2026, 10, 18, 9, 30, 15, 123456)),
+        'date': date(2026, 10, 18),
+        'time': time(23, 59),
+        'duration': timedelta(hours=1, minutes=5),
+        'decimal': Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'lazy': _('Сон'),
+        'numpy': np.array([1.5, 2.0]),
+        'tuple': (1, 2),
+    },
+    'big_int': {'value': 2 ** 70},
+    'non_str_keys': {1: 'one', 2: 'two'},
+}
+
+
+class ORJSONRendererParityTests(SimpleTestCase):
+    """
+    ORJSONRenderer выводит тот же JSON, что и стандартный JSONRenderer.
+    """
+
+    def test_payloads_are_byte_identical(self):
+        for name, payload in PAYLOADS.items():
+            with self.subTest(payload=name):
+                self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_exponent_floats_are_equivalent(self):
+        payload = {'large': 1e16, 'small': 1e-7, 'regular': 0.1}
+        expected = JSONRenderer().render(payload)
+        rendered = ORJSONRenderer().render(payload)
+        self.assertEqual(json.loads(rendered), json.loads(expected))
+        self.assertIn(b'1e+16', expected)
+
+    def test_non_finite_values_are_rejected_like_stdlib(self):
+        for value in (float('nan'), float('inf'), float('-inf'), np.array([1.0, np.nan]), np.float64('inf')):
+            payload = {'series': [1.0, {'value': value}], 'missing': None}
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(payload)
+                with self.assertRaises(ValueError):
+                    ORJSONRenderer().render(payload)
+
+    def test_non_finite_values_without_strict_json(self):
+        class LenientRenderer(ORJSONRenderer):
+            strict = False
+
+        payload = {'value': float('nan'), 'other': None}
+        self.assertEqual(LenientRenderer().render(payload), b'{"value":NaN,"other":null}')
+
+    def test_indent_uses_stdlib(self):
+        context = {'indent': 2}
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOADS['nested'], renderer_context=context),
+            JSONRenderer().render(PAYLOADS['nested'], renderer_context=context)
+        )
+
+
+class ORJSONRendererResponseTests(TestCase):
+    """
+    Ответы API при выводе через ORJSONRenderer совпадают со стандартным выводом.
+    """
+
+    def test_api_responses_are_identical(self):
+        user = User.objects.create_user(email='render@example.com', username='render', password='password')
+        today = timezone.localdate()
+        for offset in range(10):
+            day = today - timedelta(days=offset)
+            StressLevel.objects.create(user=user, level=30 + offset, notes='Заметка')
+            SleepRecord.objects.create(user=user, date=day, duration_hours=7.25, quality=6)
+            WorkActivity.objects.create(user=user, date=day, duration_hours=8.5, productivity=7)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        for url in ('/api/dashboard/summary/', '/api/stress/', '/api/sleep/statistics/', '/api/burnout-risk/weekly_data/'):
+            with self.subTest(url=url):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(ORJSONRenderer().render(response.data), JSONRenderer().render(response.data))
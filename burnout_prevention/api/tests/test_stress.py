@@ -0,0 +1,107 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from burnout_prevention.analytics.anomalies import rebuild_stress_baselines
+from burnout_prevention.analytics.ingest import bulk_create_records
+from burnout_prevention.analytics.models import StressBaseline, StressLevel, UserDailyMetrics
+from burnout_prevention.api.cache import dashboard_cache_key, set_cached_dashboard
+from burnout_prevention.users.models import User
+
+
+class StressBulkCreateTests(TestCase):
+    """
+    Пакетная загрузка оценок стресса с указанным временем создания.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='bulk@example.com', username='bulk', password='password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_created_at_is_preserved(self):
+        now = timezone.now()
+        readings = [now - timedelta(days=3, hours=2), now - timedelta(days=1)]
+        response = self.client.post('/api/stress/bulk/', [
+            {'level': 40, 'created_at': readings[1].isoformat()},
+            {'level': 70, 'notes': 'offline', 'created_at': readings[0].isoformat()},
+            {'level': 50},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['created'], 3)
+
+        records = StressLevel.objects.in_bulk(response.json()['ids'])
+        created = [records[pk].created_at for pk in response.json()['ids']]
+        self.assertEqual(created[:2], [readings[1], readings[0]])
+        self.assertGreaterEqual(created[2], now)
+        self.assertEqual(records[response.json()['ids'][1]].local_date, timezone.localdate(readings[0]))
+
+        # Оценки попадают в сводки своих дней, а не сегодняшнего
+        days = dict(UserDailyMetrics.objects.filter(user=self.user).values_list('date', 'stress_count'))
+        self.assertEqual(days, {
+            timezone.localdate(readings[0]): 1,
+            timezone.localdate(readings[1]): 1,
+            timezone.localdate(): 1,
+        })
+
+    def test_future_created_at_is_rejected(self):
+        response = self.client.post('/api/stress/bulk/', [
+            {'level': 40, 'created_at': (timezone.now() + timedelta(hours=1)).isoformat()},
+            {'level': 50},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(response.json()['errors'][0]['index'], 0)
+        self.assertIn('created_at', response.json()['errors'][0]['errors'])
+
+    def test_single_create_ignores_created_at(self):
+        earlier = timezone.now() - timedelta(days=2)
+        response = self.client.post('/api/stress/', {'level': 40, 'created_at': earlier.isoformat()}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(StressLevel.objects.get(user=self.user).local_date, timezone.localdate())
+
+    def test_backdated_readings_rebuild_baseline(self):
+        now = timezone.now()
+        for index, level in enumerate([30, 32, 31, 29, 30, 33]):
+            StressLevel.objects.create(user=self.user, level=level, created_at=now - timedelta(hours=6 - index))
+
+        # Оценки раньше уже сохраненных: повышенный уровень до серии спокойных оценок
+        response = self.client.post('/api/stress/bulk/', [
+            {'level': 90, 'created_at': (now - timedelta(days=2)).isoformat()},
+            {'level': 85, 'created_at': (now - timedelta(days=2, hours=1)).isoformat()},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+        # Отметки совпадают с последовательным пересчетом всей истории
+        self.assertEqual(rebuild_stress_baselines(user_ids=[self.user.id]), 0)
+        self.assertEqual(StressBaseline.objects.get(user=self.user).readings_count, 8)
+        self.assertFalse(StressLevel.objects.filter(user=self.user, is_anomaly=True).exists())
+
+    def test_later_readings_update_baseline_incrementally(self):
+        now = timezone.now()
+        StressLevel.objects.create(user=self.user, level=30, created_at=now - timedelta(days=1))
+
+        with mock.patch('burnout_prevention.analytics.ingest.rebuild_stress_baselines') as rebuild:
+            response = self.client.post('/api/stress/bulk/', [
+                {'level': 30 + index, 'created_at': (now - timedelta(hours=10 - index)).isoformat()}
+                for index in range(6)
+            ], format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        rebuild.assert_not_called()
+        self.assertEqual(rebuild_stress_baselines(user_ids=[self.user.id]), 0)
+
+    def test_dashboard_invalidated_after_commit(self):
+        set_cached_dashboard(self.user.id, {'cached': True})
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            bulk_create_records(StressLevel, self.user, [{'level': 40}])
+            self.assertIsNotNone(cache.get(dashboard_cache_key(self.user.id)))
+
+        with mock.patch('burnout_prevention.analytics.tasks.recompute_burnout_risk.delay'):
+            for callback in callbacks:
+                callback()
+        self.assertIsNone(cache.get(dashboard_cache_key(self.user.id)))
@@ -10,7 +10,8 @@ from .views import (
     RecommendationViewSet, UserRecommendationViewSet,
     BurnoutRiskViewSet,
     CalendarIntegrationViewSet,
-    DashboardView
+    DashboardView, DashboardCacheStatsView,
+    RollingAnalyticsView, CorrelationAnalyticsView
 )
 
 # Создаем роутер для ViewSets
@@ -37,6 +38,9 @@ urlpatterns = [
     path('sleep/statistics/', SleepStatisticsView.as_view(), name='sleep-statistics'),
     path('work-activity/statistics/', WorkStatisticsView.as_view(), name='work-statistics'),
     path('dashboard/summary/', DashboardView.as_view(), name='dashboard'),  # Исправлено в соответствии с YAML-схемой
+    path('dashboard/cache-stats/', DashboardCacheStatsView.as_view(), name='dashboard-cache-stats'),
+    path('analytics/rolling/', RollingAnalyticsView.as_view(), name='analytics-rolling'),
+    path('analytics/correlations/', CorrelationAnalyticsView.as_view(), name='analytics-correlations'),
     
     # URL для аутентификации
     path('auth/', include('rest_framework.urls', namespace='rest_framework')),
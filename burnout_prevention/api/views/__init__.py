@@ -4,8 +4,9 @@ from .sleep_views import SleepRecordViewSet, SleepStatisticsView
 from .work_views import WorkActivityViewSet, WorkStatisticsView
 from .recommendation_views import RecommendationViewSet, UserRecommendationViewSet
 from .burnout_views import BurnoutRiskViewSet
-from .dashboard_views import DashboardView
+from .dashboard_views import DashboardView, DashboardCacheStatsView
 from .calendar_views import CalendarIntegrationViewSet
+from .analytics_views import RollingAnalyticsView, CorrelationAnalyticsView
 
 __all__ = [
     'UserViewSet',
@@ -17,7 +18,10 @@ __all__ = [
     'BurnoutRiskViewSet',
     'CalendarIntegrationViewSet',
     'DashboardView',
+    'DashboardCacheStatsView',
     'StressStatisticsView',
     'SleepStatisticsView',
     'WorkStatisticsView',
+    'RollingAnalyticsView',
+    'CorrelationAnalyticsView',
 ] 
\ No newline at end of file
@@ -0,0 +1,144 @@
+from rest_framework import permissions, status, views
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from burnout_prevention.analytics.correlations import (
+    DEFAULT_CORRELATION_LAGS, MAX_CORRELATION_LAG, parse_correlation_params, user_correlations
+)
+from burnout_prevention.analytics.rolling import (
+    DEFAULT_ROLLING_WINDOW, MAX_ROLLING_WINDOW, parse_rolling_params, rolling_metrics
+)
+from burnout_prevention.analytics.rollups import DAILY_METRICS_ROLLUPS
+from ..serializers.analytics_serializers import CorrelationsSerializer, RollingMetricsSerializer
+
+
+class RollingAnalyticsView(views.APIView):
+    """
+    API для получения скользящих средних, сумм и изменений за день
+    по дневным сводкам пользователя.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Получить скользящие показатели потока данных за период",
+        manual_parameters=[
+            openapi.Parameter(
+                'stream',
+                openapi.IN_QUERY,
+                description="Поток данных: stress, sleep или work (по умолчанию stress)",
+                type=openapi.TYPE_STRING,
+                enum=list(DAILY_METRICS_ROLLUPS)
+            ),
+            openapi.Parameter(
+                'metric',
+                openapi.IN_QUERY,
+                description="Показатель потока (по умолчанию level для stress, duration_hours для sleep и work)",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'window',
+                openapi.IN_QUERY,
+                description=f"Размер окна в днях, от 1 до {MAX_ROLLING_WINDOW} (по умолчанию {DEFAULT_ROLLING_WINDOW})",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'start_date',
+                openapi.IN_QUERY,
+                description="Начальная дата (формат: YYYY-MM-DD)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+            openapi.Parameter(
+                'end_date',
+                openapi.IN_QUERY,
+                description="Конечная дата (формат: YYYY-MM-DD)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+        ],
+        responses={
+            200: RollingMetricsSerializer,
+            400: "Неверный поток данных, показатель, размер окна или формат даты"
+        }
+    )
+    def get(self, request):
+        """
+        Возвращает ряд скользящих показателей за указанный период
+        (по умолчанию - за последние 30 дней).
+
+        Каждая точка соответствует дню с записями и содержит среднее значение за день,
+        скользящие сумму и среднее за window календарных дней и изменение
+        относительно предыдущего дня с записями.
+        """
+        try:
+            stream, metric, window, start_date, end_date = parse_rolling_params(request.query_params)
+        except ValueError as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = {
+            'stream': stream,
+            'metric': metric,
+            'window': window,
+            'start_date': start_date,
+            'end_date': end_date,
+            'points': rolling_metrics(request.user, stream, start_date, end_date, window=window, metric=metric)
+        }
+        serializer = RollingMetricsSerializer(data)
+        return Response(serializer.data)
+
+
+class CorrelationAnalyticsView(views.APIView):
+    """
+    API для получения корреляций показателей сна пользователя
+    с его стрессом и продуктивностью в последующие дни.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Получить корреляции показателей сна со стрессом и продуктивностью",
+        manual_parameters=[
+            openapi.Parameter(
+                'lags',
+                openapi.IN_QUERY,
+                description=(
+                    f"Сдвиги в днях через запятую, от 0 до {MAX_CORRELATION_LAG} "
+                    f"(по умолчанию {','.join(map(str, DEFAULT_CORRELATION_LAGS))} - следующий день)"
+                ),
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'date',
+                openapi.IN_QUERY,
+                description="Любой день недели расчета (формат: YYYY-MM-DD, по умолчанию сегодня)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+        ],
+        responses={
+            200: CorrelationsSerializer,
+            400: "Неверный формат даты или сдвигов"
+        }
+    )
+    def get(self, request):
+        """
+        Возвращает коэффициенты корреляции Пирсона и Спирмена между продолжительностью
+        и качеством сна за день и уровнем стресса и продуктивностью через lag дней.
+
+        Корреляции считаются по дневным сводкам за полные недели перед неделей расчета
+        и кэшируются до ее окончания. Если пар наблюдений недостаточно или один из
+        показателей не меняется, коэффициенты равны null.
+        """
+        try:
+            as_of, lags = parse_correlation_params(request.query_params)
+        except ValueError as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = CorrelationsSerializer(user_correlations(request.user, as_of, lags))
+        return Response(serializer.data)
@@ -6,10 +6,11 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from burnout_prevention.integrations.models import CalendarIntegration, CalendarEvent
+from .mixins import SparseFieldsetMixin
 from ..serializers.calendar_serializers import CalendarIntegrationSerializer, CalendarEventSerializer
 
 
-class CalendarIntegrationViewSet(viewsets.ModelViewSet):
+class CalendarIntegrationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления интеграциями с календарем.
     """
@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from burnout_prevention.analytics.ingest import bulk_create_records
+from ..representation import FastRepresentation
+from ..serializers.mixins import field_selection
+
+
+class BulkCreateModelMixin:
+    """
+    Добавляет во ViewSet действие bulk_create (POST <prefix>/bulk/) для пакетного
+    создания записей текущего пользователя.
+
+    Тело запроса - список объектов в формате сериализатора создания. Записи проверяются
+    сериализатором с many=True; корректные записи создаются одной транзакцией,
+    а для отклоненных возвращаются их индексы в списке и ошибки.
+    """
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """
+        Пакетно создает записи текущего пользователя.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"error": "Expected a list of records"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.BULK_CREATE_MAX_RECORDS:
+            return Response(
+                {"error": f"Too many records. Maximum is {settings.BULK_CREATE_MAX_RECORDS}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(data=items, many=True)
+        errors = []
+        if not serializer.is_valid():
+            errors = [
+                {'index': index, 'errors': item_errors}
+                for index, item_errors in enumerate(serializer.errors)
+                if item_errors
+            ]
+            rejected = {error['index'] for error in errors}
+            # Повторно проверяем только корректные записи, чтобы получить их значения
+            serializer = self.get_serializer(
+                data=[item for index, item in enumerate(items) if index not in rejected],
+                many=True
+            )
+            serializer.is_valid(raise_exception=True)
+
+        model = self.get_queryset().model
+        instances = bulk_create_records(model, request.user, serializer.validated_data)
+
+        data = {
+            'created': len(instances),
+            'ids': [instance.pk for instance in instances],
+            'errors': errors
+        }
+        if errors and not instances:
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+def _selected_columns(serializer, model, prefix=''):
+    """
+    Возвращает поля модели (для only) и связи (для select_related), необходимые
+    сериализатору, или None, если какое-либо поле не соответствует полю модели напрямую.
+    """
+    only = [prefix + model._meta.pk.name]
+    # Поля сортировки нужны постраничной выдаче по ключу
+    only += [prefix + name.lstrip('-') for name in model._meta.ordering]
+    related = []
+    for field in serializer.fields.values():
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        only.append(prefix + model_field.name)
+
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not model_field.is_relation:
+                return None
+            nested = _selected_columns(field, model_field.related_model, f'{prefix}{model_field.name}__')
+            if nested is None:
+                return None
+            only += nested[0]
+            related += [prefix + model_field.name, *nested[1]]
+    return only, related
+
+
+class SparseFieldsetMixin:
+    """
+    Ограничивает выборку ViewSet полями, выбранными параметрами запроса fields и omit
+    (см. DynamicFieldsMixin): невыбранные столбцы не загружаются (only), а выбранные
+    вложенные объекты загружаются тем же запросом (select_related).
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if field_selection(self.request) is None:
+            return queryset
+
+        columns = _selected_columns(self.get_serializer(), queryset.model)
+        if columns is None:
+            return queryset
+        only, related = columns
+        # Связи, загружаемые get_queryset, заменяются выбранными: невыбранные поля
+        # нельзя одновременно отложить и загрузить через select_related
+        queryset = queryset.select_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
+
+class FastListMixin:
+    """
+    Список объектов (действие list) читается через QuerySet.values() и преобразуется
+    в ответ FastRepresentation, без создания объектов моделей и механизма полей DRF.
+    Ответ совпадает с ответом сериализатора; если сериализатор не поддерживается
+    FastRepresentation (или fast_list = False), используется обычный list.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        representation = FastRepresentation.compile(self.get_serializer()) if self.fast_list else None
+        if representation is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        meta = queryset.model._meta
+        # id и поля сортировки нужны постраничной выдаче по ключу
+        queryset = queryset.values(*dict.fromkeys([
+            meta.pk.attname,
+            *(name.lstrip('-') for name in meta.ordering),
+            *representation.lookups
+        ]))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representation(page))
+        return Response(representation(queryset))
@@ -1,17 +1,36 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import viewsets, permissions, status, views
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 
+from burnout_prevention.recommendations.bandit import feedback_state, record_feedback_changes
+from burnout_prevention.recommendations.catalog import get_catalog
+from burnout_prevention.recommendations.engine import (
+    DEFAULT_RECOMMENDATIONS_COUNT,
+    MAX_RECOMMENDATIONS_COUNT,
+    recommend_for_user
+)
 from burnout_prevention.recommendations.models import Recommendation, UserRecommendation
+from burnout_prevention.recommendations.signals import user_recommendations_changed
+from burnout_prevention.recommendations.statistics import parse_stats_params, recommendation_stats
+from .mixins import SparseFieldsetMixin
+from ..cache import get_cached_recommendation_stats, set_cached_recommendation_stats
+from ..pagination import RecordPagination
 from ..serializers.recommendation_serializers import (
     RecommendationSerializer,
+    RecommendationsStatsSerializer,
+    UserRecommendationBulkUpdateSerializer,
     UserRecommendationSerializer,
     UserRecommendationUpdateSerializer
 )
 
 
-class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
+class RecommendationViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet для просмотра всех рекомендаций.
     Только чтение, так как создание рекомендаций выполняется через админку или API рекомендательной системы.
@@ -22,13 +41,70 @@ class RecommendationViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['category', 'is_quick', 'type']
 
+    def list(self, request, *args, **kwargs):
+        """
+        Возвращает рекомендации из каталога, загруженного в память процесса,
+        с фильтрами category, is_quick и type (без запросов к базе данных).
+        """
+        catalog = get_catalog()
+        params = request.query_params
+
+        category = params.get('category') or None
+        if category is not None and category not in dict(Recommendation.CATEGORY_CHOICES):
+            return Response(
+                {"error": f"Invalid category. Use {', '.join(dict(Recommendation.CATEGORY_CHOICES))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        is_quick = params.get('is_quick') or None
+        if is_quick is not None:
+            if is_quick.lower() not in ('true', 'false', '1', '0'):
+                return Response(
+                    {"error": "Invalid is_quick. Use true or false"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            is_quick = is_quick.lower() in ('true', '1')
+
+        type_id = params.get('type') or None
+        if type_id is not None:
+            try:
+                type_id = int(type_id)
+            except ValueError:
+                type_id = None
+            if type_id not in catalog.types:
+                return Response(
+                    {"error": "Invalid type. Recommendation type not found"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        recommendations = catalog.filter(category=category, is_quick=is_quick, type_id=type_id)
+        page = self.paginate_queryset(recommendations)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(recommendations, many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Возвращает рекомендацию из каталога, загруженного в память процесса.
+        """
+        try:
+            recommendation = get_catalog().by_id.get(int(kwargs[self.lookup_field]))
+        except ValueError:
+            recommendation = None
+        if recommendation is None:
+            raise NotFound()
+        return Response(self.get_serializer(recommendation).data)
+
 
-class UserRecommendationViewSet(viewsets.ModelViewSet):
+class UserRecommendationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet для просмотра и управления рекомендациями пользователя.
     """
     queryset = UserRecommendation.objects.all()
     serializer_class = UserRecommendationSerializer
+    pagination_class = RecordPagination
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'recommendation__category']
@@ -36,8 +112,9 @@ class UserRecommendationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Возвращает только рекомендации текущего пользователя.
+        Рекомендация каталога и ее тип загружаются тем же запросом.
         """
-        return self.queryset.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user).select_related('recommendation__type')
     
     def get_serializer_class(self):
         """
@@ -51,34 +128,77 @@ class UserRecommendationViewSet(viewsets.ModelViewSet):
     def request_new(self, request):
         """
         Запрашивает новые рекомендации для пользователя.
-        Этот метод может вызывать рекомендательную систему или 
-        выбирать рекомендации на основе текущих данных пользователя.
+        Рекомендации каталога подбираются по текущим факторам риска выгорания,
+        предпочитаемым методам релаксации и отзывам о прошлых рекомендациях.
+        Количество задается параметром count (по умолчанию 5).
         """
-        # Здесь должна быть логика для создания новых рекомендаций
-        # Например, вызов рекомендательной системы или алгоритма
-        
-        # В качестве примера просто возьмем неназначенные пользователю рекомендации
-        user = request.user
-        existing_recommendations = UserRecommendation.objects.filter(
-            user=user
-        ).values_list('recommendation_id', flat=True)
-        
-        new_recommendations = Recommendation.objects.exclude(
-            id__in=existing_recommendations
-        )[:5]  # Ограничим до 5 новых рекомендаций
-        
-        created_recommendations = []
-        for recommendation in new_recommendations:
-            user_recommendation = UserRecommendation.objects.create(
-                user=user,
-                recommendation=recommendation,
-                status='pending'
+        try:
+            count = int(request.data.get('count', DEFAULT_RECOMMENDATIONS_COUNT))
+        except (TypeError, ValueError):
+            count = 0
+        if not 1 <= count <= MAX_RECOMMENDATIONS_COUNT:
+            return Response(
+                {"error": f"count must be an integer from 1 to {MAX_RECOMMENDATIONS_COUNT}"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            created_recommendations.append(user_recommendation)
-        
+
+        created_recommendations = recommend_for_user(request.user, count)
+
         serializer = UserRecommendationSerializer(created_recommendations, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
+    @swagger_auto_schema(
+        method='get',
+        operation_description="Получить статистику рекомендаций пользователя по статусам",
+        manual_parameters=[
+            openapi.Parameter(
+                'category',
+                openapi.IN_QUERY,
+                description="Категория рекомендаций",
+                type=openapi.TYPE_STRING,
+                enum=[key for key, _ in Recommendation.CATEGORY_CHOICES]
+            ),
+            openapi.Parameter(
+                'start_date',
+                openapi.IN_QUERY,
+                description="Начальная дата назначения рекомендаций (формат: YYYY-MM-DD)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+            openapi.Parameter(
+                'end_date',
+                openapi.IN_QUERY,
+                description="Конечная дата назначения рекомендаций (формат: YYYY-MM-DD)",
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATE
+            ),
+        ],
+        responses={
+            200: RecommendationsStatsSerializer,
+            400: "Неизвестная категория или неверный формат даты"
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Возвращает количество рекомендаций пользователя по статусам и процент выполнения:
+        new - в ожидании, inProgress - принятые, completed - выполненные, skipped - отклоненные.
+        Статистика кэшируется для пользователя и сбрасывается при изменении его рекомендаций.
+        """
+        try:
+            filters = parse_stats_params(request.query_params)
+        except ValueError as exc:
+            return Response(
+                {"error": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = get_cached_recommendation_stats(request.user.id, filters)
+        if data is None:
+            data = recommendation_stats(self.get_queryset(), *filters)
+            set_cached_recommendation_stats(request.user.id, filters, data)
+        return Response(data)
+    
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         """
@@ -94,4 +214,78 @@ class UserRecommendationViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             serializer.save()
             return Response(UserRecommendationSerializer(user_recommendation).data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST) 
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['patch'])
+    def bulk_update_status(self, request):
+        """
+        Пакетно обновляет статус и обратную связь рекомендаций текущего пользователя.
+
+        Тело запроса - список объектов {id, status, user_rating, user_feedback, completed_at}
+        (все поля, кроме id, необязательны). Изменения проверяются так же, как в update_status,
+        и применяются одной транзакцией: если хотя бы одно из них некорректно, не применяется
+        ни одно. При выполнении без указанной даты дата выполнения устанавливается автоматически.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"error": "Expected a list of updates"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.BULK_UPDATE_MAX_RECORDS:
+            return Response(
+                {"error": f"Too many updates. Maximum is {settings.BULK_UPDATE_MAX_RECORDS}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = UserRecommendationBulkUpdateSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            errors = [
+                {'index': index, 'errors': item_errors}
+                for index, item_errors in enumerate(serializer.errors)
+                if item_errors
+            ]
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        updates = serializer.validated_data
+        ids = [update['id'] for update in updates]
+        if len(set(ids)) != len(ids):
+            return Response(
+                {"error": "Each recommendation can be updated only once per request"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            instances = self.get_queryset().select_related(None).select_for_update().in_bulk(ids)
+            missing = [pk for pk in ids if pk not in instances]
+            if missing:
+                return Response(
+                    {"error": f"User recommendations not found: {', '.join(map(str, missing))}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            fields = set()
+            changes = []
+            for update in updates:
+                instance = instances[update['id']]
+                old = feedback_state(instance)
+                for attr, value in update.items():
+                    if attr != 'id':
+                        setattr(instance, attr, value)
+                        fields.add(attr)
+                completed_at = instance.completed_at
+                instance.set_completed_at()
+                if instance.completed_at != completed_at:
+                    fields.add('completed_at')
+                changes.append((instance.recommendation_id, old, feedback_state(instance)))
+            if fields:
+                UserRecommendation.objects.bulk_update(instances.values(), sorted(fields))
+                record_feedback_changes(changes)
+
+        if fields:
+            user_recommendations_changed.send(sender=UserRecommendation, user_ids=[request.user.id])
+
+        # Обновленные рекомендации с данными каталога одним запросом, в порядке запроса
+        updated = self.get_queryset().in_bulk(ids)
+        serializer = UserRecommendationSerializer([updated[pk] for pk in ids], many=True)
+        return Response(serializer.data)
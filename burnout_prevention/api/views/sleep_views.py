@@ -1,12 +1,13 @@
-from django.db.models import Avg, Count, F
-from django.utils import timezone
-from datetime import datetime, timedelta
 from rest_framework import viewsets, permissions, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from burnout_prevention.analytics.models import SleepRecord
+from burnout_prevention.analytics.rollups import daily_metrics_statistics
+from burnout_prevention.analytics.statistics import parse_statistics_period
+from .mixins import BulkCreateModelMixin, FastListMixin, SparseFieldsetMixin
+from ..pagination import RecordPagination
 from ..serializers.sleep_serializers import (
     SleepRecordSerializer, 
     SleepRecordCreateSerializer,
@@ -14,12 +15,55 @@ from ..serializers.sleep_serializers import (
 )
 
 
-class SleepRecordViewSet(viewsets.ModelViewSet):
+def _sleep_statistics(request):
+    """
+    Возвращает статистику сна текущего пользователя за указанный период
+    с группировкой по дням, неделям или месяцам (параметр granularity).
+    """
+    try:
+        start_date, end_date, granularity = parse_statistics_period(request.query_params, default_days=30)
+    except ValueError as exc:
+        return Response(
+            {"error": str(exc)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    result = daily_metrics_statistics(request.user, 'sleep', start_date, end_date, granularity)
+    summary = result['summary']
+
+    # Средние показатели сна по периодам
+    statistics = [
+        {
+            'date': bucket['date'].strftime('%Y-%m-%d'),
+            'duration_hours': bucket['avg_duration_hours'],
+            'quality': bucket['avg_quality'],
+            'count': bucket['count']
+        }
+        for bucket in result['buckets']
+    ]
+
+    data = {
+        'avg_duration': summary['avg_duration_hours'] or 0,
+        'avg_quality': summary['avg_quality'] or 0,
+        'total_records': summary['count'],
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'granularity': granularity,
+        'trend': result['trend']['duration_hours'],
+        'statistics': statistics
+    }
+
+    serializer = SleepStatisticsSerializer(data)
+    return Response(serializer.data)
+
+
+class SleepRecordViewSet(FastListMixin, SparseFieldsetMixin, BulkCreateModelMixin, viewsets.ModelViewSet):
     """
     ViewSet для просмотра и редактирования записей о сне.
     """
     queryset = SleepRecord.objects.all()
     serializer_class = SleepRecordSerializer
+    pagination_class = RecordPagination
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['date']
@@ -34,7 +78,7 @@ class SleepRecordViewSet(viewsets.ModelViewSet):
         """
         Возвращает соответствующий сериализатор.
         """
-        if self.action == 'create':
+        if self.action in ('create', 'bulk_create'):
             return SleepRecordCreateSerializer
         return self.serializer_class
         
@@ -43,52 +87,7 @@ class SleepRecordViewSet(viewsets.ModelViewSet):
         """
         Возвращает статистику сна за указанный период.
         """
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else (timezone.now().date() - timedelta(days=30))
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.now().date()
-        except ValueError:
-            return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-        user_sleep_records = SleepRecord.objects.filter(
-            user=request.user,
-            date__gte=start_date,
-            date__lte=end_date
-        )
-        
-        # Средние показатели сна
-        aggregation = user_sleep_records.aggregate(
-            avg_duration=Avg('duration_hours'),
-            avg_quality=Avg('quality')
-        )
-        
-        avg_duration = aggregation['avg_duration'] or 0
-        avg_quality = aggregation['avg_quality'] or 0
-        
-        # Статистика по дням
-        statistics = [
-            {
-                'date': record.date.strftime('%Y-%m-%d'),
-                'duration_hours': record.duration_hours,
-                'quality': record.quality
-            }
-            for record in user_sleep_records.order_by('date')
-        ]
-        
-        data = {
-            'avg_duration': avg_duration,
-            'avg_quality': avg_quality,
-            'total_records': user_sleep_records.count(),
-            'statistics': statistics
-        }
-        
-        serializer = SleepStatisticsSerializer(data)
-        return Response(serializer.data)
+        return _sleep_statistics(request)
 
 
 class SleepStatisticsView(views.APIView):
@@ -101,49 +100,4 @@ class SleepStatisticsView(views.APIView):
         """
         Возвращает статистику сна за указанный период.
         """
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else (timezone.now().date() - timedelta(days=30))
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.now().date()
-        except ValueError:
-            return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-        user_sleep_records = SleepRecord.objects.filter(
-            user=request.user,
-            date__gte=start_date,
-            date__lte=end_date
-        )
-        
-        # Средние показатели сна
-        aggregation = user_sleep_records.aggregate(
-            avg_duration=Avg('duration_hours'),
-            avg_quality=Avg('quality')
-        )
-        
-        avg_duration = aggregation['avg_duration'] or 0
-        avg_quality = aggregation['avg_quality'] or 0
-        
-        # Статистика по дням
-        statistics = [
-            {
-                'date': record.date.strftime('%Y-%m-%d'),
-                'duration_hours': record.duration_hours,
-                'quality': record.quality
-            }
-            for record in user_sleep_records.order_by('date')
-        ]
-        
-        data = {
-            'avg_duration': avg_duration,
-            'avg_quality': avg_quality,
-            'total_records': user_sleep_records.count(),
-            'statistics': statistics
-        }
-        
-        serializer = SleepStatisticsSerializer(data)
-        return Response(serializer.data) 
\ No newline at end of file
+        return _sleep_statistics(request)
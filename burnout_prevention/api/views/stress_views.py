@@ -1,25 +1,69 @@
-from django.db.models import Avg, Count, F, Max, Min
-from django.utils import timezone
-from datetime import datetime, timedelta
 from rest_framework import viewsets, permissions, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from burnout_prevention.analytics.models import StressLevel
+from burnout_prevention.analytics.rollups import daily_metrics_statistics
+from burnout_prevention.analytics.statistics import parse_statistics_period
+from .mixins import BulkCreateModelMixin, FastListMixin, SparseFieldsetMixin
+from ..pagination import RecordPagination
 from ..serializers.stress_serializers import (
     StressLevelSerializer, 
     StressLevelCreateSerializer,
+    StressLevelBulkCreateSerializer,
     StressStatisticsSerializer
 )
 
 
-class StressLevelViewSet(viewsets.ModelViewSet):
+def _stress_statistics(request):
+    """
+    Возвращает статистику уровня стресса текущего пользователя за указанный период
+    с группировкой по дням, неделям или месяцам (параметр granularity).
+    """
+    try:
+        start_date, end_date, granularity = parse_statistics_period(request.query_params, default_days=7)
+    except ValueError as exc:
+        return Response(
+            {"error": str(exc)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    result = daily_metrics_statistics(request.user, 'stress', start_date, end_date, granularity)
+    summary = result['summary']
+
+    statistics = [
+        {
+            'date': bucket['date'].strftime('%Y-%m-%d'),
+            'avg_level': bucket['avg_level'],
+            'count': bucket['count']
+        }
+        for bucket in result['buckets']
+    ]
+
+    data = {
+        'avg_level': summary['avg_level'] or 0,
+        'max_level': summary['max_level'] or 0,
+        'min_level': summary['min_level'] or 0,
+        'total_records': summary['count'],
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'granularity': granularity,
+        'trend': result['trend']['level'],
+        'statistics': statistics
+    }
+
+    serializer = StressStatisticsSerializer(data)
+    return Response(serializer.data)
+
+
+class StressLevelViewSet(FastListMixin, SparseFieldsetMixin, BulkCreateModelMixin, viewsets.ModelViewSet):
     """
     ViewSet для просмотра и редактирования записей об уровне стресса.
     """
     queryset = StressLevel.objects.all()
     serializer_class = StressLevelSerializer
+    pagination_class = RecordPagination
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['created_at']
@@ -36,6 +80,8 @@ class StressLevelViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'create':
             return StressLevelCreateSerializer
+        if self.action == 'bulk_create':
+            return StressLevelBulkCreateSerializer
         return self.serializer_class
         
     @action(detail=False, methods=['get'])
@@ -43,80 +89,32 @@ class StressLevelViewSet(viewsets.ModelViewSet):
         """
         Возвращает статистику уровня стресса за указанный период.
         """
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        
+        return _stress_statistics(request)
+
+    @action(detail=False, methods=['get'])
+    def anomalies(self, request):
+        """
+        Возвращает аномальные оценки стресса - резко отклоняющиеся от базового уровня
+        пользователя - за указанный период (по умолчанию за последние 30 дней).
+        """
         try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else (timezone.now().date() - timedelta(days=7))
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.now().date()
-        except ValueError:
+            start_date, end_date, _ = parse_statistics_period(request.query_params, default_days=30)
+        except ValueError as exc:
             return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD"},
+                {"error": str(exc)},
                 status=status.HTTP_400_BAD_REQUEST
             )
-            
-        user_stress_levels = StressLevel.objects.filter(
-            user=request.user,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        )
-        
-        # Средний уровень стресса
-        avg_level = user_stress_levels.aggregate(avg_level=Avg('level'))['avg_level'] or 0
-        
-        # Максимальный и минимальный уровень стресса
-        max_level = user_stress_levels.aggregate(max_level=Max('level'))['max_level'] or 0
-        min_level = user_stress_levels.aggregate(min_level=Min('level'))['min_level'] or 0
-        
-        # Расчет тренда (сравнение с предыдущим периодом такой же длительности)
-        previous_start_date = start_date - (end_date - start_date)
-        previous_end_date = start_date - timedelta(days=1)
-        
-        previous_period_levels = StressLevel.objects.filter(
-            user=request.user,
-            created_at__date__gte=previous_start_date,
-            created_at__date__lte=previous_end_date
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            is_anomaly=True,
+            local_date__gte=start_date,
+            local_date__lte=end_date
         )
-        
-        previous_avg_level = previous_period_levels.aggregate(avg_level=Avg('level'))['avg_level'] or 0
-        trend_value = avg_level - previous_avg_level
-        trend_direction = 'stable'
-        if trend_value > 0:
-            trend_direction = 'up'
-        elif trend_value < 0:
-            trend_direction = 'down'
-        
-        # Статистика по дням
-        daily_stats = user_stress_levels.values('created_at__date').annotate(
-            date=F('created_at__date'),
-            avg_level=Avg('level'),
-            count=Count('id')
-        ).order_by('created_at__date')
-        
-        statistics = [
-            {
-                'date': stat['date'].strftime('%Y-%m-%d'),
-                'avg_level': stat['avg_level'],
-                'count': stat['count']
-            }
-            for stat in daily_stats
-        ]
-        
-        data = {
-            'avg_level': avg_level,
-            'max_level': max_level,
-            'min_level': min_level,
-            'total_records': user_stress_levels.count(),
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'trend': {
-                'value': trend_value,
-                'direction': trend_direction
-            },
-            'statistics': statistics
-        }
-        
-        serializer = StressStatisticsSerializer(data)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
 
@@ -130,78 +128,4 @@ class StressStatisticsView(views.APIView):
         """
         Возвращает статистику уровня стресса за указанный период.
         """
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else (timezone.now().date() - timedelta(days=7))
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.now().date()
-        except ValueError:
-            return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-        user_stress_levels = StressLevel.objects.filter(
-            user=request.user,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        )
-        
-        # Средний уровень стресса
-        avg_level = user_stress_levels.aggregate(avg_level=Avg('level'))['avg_level'] or 0
-        
-        # Максимальный и минимальный уровень стресса
-        max_level = user_stress_levels.aggregate(max_level=Max('level'))['max_level'] or 0
-        min_level = user_stress_levels.aggregate(min_level=Min('level'))['min_level'] or 0
-        
-        # Расчет тренда (сравнение с предыдущим периодом такой же длительности)
-        previous_start_date = start_date - (end_date - start_date)
-        previous_end_date = start_date - timedelta(days=1)
-        
-        previous_period_levels = StressLevel.objects.filter(
-            user=request.user,
-            created_at__date__gte=previous_start_date,
-            created_at__date__lte=previous_end_date
-        )
-        
-        previous_avg_level = previous_period_levels.aggregate(avg_level=Avg('level'))['avg_level'] or 0
-        trend_value = avg_level - previous_avg_level
-        trend_direction = 'stable'
-        if trend_value > 0:
-            trend_direction = 'up'
-        elif trend_value < 0:
-            trend_direction = 'down'
-        
-        # Статистика по дням
-        daily_stats = user_stress_levels.values('created_at__date').annotate(
-            date=F('created_at__date'),
-            avg_level=Avg('level'),
-            count=Count('id')
-        ).order_by('created_at__date')
-        
-        statistics = [
-            {
-                'date': stat['date'].strftime('%Y-%m-%d'),
-                'avg_level': stat['avg_level'],
-                'count': stat['count']
-            }
-            for stat in daily_stats
-        ]
-        
-        data = {
-            'avg_level': avg_level,
-            'max_level': max_level,
-            'min_level': min_level,
-            'total_records': user_stress_levels.count(),
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'trend': {
-                'value': trend_value,
-                'direction': trend_direction
-            },
-            'statistics': statistics
-        }
-        
-        serializer = StressStatisticsSerializer(data)
-        return Response(serializer.data) 
\ No newline at end of file
+        return _stress_statistics(request)
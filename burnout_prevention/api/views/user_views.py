@@ -8,6 +8,7 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from burnout_prevention.users.models import User, UserProfile, UserActivity
+from .mixins import SparseFieldsetMixin
 from ..serializers.user_serializers import (
     UserSerializer,
     UserProfileSerializer,
@@ -17,7 +18,7 @@ from ..serializers.user_serializers import (
 )
 
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API точки доступа для управления пользователями.
     
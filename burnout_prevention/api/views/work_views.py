@@ -1,6 +1,3 @@
-from django.db.models import Avg, Count, F
-from django.utils import timezone
-from datetime import datetime, timedelta
 from rest_framework import viewsets, permissions, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,15 +6,63 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from burnout_prevention.analytics.models import WorkActivity
+from burnout_prevention.analytics.rollups import daily_metrics_statistics
+from burnout_prevention.analytics.statistics import parse_statistics_period
+from .mixins import BulkCreateModelMixin, FastListMixin, SparseFieldsetMixin
+from ..pagination import RecordPagination
 from ..serializers.work_serializers import (
     WorkActivitySerializer, 
     WorkActivityCreateSerializer,
-    WorkStatisticsSerializer,
-    DailyWorkDataSerializer
+    WorkStatisticsSerializer
 )
 
 
-class WorkActivityViewSet(viewsets.ModelViewSet):
+def _work_statistics(request):
+    """
+    Возвращает статистику рабочей активности текущего пользователя за указанный период
+    с группировкой по дням, неделям или месяцам (параметр granularity).
+    """
+    try:
+        start_date, end_date, granularity = parse_statistics_period(request.query_params, default_days=30)
+    except ValueError as exc:
+        return Response(
+            {"error": str(exc)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    result = daily_metrics_statistics(request.user, 'work', start_date, end_date, granularity)
+    summary = result['summary']
+
+    # Средние показатели работы по периодам (заметки при группировке не передаются)
+    daily_data = [
+        {
+            'date': bucket['date'].strftime('%Y-%m-%d'),
+            'duration_hours': bucket['avg_duration_hours'],
+            'productivity': bucket['avg_productivity'],
+            'notes': None,
+            'count': bucket['count']
+        }
+        for bucket in result['buckets']
+    ]
+
+    data = {
+        'average_duration': summary['avg_duration_hours'] or 0,
+        'average_breaks_count': summary['avg_breaks_count'] or 0,
+        'average_breaks_duration': summary['avg_breaks_total_minutes'] or 0,
+        'average_productivity': summary['avg_productivity'] or 0,
+        'total_records': summary['count'],
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'granularity': granularity,
+        'trend': result['trend']['duration_hours'],
+        'daily_data': daily_data
+    }
+
+    serializer = WorkStatisticsSerializer(data)
+    return Response(serializer.data)
+
+
+class WorkActivityViewSet(FastListMixin, SparseFieldsetMixin, BulkCreateModelMixin, viewsets.ModelViewSet):
     """
     API для управления записями о рабочей активности пользователя.
     
@@ -27,6 +72,7 @@ class WorkActivityViewSet(viewsets.ModelViewSet):
     """
     queryset = WorkActivity.objects.all()
     serializer_class = WorkActivitySerializer
+    pagination_class = RecordPagination
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['date']
@@ -70,7 +116,7 @@ class WorkActivityViewSet(viewsets.ModelViewSet):
         """
         Возвращает соответствующий сериализатор.
         """
-        if self.action == 'create':
+        if self.action in ('create', 'bulk_create'):
             return WorkActivityCreateSerializer
         return self.serializer_class
         
@@ -91,13 +137,20 @@ class WorkActivityViewSet(viewsets.ModelViewSet):
                 type=openapi.TYPE_STRING,
                 format=openapi.FORMAT_DATE
             ),
+            openapi.Parameter(
+                'granularity',
+                openapi.IN_QUERY,
+                description="Шаг группировки: day, week или month (по умолчанию day)",
+                type=openapi.TYPE_STRING,
+                enum=['day', 'week', 'month']
+            ),
         ],
         responses={
             200: openapi.Response(
                 description="Статистика рабочей активности",
                 schema=WorkStatisticsSerializer
             ),
-            400: "Неверный формат даты"
+            400: "Неверный формат даты или шаг группировки"
         }
     )
     @action(detail=False, methods=['get'])
@@ -119,63 +172,11 @@ class WorkActivityViewSet(viewsets.ModelViewSet):
         - total_records: Общее количество записей
         - start_date: Начальная дата периода в формате YYYY-MM-DD
         - end_date: Конечная дата периода в формате YYYY-MM-DD
-        - daily_data: Ежедневные данные о работе с датой, продолжительностью, продуктивностью и заметками
+        - granularity: Шаг группировки (day, week или month)
+        - trend: Изменение средней продолжительности работы относительно предыдущего периода
+        - daily_data: Средние продолжительность и продуктивность по дням, неделям или месяцам
         """
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else (timezone.now().date() - timedelta(days=30))
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.now().date()
-        except ValueError:
-            return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-        user_work_activities = WorkActivity.objects.filter(
-            user=request.user,
-            date__gte=start_date,
-            date__lte=end_date
-        )
-        
-        # Средние показатели работы
-        aggregation = user_work_activities.aggregate(
-            avg_duration=Avg('duration_hours'),
-            avg_breaks=Avg('breaks_count'),
-            avg_breaks_duration=Avg('breaks_total_minutes'),
-            avg_productivity=Avg('productivity')
-        )
-        
-        avg_duration = aggregation['avg_duration'] or 0
-        avg_breaks = aggregation['avg_breaks'] or 0
-        avg_breaks_duration = aggregation['avg_breaks_duration'] or 0
-        avg_productivity = aggregation['avg_productivity'] or 0
-        
-        # Статистика по дням
-        daily_data = [
-            {
-                'date': activity.date.strftime('%Y-%m-%d'),
-                'duration_hours': activity.duration_hours,
-                'productivity': activity.productivity,
-                'notes': activity.notes
-            }
-            for activity in user_work_activities.order_by('date')
-        ]
-        
-        data = {
-            'average_duration': avg_duration,
-            'average_breaks_count': avg_breaks,
-            'average_breaks_duration': avg_breaks_duration,
-            'average_productivity': avg_productivity,
-            'total_records': user_work_activities.count(),
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'daily_data': daily_data
-        }
-        
-        serializer = WorkStatisticsSerializer(data)
-        return Response(serializer.data)
+        return _work_statistics(request)
 
 
 class WorkStatisticsView(views.APIView):
@@ -201,13 +202,20 @@ class WorkStatisticsView(views.APIView):
                 type=openapi.TYPE_STRING,
                 format=openapi.FORMAT_DATE
             ),
+            openapi.Parameter(
+                'granularity',
+                openapi.IN_QUERY,
+                description="Шаг группировки: day, week или month (по умолчанию day)",
+                type=openapi.TYPE_STRING,
+                enum=['day', 'week', 'month']
+            ),
         ],
         responses={
             200: openapi.Response(
                 description="Статистика рабочей активности",
                 schema=WorkStatisticsSerializer
             ),
-            400: "Неверный формат даты"
+            400: "Неверный формат даты или шаг группировки"
         }
     )
     def get(self, request):
@@ -226,60 +234,8 @@ class WorkStatisticsView(views.APIView):
         - total_records: Общее количество записей
         - start_date: Начальная дата периода в формате YYYY-MM-DD
         - end_date: Конечная дата периода в формате YYYY-MM-DD
-        - daily_data: Ежедневные данные о работе с датой, продолжительностью, продуктивностью и заметками
+        - granularity: Шаг группировки (day, week или month)
+        - trend: Изменение средней продолжительности работы относительно предыдущего периода
+        - daily_data: Средние продолжительность и продуктивность по дням, неделям или месяцам
         """
-        start_date_str = request.query_params.get('start_date')
-        end_date_str = request.query_params.get('end_date')
-        
-        try:
-            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else (timezone.now().date() - timedelta(days=30))
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else timezone.now().date()
-        except ValueError:
-            return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-        user_work_activities = WorkActivity.objects.filter(
-            user=request.user,
-            date__gte=start_date,
-            date__lte=end_date
-        )
-        
-        # Средние показатели работы
-        aggregation = user_work_activities.aggregate(
-            avg_duration=Avg('duration_hours'),
-            avg_breaks=Avg('breaks_count'),
-            avg_breaks_duration=Avg('breaks_total_minutes'),
-            avg_productivity=Avg('productivity')
-        )
-        
-        avg_duration = aggregation['avg_duration'] or 0
-        avg_breaks = aggregation['avg_breaks'] or 0
-        avg_breaks_duration = aggregation['avg_breaks_duration'] or 0
-        avg_productivity = aggregation['avg_productivity'] or 0
-        
-        # Статистика по дням
-        daily_data = [
-            {
-                'date': activity.date.strftime('%Y-%m-%d'),
-                'duration_hours': activity.duration_hours,
-                'productivity': activity.productivity,
-                'notes': activity.notes
-            }
-            for activity in user_work_activities.order_by('date')
-        ]
-        
-        data = {
-            'average_duration': avg_duration,
-            'average_breaks_count': avg_breaks,
-            'average_breaks_duration': avg_breaks_duration,
-            'average_productivity': avg_productivity,
-            'total_records': user_work_activities.count(),
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'daily_data': daily_data
-        }
-        
-        serializer = WorkStatisticsSerializer(data)
-        return Response(serializer.data) 
\ No newline at end of file
+        return _work_statistics(request) 
\ No newline at end of file
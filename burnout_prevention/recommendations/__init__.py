@@ -0,0 +1 @@
+default_app_config = 'burnout_prevention.recommendations.apps.RecommendationsConfig'
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class RecommendationsConfig(AppConfig):
+    name = 'burnout_prevention.recommendations'
+    verbose_name = _('Recommendations')
+    
+    def ready(self):
+        import burnout_prevention.recommendations.signals
\ No newline at end of file
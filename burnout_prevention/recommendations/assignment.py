@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from burnout_prevention.analytics.sharding import run_sharded, shard_queryset
+from burnout_prevention.users.models import User
+from .bandit import batched_feedback_changes, feedback_state, record_feedback_changes
+from .models import Recommendation, UserRecommendation
+from .signals import user_recommendations_changed
+
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_ASSIGNMENT_REASON = 'Назначено системой'
+
+
+def parse_user_filter(expression):
+    """
+    Разбирает выражение отбора пользователей вида
+    "is_active=true,date_joined__gte=2024-01-01" в аргументы User.objects.filter.
+    Значения true и false (без учета регистра) преобразуются в логические.
+
+    Raises:
+        ValueError: Условие без знака равенства
+
+    Returns:
+        dict: Условия отбора
+    """
+    filters = {}
+    for condition in (expression or '').split(','):
+        if not condition.strip():
+            continue
+        lookup, separator, value = condition.partition('=')
+        if not separator or not lookup.strip():
+            raise ValueError(f'Invalid filter condition: {condition.strip()}. Use field=value')
+        value = value.strip()
+        if value.lower() in ('true', 'false'):
+            value = value.lower() == 'true'
+        filters[lookup.strip()] = value
+    return filters
+
+
+def assign_recommendations_shard(recommendation_ids, user_filters=None, shard_index=0, shard_count=1,
+                                 chunk_size=DEFAULT_CHUNK_SIZE, reason=DEFAULT_ASSIGNMENT_REASON, replace=False):
+    """
+    Назначает рекомендации recommendation_ids пользователям шарда, отобранным user_filters,
+    у которых их еще нет.
+
+    Пользователи обрабатываются порциями по диапазонам id; пользователи порции без каждой
+    из рекомендаций выбираются подзапросом NOT EXISTS, а новые записи создаются пакетной
+    вставкой. При replace существующие рекомендации пользователей порции предварительно удаляются.
+    Счетчики обратной связи обновляются одним набором запросов на порцию.
+
+    Returns:
+        int: Количество назначенных рекомендаций
+    """
+    users = shard_queryset(User.objects.filter(**(user_filters or {})), shard_index, shard_count)
+
+    created = 0
+    last_id = 0
+    while True:
+        bounds = list(users.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not bounds:
+            break
+        chunk = users.filter(pk__gt=last_id, pk__lte=bounds[-1])
+        last_id = bounds[-1]
+
+        with transaction.atomic(), batched_feedback_changes():
+            if replace:
+                UserRecommendation.objects.filter(user__in=chunk).delete()
+            changed = set()
+            for recommendation_id in recommendation_ids:
+                missing = chunk.exclude(Exists(UserRecommendation.objects.filter(
+                    user_id=OuterRef('pk'), recommendation_id=recommendation_id
+                ))).values_list('pk', flat=True)
+                rows = [
+                    UserRecommendation(
+                        user_id=user_id,
+                        recommendation_id=recommendation_id,
+                        status='pending',
+                        reason=reason
+                    )
+                    for user_id in missing
+                ]
+                UserRecommendation.objects.bulk_create(rows, batch_size=1000)
+                record_feedback_changes((recommendation_id, None, feedback_state(row)) for row in rows)
+                changed.update(row.user_id for row in rows)
+                created += len(rows)
+
+        if replace:
+            changed.update(bounds)
+        if changed:
+            user_recommendations_changed.send(sender=UserRecommendation, user_ids=sorted(changed))
+    return created
+
+
+def assign_recommendations(recommendation_ids=None, user_filters=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                           reason=DEFAULT_ASSIGNMENT_REASON, replace=False):
+    """
+    Назначает рекомендации (по умолчанию - весь каталог) отобранным пользователям
+    (по умолчанию - всем). При workers > 1 пользователи распределяются по шардам,
+    которые обрабатываются в отдельных процессах.
+
+    Returns:
+        int: Количество назначенных рекомендаций
+    """
+    if recommendation_ids is None:
+        recommendation_ids = list(Recommendation.objects.order_by('id').values_list('id', flat=True))
+
+    return run_sharded(
+        assign_recommendations_shard,
+        workers,
+        recommendation_ids=recommendation_ids,
+        user_filters=user_filters,
+        chunk_size=chunk_size,
+        reason=reason,
+        replace=replace
+    )
@@ -0,0 +1,341 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .catalog import get_catalog
+from .models import Recommendation, RecommendationCategoryStats, RecommendationStats, UserRecommendation
+
+
+# Счетчики обратной связи (порядок столбцов в массивах снимка)
+COUNTER_FIELDS = ('shown', 'accepted', 'completed', 'rejected', 'rated', 'rating_sum')
+# Статусы, для которых ведутся счетчики (ожидающие рекомендации учитываются только в shown)
+STATUS_COUNTERS = ('accepted', 'completed', 'rejected')
+
+# Апостериорное распределение доли «сработавших» рекомендаций - Beta(alpha, beta):
+# выполнение - успех, отклонение - неудача, принятие - половина успеха, оценка 1-5
+# добавляет (оценка - 1) / 4 к успехам и остаток к неудачам. Без обратной связи
+# категория имеет распределение Beta(1, 1)
+PRIOR_SUCCESSES = 1.0
+PRIOR_FAILURES = 1.0
+ACCEPTED_REWARD = 0.5
+RATING_MIN = 1
+RATING_MAX = 5
+
+# Априорное распределение рекомендации - средняя доля ее категории с весом
+# ITEM_PRIOR_STRENGTH наблюдений: иначе среди тысяч рекомендаций без обратной связи
+# всегда нашлась бы случайно «лучшая», чем проверенная
+ITEM_PRIOR_STRENGTH = 10.0
+
+# Выборка Томпсона внутри группы ведется по ITEM_CANDIDATES рекомендациям
+# с наибольшим средним и ITEM_EXPLORATION случайным рекомендациям остальной части группы
+ITEM_CANDIDATES = 50
+ITEM_EXPLORATION = 20
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_batch = threading.local()
+
+
+def feedback_state(user_recommendation):
+    """
+    Состояние рекомендации пользователя, от которого зависят счетчики: (статус, оценка).
+    """
+    return (user_recommendation.status, user_recommendation.user_rating)
+
+
+def _counter_values(state):
+    """
+    Вклад одной рекомендации пользователя в состоянии state в счетчики (None - нет вклада).
+    """
+    values = dict.fromkeys(COUNTER_FIELDS, 0)
+    if state is None:
+        return values
+    status, rating = state
+    values['shown'] = 1
+    if status in STATUS_COUNTERS:
+        values[status] = 1
+    if rating is not None:
+        values['rated'] = 1
+        values['rating_sum'] = rating
+    return values
+
+
+def _categories(recommendation_ids):
+    """
+    Категории рекомендаций: из каталога процесса, отсутствующие в нем - одним запросом.
+    """
+    by_id = get_catalog().by_id
+    categories = {pk: by_id[pk].category for pk in recommendation_ids if pk in by_id}
+    missing = [pk for pk in recommendation_ids if pk not in categories]
+    if missing:
+        categories.update(Recommendation.objects.filter(id__in=missing).values_list('id', 'category'))
+    return categories
+
+
+def _merge(target, deltas):
+    for key, delta in deltas.items():
+        for field, value in delta.items():
+            target[key][field] += value
+
+
+def record_feedback_changes(changes, items=True):
+    """
+    Обновляет счетчики рекомендаций и категорий на разницу между прежним и новым
+    состоянием рекомендаций пользователей, без пересчета истории.
+
+    changes - кортежи (id рекомендации, прежнее состояние, новое состояние), где состояние -
+    результат feedback_state или None для созданных (прежнее) и удаленных (новое) записей.
+    При items=False обновляются только счетчики категорий (например, при удалении самих
+    рекомендаций каталога, счетчики которых удаляются каскадно).
+    """
+    item_deltas = defaultdict(lambda: defaultdict(int))
+    for recommendation_id, old, new in changes:
+        old_values = _counter_values(old)
+        for field, value in _counter_values(new).items():
+            if value != old_values[field]:
+                item_deltas[recommendation_id][field] += value - old_values[field]
+    if not item_deltas:
+        return
+
+    categories = _categories(list(item_deltas))
+    category_deltas = defaultdict(lambda: defaultdict(int))
+    for recommendation_id, delta in item_deltas.items():
+        if recommendation_id in categories:
+            _merge(category_deltas, {categories[recommendation_id]: delta})
+    if not items:
+        item_deltas = {}
+
+    batch = getattr(_batch, 'deltas', None)
+    if batch is not None:
+        _merge(batch[0], item_deltas)
+        _merge(batch[1], category_deltas)
+        return
+    _apply_deltas(RecommendationStats, 'recommendation_id', item_deltas)
+    _apply_deltas(RecommendationCategoryStats, 'category', category_deltas)
+
+
+@contextmanager
+def batched_feedback_changes():
+    """
+    Накапливает изменения счетчиков внутри блока (в том числе из сигналов сохранения
+    и удаления) и применяет их при выходе одним набором запросов.
+    При исключении накопленные изменения отбрасываются вместе с транзакцией.
+    """
+    if getattr(_batch, 'deltas', None) is not None:
+        yield
+        return
+    _batch.deltas = (defaultdict(lambda: defaultdict(int)), defaultdict(lambda: defaultdict(int)))
+    try:
+        yield
+        item_deltas, category_deltas = _batch.deltas
+    finally:
+        _batch.deltas = None
+    _apply_deltas(RecommendationStats, 'recommendation_id', item_deltas)
+    _apply_deltas(RecommendationCategoryStats, 'category', category_deltas)
+
+
+def _apply_deltas(model, key, deltas):
+    """
+    Прибавляет к счетчикам строк model изменения deltas ({ключ: {счетчик: изменение}})
+    выражениями F(): одним UPDATE на каждый набор одинаковых изменений. Отсутствующие
+    строки создаются (для рекомендаций - только существующих в каталоге).
+    """
+    groups = defaultdict(list)
+    for value, delta in deltas.items():
+        delta = tuple(sorted((field, change) for field, change in delta.items() if change))
+        if delta:
+            groups[delta].append(value)
+
+    for delta, values in groups.items():
+        updates = {field: F(field) + change for field, change in delta}
+        updated = model.objects.filter(**{f'{key}__in': values}).update(**updates)
+        if updated == len(values):
+            continue
+        existing = set(model.objects.filter(**{f'{key}__in': values}).values_list(key, flat=True))
+        missing = [value for value in values if value not in existing]
+        if model is RecommendationStats:
+            missing = list(Recommendation.objects.filter(id__in=missing).values_list('id', flat=True))
+        if missing:
+            # Строку мог одновременно создать другой процесс: конфликт игнорируется, изменение прибавляется
+            model.objects.bulk_create([model(**{key: value}) for value in missing], ignore_conflicts=True)
+            model.objects.filter(**{f'{key}__in': missing}).update(**updates)
+
+
+def reconcile_feedback_stats():
+    """
+    Пересчитывает счетчики рекомендаций и категорий по таблице рекомендаций пользователей
+    одним сгруппированным запросом и сохраняет их пакетной вставкой с обновлением.
+
+    Исправляет расхождения, накопившиеся из-за изменений в обход сохранения моделей
+    (QuerySet.update, загрузка данных в базу напрямую). Изменения, зафиксированные
+    во время пересчета, могут быть учтены неточно до следующей сверки.
+
+    Returns:
+        tuple: (количество рекомендаций, количество категорий)
+    """
+    rows = UserRecommendation.objects.order_by().values('recommendation_id').annotate(
+        shown=Count('id'),
+        accepted=Count('id', filter=Q(status='accepted')),
+        completed=Count('id', filter=Q(status='completed')),
+        rejected=Count('id', filter=Q(status='rejected')),
+        rated=Count('user_rating'),
+        rating_sum=Sum('user_rating')
+    )
+    counters = {
+        row['recommendation_id']: {field: row[field] or 0 for field in COUNTER_FIELDS}
+        for row in rows
+    }
+
+    items = []
+    by_category = {key: dict.fromkeys(COUNTER_FIELDS, 0) for key, _ in Recommendation.CATEGORY_CHOICES}
+    for recommendation_id, category in Recommendation.objects.values_list('id', 'category'):
+        values = counters.get(recommendation_id, dict.fromkeys(COUNTER_FIELDS, 0))
+        items.append(RecommendationStats(recommendation_id=recommendation_id, **values))
+        category_values = by_category.setdefault(category, dict.fromkeys(COUNTER_FIELDS, 0))
+        for field, value in values.items():
+            category_values[field] += value
+    categories = [
+        RecommendationCategoryStats(category=category, **values)
+        for category, values in by_category.items()
+    ]
+
+    with transaction.atomic():
+        RecommendationStats.objects.bulk_create(
+            items, batch_size=1000, update_conflicts=True,
+            unique_fields=['recommendation'], update_fields=list(COUNTER_FIELDS)
+        )
+        RecommendationCategoryStats.objects.bulk_create(
+            categories, update_conflicts=True,
+            unique_fields=['category'], update_fields=list(COUNTER_FIELDS)
+        )
+    return len(items), len(categories)
+
+
+def posterior(counters, prior=(PRIOR_SUCCESSES, PRIOR_FAILURES)):
+    """
+    Параметры апостериорного распределения Beta(alpha, beta) по массиву счетчиков
+    формы (..., len(COUNTER_FIELDS)) в порядке COUNTER_FIELDS и априорному
+    распределению Beta(*prior).
+    """
+    counters = np.asarray(counters, dtype=float)
+    _, accepted, completed, rejected, rated, rating_sum = np.moveaxis(counters, -1, 0)
+    rating_successes = (rating_sum - RATING_MIN * rated) / (RATING_MAX - RATING_MIN)
+    successes = completed + ACCEPTED_REWARD * accepted + rating_successes
+    failures = rejected + (1 - ACCEPTED_REWARD) * accepted + (rated - rating_successes)
+    # Счетчики могут временно разойтись с таблицей до сверки
+    return prior[0] + np.maximum(successes, 0), prior[1] + np.maximum(failures, 0)
+
+
+class BanditSnapshot:
+    """
+    Загруженные в память счетчики обратной связи всех пользователей для ранжирования
+    выборкой Томпсона. Объекты общие для всех запросов процесса и не должны изменяться.
+    """
+
+    def __init__(self, loaded_at, item_counters, category_counters):
+        self.loaded_at = loaded_at
+        # id рекомендации (категория) -> кортеж счетчиков в порядке COUNTER_FIELDS
+        self.item_counters = item_counters
+        self.category_counters = category_counters
+        self._groups = None
+        self._groups_lock = threading.Lock()
+
+    def _ordered_groups(self, catalog):
+        """
+        Рекомендации групп индекса каталога, упорядоченные по убыванию среднего
+        их распределений, и параметры распределений в том же порядке
+        (вычисляются один раз для каждой версии каталога).
+        """
+        groups = self._groups
+        if groups is not None and groups[0] == catalog.version:
+            return groups[1]
+        zero = (0,) * len(COUNTER_FIELDS)
+        ordered = {}
+        for category, index_groups in catalog.index.items():
+            category_alpha, category_beta = posterior(self.category_counters.get(category, zero))
+            mean = category_alpha / (category_alpha + category_beta)
+            prior = (ITEM_PRIOR_STRENGTH * mean, ITEM_PRIOR_STRENGTH * (1 - mean))
+            ordered[category] = {}
+            for is_quick, ids in index_groups.items():
+                counters = np.array([self.item_counters.get(pk, zero) for pk in ids], dtype=float)
+                alpha, beta = posterior(counters.reshape(len(ids), len(COUNTER_FIELDS)), prior)
+                order = np.argsort(-alpha / (alpha + beta), kind='stable')
+                ordered[category][is_quick] = (np.array(ids, dtype=np.int64)[order].tolist(), alpha[order], beta[order])
+        with self._groups_lock:
+            self._groups = (catalog.version, ordered)
+        return ordered
+
+    def sample_group(self, catalog, category, is_quick, rng, exclude, limit):
+        """
+        До limit рекомендаций группы (категория, is_quick), которых нет в exclude,
+        по убыванию выборки из их распределений.
+
+        Выборка делается не по всей группе, а по ITEM_CANDIDATES рекомендациям
+        с наибольшим средним и ITEM_EXPLORATION случайным из остальных, поэтому
+        ее стоимость не зависит от размера группы.
+        """
+        ids, alpha, beta = self._ordered_groups(catalog)[category][is_quick]
+        pool = max(limit, ITEM_CANDIDATES)
+        positions = []
+        position = 0
+        while position < len(ids) and len(positions) < pool:
+            if ids[position] not in exclude:
+                positions.append(position)
+            position += 1
+        rest = len(ids) - position
+        if rest:
+            explored = position + rng.choice(rest, size=min(rest, ITEM_EXPLORATION), replace=False)
+            positions.extend(index for index in explored.tolist() if ids[index] not in exclude)
+        if not positions:
+            return []
+        positions = np.array(positions, dtype=np.intp)
+        samples = rng.beta(alpha[positions], beta[positions])
+        order = positions[np.argsort(-samples, kind='stable')[:limit]]
+        return [ids[index] for index in order.tolist()]
+
+    def sample_categories(self, rng):
+        """
+        Оценки категорий от -1 до 1 по выборке из распределений доли сработавших рекомендаций.
+        """
+        categories = [key for key, _ in Recommendation.CATEGORY_CHOICES]
+        zero = (0,) * len(COUNTER_FIELDS)
+        alpha, beta = posterior([self.category_counters.get(category, zero) for category in categories])
+        samples = rng.beta(alpha, beta)
+        return {category: 2 * float(sample) - 1 for category, sample in zip(categories, samples)}
+
+
+def load_bandit_snapshot():
+    """
+    Загружает счетчики обратной связи из базы данных (два запроса).
+    """
+    item_counters = {
+        row[0]: row[1:]
+        for row in RecommendationStats.objects.values_list('recommendation_id', *COUNTER_FIELDS)
+    }
+    category_counters = {
+        row[0]: row[1:]
+        for row in RecommendationCategoryStats.objects.values_list('category', *COUNTER_FIELDS)
+    }
+    return BanditSnapshot(time.monotonic(), item_counters, category_counters)
+
+
+def get_bandit_snapshot():
+    """
+    Возвращает снимок счетчиков текущего процесса, перезагружая его не чаще, чем раз
+    в RECOMMENDATION_BANDIT_REFRESH_SECONDS секунд.
+    """
+    global _snapshot
+    refresh = settings.RECOMMENDATION_BANDIT_REFRESH_SECONDS
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - snapshot.loaded_at < refresh:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is None or time.monotonic() - _snapshot.loaded_at >= refresh:
+            _snapshot = load_bandit_snapshot()
+        return _snapshot
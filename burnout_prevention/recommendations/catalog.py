@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from .models import Recommendation, RecommendationType
+
+
+# Версия каталога в общем кэше; увеличивается при любом изменении рекомендаций и их типов
+CATALOG_VERSION_KEY = 'recommendations:catalog:version'
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+class RecommendationCatalog:
+    """
+    Загруженный в память каталог рекомендаций (с типами), сгруппированный по
+    категориям и типам. Объекты общие для всех запросов процесса и не должны изменяться.
+    """
+
+    def __init__(self, version, recommendations, types):
+        self.version = version
+        # Рекомендации по возрастанию id
+        self.recommendations = recommendations
+        self.types = types
+        self.by_id = {recommendation.id: recommendation for recommendation in recommendations}
+
+        by_category = defaultdict(list)
+        by_type = defaultdict(list)
+        # Индекс рекомендательной системы: категория -> {is_quick: список id}
+        index = defaultdict(lambda: {True: [], False: []})
+        for recommendation in recommendations:
+            by_category[recommendation.category].append(recommendation)
+            by_type[recommendation.type_id].append(recommendation)
+            index[recommendation.category][recommendation.is_quick].append(recommendation.id)
+        self.by_category = dict(by_category)
+        self.by_type = dict(by_type)
+        self.index = dict(index)
+
+    def filter(self, category=None, is_quick=None, type_id=None):
+        """
+        Рекомендации с указанными категорией, признаком быстрой рекомендации и типом
+        (None - без ограничения), по возрастанию id.
+        """
+        if category is not None:
+            recommendations = self.by_category.get(category, [])
+        elif type_id is not None:
+            recommendations = self.by_type.get(type_id, [])
+        else:
+            recommendations = self.recommendations
+        return [
+            recommendation for recommendation in recommendations
+            if (category is None or recommendation.category == category)
+            and (is_quick is None or recommendation.is_quick == is_quick)
+            and (type_id is None or recommendation.type_id == type_id)
+        ]
+
+
+def get_catalog_version():
+    """
+    Возвращает текущую версию каталога, создавая ее при необходимости.
+    Начальное значение - время в миллисекундах, поэтому версия, вытесненная из кэша
+    и созданная заново, не совпадет с версией, уже загруженной процессами.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1000000, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """
+    Увеличивает версию каталога: процессы перезагрузят каталог при следующем обращении.
+    """
+    get_catalog_version()
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Версия вытеснена из кэша между чтением и увеличением
+        get_catalog_version()
+
+
+def load_catalog(version):
+    """
+    Загружает каталог из базы данных (два запроса).
+    """
+    types = RecommendationType.objects.in_bulk()
+    recommendations = list(Recommendation.objects.order_by('id'))
+    for recommendation in recommendations:
+        # Тип берется из уже загруженных, без отдельного запроса
+        recommendation.type = types[recommendation.type_id]
+    return RecommendationCatalog(version, recommendations, types)
+
+
+def get_catalog():
+    """
+    Возвращает каталог рекомендаций текущего процесса, перезагружая его, только если
+    версия в общем кэше изменилась. В установившемся режиме запросов к базе данных нет.
+    """
+    global _catalog
+    version = get_catalog_version()
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+    with _catalog_lock:
+        if _catalog is None or _catalog.version != version:
+            # Версия прочитана до загрузки: изменение во время загрузки приведет к повторной
+            _catalog = load_catalog(version)
+        return _catalog
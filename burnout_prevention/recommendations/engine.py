@@ -0,0 +1,258 @@
+import heapq
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from burnout_prevention.analytics.risk_engine import calculate_burnout_risk
+from burnout_prevention.users.models import UserProfile
+from .bandit import feedback_state, get_bandit_snapshot, record_feedback_changes
+from .catalog import get_catalog
+from .models import Recommendation, UserRecommendation
+from .signals import user_recommendations_changed
+
+
+# Связь факторов риска выгорания с категориями каталога рекомендаций:
+# фактор -> (описание для поля reason, {категория: вес})
+FACTOR_CATEGORIES = {
+    'overtime': ('переработки', {'work_balance': 1.0, 'rest': 0.5}),
+    'workday_duration': ('длинный рабочий день', {'work_balance': 1.0, 'rest': 0.5}),
+    'stress': ('высокий уровень стресса', {'mindfulness': 1.0, 'exercise': 0.5, 'social': 0.3}),
+    'stress_anomalies': ('резкие скачки стресса', {'mindfulness': 1.0, 'rest': 0.5}),
+    'sleep_quality': ('низкое качество сна', {'sleep': 1.0, 'mindfulness': 0.3}),
+    'sleep_deprivation': ('недосып', {'sleep': 1.0, 'rest': 0.5}),
+}
+
+# Факторы, при которых предпочтительны быстрые рекомендации (мало свободного времени)
+BUSY_FACTORS = ('overtime', 'workday_duration')
+
+# Надбавки к оценке категории: предпочтение пользователя и быстрая рекомендация
+# (QUICK_BONUS - без признаков нехватки времени, BUSY_QUICK_BONUS - при переработках)
+PREFERENCE_BONUS = 1.0
+QUICK_BONUS = 0.1
+BUSY_QUICK_BONUS = 0.5
+
+# Обратная связь по рекомендациям категории: вклад статусов, вес оценки 1-5
+# (3 - нейтральная) и число «нейтральных» рекомендаций, сглаживающее малые выборки
+FEEDBACK_STATUS_SCORES = {'pending': 0.0, 'accepted': 0.5, 'completed': 1.0, 'rejected': -1.0}
+FEEDBACK_RATING_SCALE = 2.0
+FEEDBACK_PRIOR = 2
+FEEDBACK_WEIGHT = 1.0
+
+# Вес оценки категории по обратной связи всех пользователей (выборка Томпсона, от -1 до 1)
+POPULATION_WEIGHT = 0.5
+
+# Снижение оценки категории за каждую уже выбранную из нее рекомендацию,
+# чтобы подборка не состояла из одной категории
+DIVERSITY_PENALTY = 0.3
+
+DEFAULT_RECOMMENDATIONS_COUNT = 5
+MAX_RECOMMENDATIONS_COUNT = 20
+
+
+def preferred_categories(user):
+    """
+    Категории каталога, указанные в предпочитаемых методах релаксации пользователя
+    (ключ категории или ее название, без учета регистра).
+    """
+    methods = UserProfile.objects.filter(user=user).values_list(
+        'preferred_relaxation_methods', flat=True
+    ).first() or []
+    names = {str(method).strip().lower() for method in methods if method}
+    return {
+        key for key, label in Recommendation.CATEGORY_CHOICES
+        if key in names or str(label).lower() in names
+    }
+
+
+def category_feedback(user):
+    """
+    Оценка прошлой обратной связи пользователя по категориям от -1 до 1
+    одним сгруппированным запросом по статусам.
+
+    Returns:
+        dict: категория -> оценка
+    """
+    rows = UserRecommendation.objects.filter(user=user).order_by().values(
+        'recommendation__category', 'status'
+    ).annotate(
+        count=Count('id'),
+        rated=Count('user_rating'),
+        rating_sum=Sum('user_rating')
+    )
+
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    for row in rows:
+        category = row['recommendation__category']
+        totals[category] += FEEDBACK_STATUS_SCORES.get(row['status'], 0.0) * row['count']
+        if row['rated']:
+            totals[category] += (row['rating_sum'] - 3 * row['rated']) / FEEDBACK_RATING_SCALE
+        counts[category] += row['count']
+    return {
+        category: max(-1.0, min(1.0, totals[category] / (counts[category] + FEEDBACK_PRIOR)))
+        for category in counts
+    }
+
+
+def category_relevance(factors):
+    """
+    Релевантность категорий по баллам факторов риска (баллы * вес фактора * вес категории).
+
+    factors - факторы из calculate_burnout_risk: {название: {'value', 'weight'}}.
+
+    Returns:
+        tuple: (категория -> релевантность, категория -> фактор с наибольшим вкладом)
+    """
+    relevance = defaultdict(float)
+    top_factor = {}
+    top_contribution = {}
+    for name, factor in factors.items():
+        if name not in FACTOR_CATEGORIES or factor['value'] <= 0:
+            continue
+        for category, affinity in FACTOR_CATEGORIES[name][1].items():
+            contribution = factor['value'] * factor['weight'] * affinity
+            relevance[category] += contribution
+            if contribution > top_contribution.get(category, 0):
+                top_contribution[category] = contribution
+                top_factor[category] = name
+    return dict(relevance), top_factor
+
+
+def rank_recommendations(index, factors, preferences=(), feedback=None, exclude=(), count=DEFAULT_RECOMMENDATIONS_COUNT,
+                         population=None, candidates=None):
+    """
+    Выбирает count рекомендаций каталога с наибольшей оценкой.
+
+    Оценка одинакова для всех рекомендаций группы (категория, is_quick), поэтому
+    ранжируются группы индекса, а не весь каталог: группы хранятся в куче, из лучшей
+    группы берется следующая рекомендация, которой нет в exclude, после чего оценка
+    категории снижается на DIVERSITY_PENALTY. Время выбора не зависит от размера каталога.
+    Рекомендации группы берутся в порядке индекса.
+
+    population - оценки категорий по обратной связи всех пользователей (от -1 до 1).
+    candidates - функция (категория, is_quick) -> список id, заменяющая порядок индекса;
+    вызывается только для групп, из которых берутся рекомендации, при первом выборе.
+
+    Returns:
+        list: Кортежи (id рекомендации, категория, оценка), по убыванию оценки
+    """
+    feedback = feedback or {}
+    population = population or {}
+    exclude = set(exclude)
+    relevance, _ = category_relevance(factors)
+    busy = any(factors.get(name, {}).get('value', 0) > 0 for name in BUSY_FACTORS)
+    quick_bonus = BUSY_QUICK_BONUS if busy else QUICK_BONUS
+
+    heap = []
+    for category, groups in index.items():
+        base = (
+            relevance.get(category, 0.0)
+            + (PREFERENCE_BONUS if category in preferences else 0.0)
+            + FEEDBACK_WEIGHT * feedback.get(category, 0.0)
+            + POPULATION_WEIGHT * population.get(category, 0.0)
+        )
+        for is_quick, ids in groups.items():
+            if ids:
+                score = base + (quick_bonus if is_quick else 0.0)
+                # При равной оценке быстрые рекомендации раньше
+                heap.append((-score, not is_quick, category, 0, score, ids))
+    heapq.heapify(heap)
+
+    picked = []
+    taken = defaultdict(int)
+    sampled = set()
+    while heap and len(picked) < count:
+        neg_key, slow, category, position, score, ids = heapq.heappop(heap)
+        # Ключ в куче - оценка без штрафов, начисленных после помещения группы в кучу
+        current = score - DIVERSITY_PENALTY * taken[category]
+        if current < -neg_key:
+            heapq.heappush(heap, (-current, slow, category, position, score, ids))
+            continue
+        if candidates is not None and (category, slow) not in sampled:
+            sampled.add((category, slow))
+            ids = candidates(category, not slow)
+        while position < len(ids) and ids[position] in exclude:
+            position += 1
+        if position == len(ids):
+            continue
+        picked.append((ids[position], category, current))
+        taken[category] += 1
+        if position + 1 < len(ids):
+            heapq.heappush(heap, (-current, slow, category, position + 1, score, ids))
+    return picked
+
+
+def _reason(category, top_factor, preferences):
+    """
+    Пояснение для поля reason рекомендации пользователя.
+    """
+    reasons = []
+    if category in top_factor:
+        reasons.append(FACTOR_CATEGORIES[top_factor[category]][0])
+    if category in preferences:
+        reasons.append('предпочитаемый метод релаксации')
+    if not reasons:
+        return 'Подобрано рекомендательной системой'
+    return 'Подобрано с учетом: ' + ', '.join(reasons)
+
+
+def recommend_for_user(user, count=DEFAULT_RECOMMENDATIONS_COUNT, catalog=None, rng=None):
+    """
+    Подбирает пользователю count новых рекомендаций каталога по текущим факторам
+    риска выгорания, предпочитаемым методам релаксации и обратной связи по прошлым
+    рекомендациям и сохраняет их одной пакетной вставкой.
+    Уже назначенные пользователю рекомендации не повторяются.
+
+    Обратная связь всех пользователей учитывается выборкой Томпсона: категории получают
+    надбавку по выборке из распределения доли сработавших рекомендаций, а внутри групп,
+    из которых берутся рекомендации, лучшие и несколько случайных рекомендаций
+    упорядочиваются по выборке из их собственных распределений. Так чаще
+    предлагаются рекомендации, которые выполняют и высоко оценивают, а новые и редко
+    предлагавшиеся рекомендации тоже получают шанс.
+
+    Returns:
+        list: Созданные объекты UserRecommendation (с загруженными рекомендациями),
+              по убыванию оценки
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    factors = calculate_burnout_risk(user)['factors']
+    preferences = preferred_categories(user)
+    existing = set(UserRecommendation.objects.filter(user=user).values_list('recommendation_id', flat=True))
+
+    if rng is None:
+        rng = np.random.default_rng()
+    snapshot = get_bandit_snapshot()
+    picked = rank_recommendations(
+        catalog.index,
+        factors,
+        preferences=preferences,
+        feedback=category_feedback(user),
+        exclude=existing,
+        count=count,
+        population=snapshot.sample_categories(rng),
+        candidates=lambda category, is_quick: snapshot.sample_group(catalog, category, is_quick, rng, existing, count)
+    )
+    if not picked:
+        return []
+
+    _, top_factor = category_relevance(factors)
+    user_recommendations = [
+        UserRecommendation(
+            user=user,
+            recommendation=catalog.by_id[recommendation_id],
+            status='pending',
+            reason=_reason(category, top_factor, preferences)
+        )
+        for recommendation_id, category, _ in picked
+    ]
+    with transaction.atomic():
+        created = UserRecommendation.objects.bulk_create(user_recommendations)
+        record_feedback_changes(
+            (user_recommendation.recommendation_id, None, feedback_state(user_recommendation))
+            for user_recommendation in created
+        )
+    user_recommendations_changed.send(sender=UserRecommendation, user_ids=[user.id])
+    return created
@@ -1,43 +1,89 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.exceptions import FieldError, ValidationError
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
-from burnout_prevention.recommendations.models import Recommendation, UserRecommendation
+from burnout_prevention.recommendations.assignment import (
+    DEFAULT_ASSIGNMENT_REASON,
+    DEFAULT_CHUNK_SIZE,
+    assign_recommendations,
+    parse_user_filter
+)
+from burnout_prevention.recommendations.models import Recommendation
 
 User = get_user_model()
 
 class Command(BaseCommand):
-    help = 'Назначает рекомендации указанному пользователю'
+    help = (
+        'Назначает рекомендации пользователю с указанным email, всем пользователям (--all) '
+        'или пользователям, отобранным выражением --filter. Существующие рекомендации '
+        'отобранных пользователей предварительно удаляются; с --keep-existing они сохраняются '
+        'и назначаются только недостающие рекомендации.'
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument('email', type=str, help='Email пользователя, которому назначаются рекомендации')
+        parser.add_argument('email', type=str, nargs='?', help='Email пользователя, которому назначаются рекомендации')
+        parser.add_argument('--all', action='store_true', help='Назначить рекомендации всем пользователям')
+        parser.add_argument(
+            '--filter',
+            type=str,
+            help='Условия отбора пользователей через запятую, например "is_active=true,date_joined__gte=2024-01-01"'
+        )
+        parser.add_argument(
+            '--recommendation',
+            type=int,
+            action='append',
+            help='ID рекомендации (можно указать несколько раз; по умолчанию весь каталог)'
+        )
+        parser.add_argument(
+            '--keep-existing',
+            action='store_true',
+            help='Не удалять существующие рекомендации отобранных пользователей, назначить только недостающие'
+        )
+        parser.add_argument('--reason', type=str, default=DEFAULT_ASSIGNMENT_REASON, help='Причина назначения')
+        parser.add_argument('--workers', type=int, default=1, help='Количество процессов для параллельного назначения')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Количество пользователей в порции')
 
     def handle(self, *args, **options):
         email = options['email']
-        
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f'Пользователь с email {email} не найден!'))
-            return
-            
-        # Получаем все рекомендации
-        recommendations = Recommendation.objects.all()
-        
-        if not recommendations.exists():
+        if sum(bool(option) for option in (email, options['all'], options['filter'])) != 1:
+            raise CommandError('Укажите ровно одно из: email пользователя, --all или --filter')
+
+        if email:
+            if not User.objects.filter(email=email).exists():
+                self.stdout.write(self.style.ERROR(f'Пользователь с email {email} не найден!'))
+                return
+            user_filters = {'email': email}
+        else:
+            try:
+                user_filters = parse_user_filter(options['filter'])
+                User.objects.filter(**user_filters).exists()
+            except (ValueError, FieldError, ValidationError) as e:
+                raise CommandError(f'Неверное выражение отбора пользователей: {e}')
+
+        recommendation_ids = options['recommendation']
+        if recommendation_ids:
+            missing = set(recommendation_ids) - set(
+                Recommendation.objects.filter(id__in=recommendation_ids).values_list('id', flat=True)
+            )
+            if missing:
+                raise CommandError(f'Рекомендации не найдены: {", ".join(map(str, sorted(missing)))}')
+        elif not Recommendation.objects.exists():
             self.stdout.write(self.style.ERROR('В базе данных нет рекомендаций! Сначала создайте их с помощью команды create_test_data.'))
             return
-            
-        # Удаляем существующие рекомендации пользователя (опционально)
-        UserRecommendation.objects.filter(user=user).delete()
-        
-        # Назначаем все рекомендации пользователю
-        count = 0
-        for recommendation in recommendations:
-            UserRecommendation.objects.create(
-                user=user,
-                recommendation=recommendation,
-                status='pending',
-                reason='Автоматически назначено системой для тестирования'
-            )
-            count += 1
-            
-        self.stdout.write(self.style.SUCCESS(f'Успешно назначено {count} рекомендаций пользователю {user.email}!')) 
\ No newline at end of file
+
+        started = time.perf_counter()
+        count = assign_recommendations(
+            recommendation_ids,
+            user_filters,
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            reason=options['reason'],
+            replace=not options['keep_existing']
+        )
+        elapsed = time.perf_counter() - started
+
+        target = f'пользователю {email}' if email else 'отобранным пользователям'
+        self.stdout.write(self.style.SUCCESS(
+            f'Успешно назначено {count} рекомендаций {target} за {elapsed:.2f} с!'
+        ))
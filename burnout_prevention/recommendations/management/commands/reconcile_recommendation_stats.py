@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+from burnout_prevention.recommendations.bandit import reconcile_feedback_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счетчики обратной связи по рекомендациям и категориям '
+        'по таблице рекомендаций пользователей.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        recommendations, categories = reconcile_feedback_stats()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитаны счетчики {recommendations} рекомендаций и {categories} категорий за {elapsed:.2f} с!'
+        ))
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.10 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['category'], name='recommendation_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userrecommendation',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='user_rec_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userrecommendation',
+            index=models.Index(fields=['user', 'status', '-created_at', '-id'], name='user_rec_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.10 on 2026-10-18 09:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0002_user_recommendation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationCategoryStats',
+            fields=[
+                ('shown', models.IntegerField(default=0, verbose_name='предложено')),
+                ('accepted', models.IntegerField(default=0, verbose_name='принято')),
+                ('completed', models.IntegerField(default=0, verbose_name='выполнено')),
+                ('rejected', models.IntegerField(default=0, verbose_name='отклонено')),
+                ('rated', models.IntegerField(default=0, verbose_name='оценено')),
+                ('rating_sum', models.IntegerField(default=0, verbose_name='сумма оценок')),
+                ('category', models.CharField(choices=[('rest', 'Отдых'), ('sleep', 'Сон'), ('exercise', 'Физическая активность'), ('mindfulness', 'Осознанность'), ('social', 'Социальная активность'), ('work_balance', 'Баланс работы')], max_length=50, primary_key=True, serialize=False, verbose_name='категория')),
+            ],
+            options={
+                'verbose_name': 'статистика категории рекомендаций',
+                'verbose_name_plural': 'статистика категорий рекомендаций',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecommendationStats',
+            fields=[
+                ('shown', models.IntegerField(default=0, verbose_name='предложено')),
+                ('accepted', models.IntegerField(default=0, verbose_name='принято')),
+                ('completed', models.IntegerField(default=0, verbose_name='выполнено')),
+                ('rejected', models.IntegerField(default=0, verbose_name='отклонено')),
+                ('rated', models.IntegerField(default=0, verbose_name='оценено')),
+                ('rating_sum', models.IntegerField(default=0, verbose_name='сумма оценок')),
+                ('recommendation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='recommendations.recommendation', verbose_name='рекомендация')),
+            ],
+            options={
+                'verbose_name': 'статистика рекомендации',
+                'verbose_name_plural': 'статистика рекомендаций',
+            },
+        ),
+    ]
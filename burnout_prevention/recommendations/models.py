@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from burnout_prevention.users.models import User
 
@@ -62,6 +63,9 @@ class Recommendation(models.Model):
     class Meta:
         verbose_name = _('рекомендация')
         verbose_name_plural = _('рекомендации')
+        indexes = [
+            models.Index(fields=['category'], name='recommendation_category_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -117,6 +121,83 @@ class UserRecommendation(models.Model):
         verbose_name = _('рекомендация пользователя')
         verbose_name_plural = _('рекомендации пользователей')
         ordering = ['-created_at']
+        indexes = [
+            # Список рекомендаций пользователя (с фильтром по статусу) по убыванию даты
+            models.Index(fields=['user', '-created_at', '-id'], name='user_rec_user_created_idx'),
+            models.Index(fields=['user', 'status', '-created_at', '-id'], name='user_rec_status_created_idx'),
+        ]
         
     def __str__(self):
-        return f"{self.user.email} - {self.recommendation.title} ({self.get_status_display()})" 
\ No newline at end of file
+        return f"{self.user.email} - {self.recommendation.title} ({self.get_status_display()})" 
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Статус и оценка на момент загрузки: по ним счетчики обратной связи
+        # обновляются на разницу при сохранении, без пересчета истории
+        if 'status' in field_names and 'user_rating' in field_names:
+            instance._loaded_feedback = (instance.status, instance.user_rating)
+        return instance
+    
+    def set_completed_at(self):
+        """
+        Устанавливает дату выполнения текущим временем, если рекомендация выполнена,
+        а дата выполнения не указана.
+        """
+        if self.status == 'completed' and self.completed_at is None:
+            self.completed_at = timezone.now()
+
+
+class FeedbackCounters(models.Model):
+    """
+    Счетчики обратной связи по рекомендациям пользователей: сколько раз рекомендация
+    предложена и сколько рекомендаций сейчас принято, выполнено, отклонено и оценено.
+    """
+    shown = models.IntegerField(_('предложено'), default=0)
+    accepted = models.IntegerField(_('принято'), default=0)
+    completed = models.IntegerField(_('выполнено'), default=0)
+    rejected = models.IntegerField(_('отклонено'), default=0)
+    rated = models.IntegerField(_('оценено'), default=0)
+    rating_sum = models.IntegerField(_('сумма оценок'), default=0)
+
+    class Meta:
+        abstract = True
+
+
+class RecommendationStats(FeedbackCounters):
+    """
+    Счетчики обратной связи по рекомендации каталога.
+    """
+    recommendation = models.OneToOneField(
+        Recommendation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name=_('рекомендация')
+    )
+
+    class Meta:
+        verbose_name = _('статистика рекомендации')
+        verbose_name_plural = _('статистика рекомендаций')
+
+    def __str__(self):
+        return f"{self.recommendation_id}: {self.completed}/{self.shown}"
+
+
+class RecommendationCategoryStats(FeedbackCounters):
+    """
+    Счетчики обратной связи по категории рекомендаций.
+    """
+    category = models.CharField(
+        _('категория'),
+        max_length=50,
+        choices=Recommendation.CATEGORY_CHOICES,
+        primary_key=True
+    )
+
+    class Meta:
+        verbose_name = _('статистика категории рекомендаций')
+        verbose_name_plural = _('статистика категорий рекомендаций')
+
+    def __str__(self):
+        return f"{self.category}: {self.completed}/{self.shown}"
@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver, Signal
+
+from .bandit import feedback_state, record_feedback_changes
+from .catalog import bump_catalog_version
+from .models import Recommendation, RecommendationType, UserRecommendation
+
+
+# Отправляется после пакетного создания, изменения или удаления рекомендаций пользователей,
+# для которых не вызываются post_save (аргумент user_ids - список id пользователей)
+user_recommendations_changed = Signal()
+
+
+@receiver(post_save, sender=Recommendation)
+@receiver(post_save, sender=RecommendationType)
+@receiver(post_delete, sender=Recommendation)
+@receiver(post_delete, sender=RecommendationType)
+def invalidate_catalog_on_change(sender, instance, **kwargs):
+    """
+    Увеличивает версию каталога рекомендаций после фиксации транзакции, чтобы
+    процессы не загрузили до фиксации старые данные под новой версией.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=UserRecommendation)
+def update_feedback_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Обновляет счетчики обратной связи на разницу между состоянием рекомендации
+    пользователя при загрузке и после сохранения.
+    """
+    if raw:
+        return
+    if created:
+        old = None
+    elif hasattr(instance, '_loaded_feedback'):
+        old = instance._loaded_feedback
+    else:
+        # Прежнее состояние неизвестно: расхождение исправит периодическая сверка
+        return
+    new = feedback_state(instance)
+    record_feedback_changes([(instance.recommendation_id, old, new)])
+    instance._loaded_feedback = new
+
+
+@receiver(post_delete, sender=UserRecommendation)
+def update_feedback_stats_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Исключает удаленную рекомендацию пользователя из счетчиков обратной связи.
+    При удалении рекомендаций каталога (и их типов) их счетчики удаляются каскадно,
+    поэтому обновляются только счетчики категорий.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    record_feedback_changes(
+        [(instance.recommendation_id, feedback_state(instance), None)],
+        items=origin_model not in (Recommendation, RecommendationType)
+    )
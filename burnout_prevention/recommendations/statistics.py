@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from django.db.models import Count
+
+from .models import Recommendation
+
+
+# Поля статистики страницы рекомендаций (RecommendationsStats) для статусов рекомендаций пользователя
+STATS_STATUS_FIELDS = {
+    'completed': 'completed',
+    'accepted': 'inProgress',
+    'pending': 'new',
+    'rejected': 'skipped',
+}
+
+
+def parse_stats_params(params):
+    """
+    Разбирает необязательные параметры статистики рекомендаций: category
+    и start_date, end_date (YYYY-MM-DD, по дате назначения рекомендации).
+
+    Raises:
+        ValueError: Неизвестная категория или неверный формат даты
+
+    Returns:
+        tuple: (category, start_date, end_date); отсутствующие параметры - None
+    """
+    category = params.get('category') or None
+    categories = dict(Recommendation.CATEGORY_CHOICES)
+    if category is not None and category not in categories:
+        raise ValueError(f"Invalid category. Use {', '.join(categories)}")
+
+    start_date_str = params.get('start_date')
+    end_date_str = params.get('end_date')
+    try:
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else None
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    return category, start_date, end_date
+
+
+def recommendation_stats(queryset, category=None, start_date=None, end_date=None):
+    """
+    Считает рекомендации пользователя по статусам и процент выполнения
+    одним сгруппированным запросом.
+
+    Returns:
+        dict: {'total', 'completed', 'inProgress', 'new', 'skipped', 'completionRate'}
+    """
+    if category is not None:
+        queryset = queryset.filter(recommendation__category=category)
+    if start_date is not None:
+        queryset = queryset.filter(created_at__date__gte=start_date)
+    if end_date is not None:
+        queryset = queryset.filter(created_at__date__lte=end_date)
+
+    counts = dict(
+        queryset.order_by().values('status').annotate(count=Count('id')).values_list('status', 'count')
+    )
+    total = sum(counts.values())
+    stats = {'total': total}
+    for status, field in STATS_STATUS_FIELDS.items():
+        stats[field] = counts.get(status, 0)
+    stats['completionRate'] = round(stats['completed'] * 100 / total) if total else 0
+    return stats
@@ -0,0 +1,12 @@
+from celery import shared_task
+
+from .bandit import reconcile_feedback_stats
+
+
+@shared_task
+def reconcile_recommendation_stats():
+    """
+    Ночная задача: пересчитывает счетчики обратной связи по рекомендациям и категориям
+    по таблице рекомендаций пользователей.
+    """
+    return reconcile_feedback_stats()
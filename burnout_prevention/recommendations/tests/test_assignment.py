@@ -0,0 +1,120 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from burnout_prevention.analytics.sharding import run_sharded, shard_queryset
+from burnout_prevention.recommendations.assignment import (
+    assign_recommendations, assign_recommendations_shard, parse_user_filter
+)
+from burnout_prevention.recommendations.models import Recommendation, RecommendationType, UserRecommendation
+from burnout_prevention.users.models import User
+
+
+class AssignmentTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        recommendation_type = RecommendationType.objects.create(name='Общие', description='-')
+        self.recommendations = [
+            Recommendation.objects.create(type=recommendation_type, title=f'Рекомендация {index}', description='-')
+            for index in range(3)
+        ]
+        self.users = [
+            User.objects.create_user(
+                email=f'cohort{index}@example.com', username=f'cohort{index}', is_active=index != 4
+            )
+            for index in range(7)
+        ]
+        self.existing = UserRecommendation.objects.create(
+            user=self.users[0], recommendation=self.recommendations[0], status='completed'
+        )
+
+    def assignments(self):
+        return set(UserRecommendation.objects.values_list('user_id', 'recommendation_id'))
+
+
+class AssignRecommendationsTests(AssignmentTestCase):
+    """
+    Назначение рекомендаций группам пользователей порциями и по шардам.
+    """
+
+    def test_existing_rows_are_skipped(self):
+        created = assign_recommendations(chunk_size=2)
+
+        self.assertEqual(created, 7 * 3 - 1)
+        self.assertEqual(len(self.assignments()), 7 * 3)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.status, 'completed')
+        # Повторный запуск ничего не создает
+        self.assertEqual(assign_recommendations(chunk_size=2), 0)
+
+    def test_replace(self):
+        created = assign_recommendations([self.recommendations[0].id], {'email': self.users[0].email}, replace=True)
+
+        self.assertEqual(created, 1)
+        self.assertFalse(UserRecommendation.objects.filter(pk=self.existing.pk).exists())
+        self.assertEqual(UserRecommendation.objects.get(user=self.users[0]).status, 'pending')
+
+    def test_shards_partition_users(self):
+        created = [
+            assign_recommendations_shard(
+                [self.recommendations[1].id], {'is_active': True}, shard_index, 3, chunk_size=1
+            )
+            for shard_index in range(3)
+        ]
+
+        self.assertTrue(all(created))
+        self.assertEqual(sum(created), 6)
+        self.assertEqual(
+            {user_id for user_id, recommendation_id in self.assignments() if recommendation_id == self.recommendations[1].id},
+            {user.id for user in self.users if user.is_active}
+        )
+
+    def test_sharding_helpers(self):
+        users = User.objects.all()
+        shards = [set(shard_queryset(users, index, 3).values_list('id', flat=True)) for index in range(3)]
+        self.assertEqual(set().union(*shards), {user.id for user in self.users})
+        self.assertEqual(sum(map(len, shards)), len(self.users))
+        self.assertIs(shard_queryset(users, 0, 1), users)
+
+        calls = []
+        result = run_sharded(lambda **kwargs: calls.append(kwargs) or 5, workers=1, chunk_size=10)
+        self.assertEqual((result, calls), (5, [{'shard_index': 0, 'shard_count': 1, 'chunk_size': 10}]))
+
+    def test_parse_user_filter(self):
+        self.assertEqual(
+            parse_user_filter('is_active=true, date_joined__gte=2024-01-01,'),
+            {'is_active': True, 'date_joined__gte': '2024-01-01'}
+        )
+        with self.assertRaises(ValueError):
+            parse_user_filter('is_active')
+
+
+class AssignRecommendationsCommandTests(AssignmentTestCase):
+    """
+    Команда assign_recommendations: по умолчанию существующие рекомендации
+    отобранных пользователей удаляются, с --keep-existing - сохраняются.
+    """
+
+    def call(self, *args):
+        call_command('assign_recommendations', *args, stdout=StringIO())
+
+    def test_existing_rows_are_deleted_by_default(self):
+        self.call(self.users[0].email)
+
+        self.assertFalse(UserRecommendation.objects.filter(pk=self.existing.pk).exists())
+        self.assertEqual(UserRecommendation.objects.filter(user=self.users[0], status='pending').count(), 3)
+        self.assertEqual(UserRecommendation.objects.count(), 3)
+
+    def test_keep_existing(self):
+        self.call('--filter', 'is_active=true', '--keep-existing', '--recommendation', str(self.recommendations[0].id))
+
+        self.assertTrue(UserRecommendation.objects.filter(pk=self.existing.pk, status='completed').exists())
+        self.assertEqual(UserRecommendation.objects.count(), 6)
+
+    def test_invalid_arguments(self):
+        for args in ([], [self.users[0].email, '--all'], ['--filter', 'is_active'], ['--all', '--recommendation', '0']):
+            with self.subTest(args=args), self.assertRaises(CommandError):
+                self.call(*args)
@@ -0,0 +1,173 @@
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from burnout_prevention.recommendations import bandit
+from burnout_prevention.recommendations.catalog import bump_catalog_version, get_catalog
+from burnout_prevention.recommendations.engine import rank_recommendations, recommend_for_user
+from burnout_prevention.recommendations.models import (
+    Recommendation, RecommendationCategoryStats, RecommendationStats, RecommendationType, UserRecommendation
+)
+from burnout_prevention.users.models import User
+
+
+def counters(model, **lookup):
+    """
+    Счетчики строки model в порядке COUNTER_FIELDS (нули, если строки нет).
+    """
+    row = model.objects.filter(**lookup).values_list(*bandit.COUNTER_FIELDS).first()
+    return row or (0,) * len(bandit.COUNTER_FIELDS)
+
+
+def all_counters():
+    """
+    Ненулевые счетчики всех рекомендаций и категорий.
+    """
+    return tuple(
+        {row[0]: row[1:] for row in model.objects.values_list(key, *bandit.COUNTER_FIELDS) if any(row[1:])}
+        for model, key in ((RecommendationStats, 'recommendation_id'), (RecommendationCategoryStats, 'category'))
+    )
+
+
+class BanditTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.type = RecommendationType.objects.create(name='Сон', description='Сон')
+        self.users = [
+            User.objects.create_user(email=f'user{index}@example.com', username=f'user{index}', password='password')
+            for index in range(10)
+        ]
+
+    def create_recommendations(self, count, category='sleep', is_quick=False):
+        recommendations = Recommendation.objects.bulk_create([
+            Recommendation(
+                type=self.type, title=f'{category} {index}', description='-', category=category, is_quick=is_quick
+            )
+            for index in range(count)
+        ])
+        bump_catalog_version()
+        return recommendations
+
+
+class FeedbackCountersTests(BanditTestCase):
+    """
+    Счетчики обратной связи обновляются при сохранении, изменении и удалении
+    рекомендаций пользователей и совпадают с полным пересчетом.
+    """
+
+    def test_posterior_follows_save_change_and_delete(self):
+        recommendation, = self.create_recommendations(1)
+
+        def item_posterior():
+            return bandit.posterior(counters(RecommendationStats, recommendation=recommendation))
+
+        user_recommendation = UserRecommendation.objects.create(user=self.users[0], recommendation=recommendation)
+        self.assertEqual(counters(RecommendationStats, recommendation=recommendation), (1, 0, 0, 0, 0, 0))
+        self.assertEqual(item_posterior(), (1.0, 1.0))
+
+        user_recommendation.status = 'completed'
+        user_recommendation.user_rating = 5
+        user_recommendation.save()
+        self.assertEqual(counters(RecommendationStats, recommendation=recommendation), (1, 0, 1, 0, 1, 5))
+        self.assertEqual(counters(RecommendationCategoryStats, category='sleep'), (1, 0, 1, 0, 1, 5))
+        self.assertEqual(item_posterior(), (3.0, 1.0))
+
+        user_recommendation.status = 'rejected'
+        user_recommendation.user_rating = 1
+        user_recommendation.save()
+        self.assertEqual(counters(RecommendationStats, recommendation=recommendation), (1, 0, 0, 1, 1, 1))
+        self.assertEqual(item_posterior(), (1.0, 3.0))
+
+        user_recommendation.delete()
+        self.assertEqual(counters(RecommendationStats, recommendation=recommendation), (0,) * 6)
+        self.assertEqual(counters(RecommendationCategoryStats, category='sleep'), (0,) * 6)
+        self.assertEqual(item_posterior(), (1.0, 1.0))
+
+    def test_reconcile_matches_incremental_deltas(self):
+        recommendations = self.create_recommendations(4) + self.create_recommendations(3, category='rest')
+        states = [('pending', None), ('accepted', None), ('completed', 4), ('rejected', 2), ('completed', None)]
+        created = []
+        for index, user in enumerate(self.users):
+            for offset, recommendation in enumerate(recommendations[index % 3::2]):
+                status, rating = states[(index + offset) % len(states)]
+                created.append(UserRecommendation.objects.create(
+                    user=user, recommendation=recommendation, status=status, user_rating=rating
+                ))
+        for user_recommendation in created[::3]:
+            user_recommendation.status = 'completed'
+            user_recommendation.user_rating = 5
+            user_recommendation.save()
+        for user_recommendation in created[1::4]:
+            user_recommendation.delete()
+        self.users[-1].delete()
+
+        incremental = all_counters()
+        self.assertTrue(incremental[0])
+        self.assertEqual(bandit.reconcile_feedback_stats(), (7, 6))
+        self.assertEqual(all_counters(), incremental)
+
+
+class ThompsonSamplingTests(BanditTestCase):
+    """
+    Ранжирование выборкой Томпсона по счетчикам обратной связи всех пользователей.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.recommendations = self.create_recommendations(30)
+        self.good, self.bad = self.recommendations[17], self.recommendations[3]
+        for user in self.users:
+            UserRecommendation.objects.create(user=user, recommendation=self.good, status='completed', user_rating=5)
+            UserRecommendation.objects.create(user=user, recommendation=self.bad, status='rejected', user_rating=1)
+
+    def test_positively_rated_items_rank_first(self):
+        snapshot = bandit.load_bandit_snapshot()
+        rng = np.random.default_rng(0)
+        samples = [snapshot.sample_group(get_catalog(), 'sleep', False, rng, set(), 5) for _ in range(200)]
+
+        # Чаще, чем все остальные рекомендации группы вместе
+        self.assertGreater(sum(ids[0] == self.good.id for ids in samples), len(samples) / 2)
+        self.assertFalse(any(self.bad.id in ids for ids in samples))
+
+    @override_settings(RECOMMENDATION_BANDIT_REFRESH_SECONDS=0)
+    def test_recommend_for_user_picks_positively_rated_item(self):
+        user = User.objects.create_user(email='new@example.com', username='new', password='password')
+
+        created = recommend_for_user(user, count=3, rng=np.random.default_rng(0))
+
+        ids = [user_recommendation.recommendation_id for user_recommendation in created]
+        self.assertEqual(ids[0], self.good.id)
+        self.assertNotIn(self.bad.id, ids)
+
+    def test_draws_are_capped_per_group(self):
+        self.create_recommendations(500, category='rest')
+        snapshot = bandit.load_bandit_snapshot()
+        rng = mock.Mock(wraps=np.random.default_rng(0))
+        exclude = {recommendation.id for recommendation in self.recommendations[:20]}
+
+        ids = snapshot.sample_group(get_catalog(), 'rest', False, rng, exclude, 5)
+        self.assertEqual(len(ids), 5)
+        ids = snapshot.sample_group(get_catalog(), 'sleep', False, rng, exclude, 20)
+        self.assertEqual(len(ids), 10)
+        self.assertFalse(exclude & set(ids))
+
+        sizes = [len(call.args[0]) for call in rng.beta.call_args_list]
+        self.assertEqual(sizes, [bandit.ITEM_CANDIDATES + bandit.ITEM_EXPLORATION, 10])
+
+    def test_only_selected_groups_are_sampled(self):
+        index = {'sleep': {False: [1, 2, 3]}, 'rest': {False: [4], True: [5]}, 'social': {False: [6]}}
+        sampled = []
+
+        def candidates(category, is_quick):
+            sampled.append((category, is_quick))
+            return list(reversed(index[category][is_quick]))
+
+        picked = rank_recommendations(
+            index, {}, preferences={'sleep'}, exclude={3}, count=2, candidates=candidates
+        )
+
+        self.assertEqual([pk for pk, _, _ in picked], [2, 1])
+        self.assertEqual(sampled, [('sleep', False)])
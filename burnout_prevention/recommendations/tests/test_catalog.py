@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from burnout_prevention.recommendations.catalog import CATALOG_VERSION_KEY, get_catalog, get_catalog_version
+from burnout_prevention.recommendations.models import Recommendation, RecommendationType
+from burnout_prevention.users.models import User
+
+
+class RecommendationCatalogTests(TestCase):
+    """
+    Каталог рекомендаций в памяти процесса перезагружается после изменения версии в общем кэше.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.type = RecommendationType.objects.create(name='Сон', description='-')
+        self.recommendation = Recommendation.objects.create(
+            type=self.type, title='Режим сна', description='-', category='sleep'
+        )
+        Recommendation.objects.create(type=self.type, title='Пауза', description='-', category='rest', is_quick=True)
+
+    def test_steady_state_without_queries(self):
+        catalog = get_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), catalog)
+        self.assertEqual(catalog.index, {
+            'sleep': {True: [], False: [self.recommendation.id]},
+            'rest': {True: [self.recommendation.id + 1], False: []},
+        })
+        self.assertEqual(catalog.by_id[self.recommendation.id].type.name, 'Сон')
+
+    def test_invalidated_on_save_after_commit(self):
+        catalog = get_catalog()
+        self.recommendation.title = 'Новый режим сна'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.recommendation.save()
+            # До фиксации транзакции версия не меняется
+            self.assertIs(get_catalog(), catalog)
+        for callback in callbacks:
+            callback()
+
+        reloaded = get_catalog()
+        self.assertGreater(reloaded.version, catalog.version)
+        self.assertEqual(reloaded.by_id[self.recommendation.id].title, 'Новый режим сна')
+
+    def test_invalidated_on_type_delete(self):
+        catalog = get_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.type.delete()
+
+        reloaded = get_catalog()
+        self.assertNotEqual(reloaded.version, catalog.version)
+        self.assertEqual(reloaded.recommendations, [])
+
+    def test_evicted_version_is_not_reused(self):
+        catalog = get_catalog()
+        Recommendation.objects.filter(pk=self.recommendation.pk).update(title='Вне сигналов')
+        cache.delete(CATALOG_VERSION_KEY)
+
+        # Новая версия - текущее время, а не начальное значение счетчика
+        later = (catalog.version + 5) * 1000000
+        with mock.patch('burnout_prevention.recommendations.catalog.time.time_ns', return_value=later):
+            self.assertEqual(get_catalog_version(), catalog.version + 5)
+        self.assertEqual(get_catalog().by_id[self.recommendation.id].title, 'Вне сигналов')
+
+    def test_list_served_from_catalog(self):
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(email='catalog@example.com', username='catalog', password='password')
+        )
+        client.get('/api/recommendations/')
+
+        with self.assertNumQueries(0):
+            response = client.get('/api/recommendations/?category=rest&is_quick=true')
+        self.assertEqual([item['title'] for item in response.json()['results']], ['Пауза'])
+        self.assertEqual(client.get('/api/recommendations/?category=unknown').status_code, 400)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from burnout_prevention.recommendations.catalog import bump_catalog_version
+from burnout_prevention.recommendations.engine import (
+    category_feedback, preferred_categories, rank_recommendations
+)
+from burnout_prevention.recommendations.models import Recommendation, RecommendationType, UserRecommendation
+from burnout_prevention.users.models import User
+
+
+class RankRecommendationsTests(SimpleTestCase):
+    """
+    Ранжирование групп каталога по факторам риска, предпочтениям и обратной связи.
+    """
+
+    def ranked(self, index, factors, **kwargs):
+        return [pk for pk, _, _ in rank_recommendations(index, factors, **kwargs)]
+
+    def test_factor_categories_with_diversity_penalty(self):
+        index = {
+            'mindfulness': {True: [1], False: [2, 3]},
+            'sleep': {False: [4, 5]},
+            'work_balance': {True: [6], False: [7]},
+        }
+        stress = {'stress': {'value': 8, 'weight': 0.2}}
+
+        self.assertEqual(self.ranked(index, stress, count=4), [1, 2, 3, 6])
+        self.assertEqual(self.ranked(index, stress, count=2, exclude={1, 3}), [2, 6])
+
+    def test_quick_recommendations_when_busy(self):
+        index = {'work_balance': {True: [1], False: [2]}, 'rest': {True: [3], False: []}}
+        overtime = {'overtime': {'value': 2, 'weight': 0.15}}
+
+        # Быстрая рекомендация отдыха выше медленной по основной категории фактора
+        self.assertEqual(self.ranked(index, overtime), [1, 3, 2])
+
+    def test_preferences_and_feedback(self):
+        index = {'sleep': {False: [1]}, 'social': {False: [2]}}
+
+        self.assertEqual(self.ranked(index, {}, preferences={'social'}), [2, 1])
+        self.assertEqual(self.ranked(index, {}, feedback={'sleep': 0.5}), [1, 2])
+        self.assertEqual(self.ranked(index, {}, preferences={'social'}, feedback={'social': -1.0}), [1, 2])
+
+
+class RecommendForUserTests(TestCase):
+    """
+    Подбор новых рекомендаций пользователю (POST /api/user-recommendations/request_new/).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='engine@example.com', username='engine', password='password')
+        self.user.profile.preferred_relaxation_methods = ['Социальная активность', 'mindfulness', 'йога']
+        self.user.profile.save()
+        recommendation_type = RecommendationType.objects.create(name='Общие', description='-')
+        self.recommendations = {
+            category: [
+                Recommendation.objects.create(
+                    type=recommendation_type, title=f'{category} {index}', description='-', category=category
+                )
+                for index in range(3)
+            ]
+            for category in ('sleep', 'social')
+        }
+        bump_catalog_version()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_preferred_categories(self):
+        self.assertEqual(preferred_categories(self.user), {'social', 'mindfulness'})
+
+    def test_category_feedback(self):
+        sleep, social = self.recommendations['sleep'], self.recommendations['social']
+        UserRecommendation.objects.create(user=self.user, recommendation=sleep[0], status='completed', user_rating=5)
+        UserRecommendation.objects.create(user=self.user, recommendation=sleep[1], status='rejected')
+        UserRecommendation.objects.create(user=self.user, recommendation=social[0])
+
+        self.assertEqual(category_feedback(self.user), {'sleep': 0.25, 'social': 0.0})
+
+    @mock.patch('burnout_prevention.recommendations.engine.POPULATION_WEIGHT', 0)
+    def test_request_new(self):
+        response = self.client.post('/api/user-recommendations/request_new/', {'count': 3}, format='json')
+        self.assertEqual(response.status_code, 201)
+        # Без записей баллы качества сна (оценка по умолчанию 7) дают категории сна
+        # меньшую оценку, чем предпочитаемой категории, до второго штрафа за разнообразие
+        self.assertEqual(
+            [(item['recommendation']['category'], item['reason']) for item in response.json()],
+            [
+                ('social', 'Подобрано с учетом: предпочитаемый метод релаксации'),
+                ('social', 'Подобрано с учетом: предпочитаемый метод релаксации'),
+                ('sleep', 'Подобрано с учетом: низкое качество сна'),
+            ]
+        )
+
+        # Уже назначенные рекомендации не повторяются
+        response = self.client.post('/api/user-recommendations/request_new/', {'count': 5}, format='json')
+        self.assertEqual(len(response.json()), 3)
+        self.assertEqual(
+            UserRecommendation.objects.filter(user=self.user).values('recommendation').distinct().count(), 6
+        )
+        response = self.client.post('/api/user-recommendations/request_new/', format='json')
+        self.assertEqual((response.status_code, response.json()), (201, []))
+
+    def test_invalid_count(self):
+        for count in (0, 21, 'много'):
+            with self.subTest(count=count):
+                response = self.client.post('/api/user-recommendations/request_new/', {'count': count}, format='json')
+                self.assertEqual(response.status_code, 400)
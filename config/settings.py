@@ -1,6 +1,8 @@
 import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -76,6 +78,32 @@ DATABASES = {
     }
 }
 
+# Cache settings
+# Redis в продакшене (REDIS_CACHE_URL), локальная память для разработки
+REDIS_CACHE_URL = os.environ.get('REDIS_CACHE_URL')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Время жизни кэша панели мониторинга (секунды); кэш также сбрасывается при изменении данных
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 300))
+
+# Время жизни кэша статистики рекомендаций (секунды); кэш также сбрасывается при изменении рекомендаций пользователя
+RECOMMENDATION_STATS_CACHE_TIMEOUT = int(os.environ.get('RECOMMENDATION_STATS_CACHE_TIMEOUT', 3600))
+
+# Период обновления счетчиков обратной связи, используемых при подборе рекомендаций (секунды)
+RECOMMENDATION_BANDIT_REFRESH_SECONDS = int(os.environ.get('RECOMMENDATION_BANDIT_REFRESH_SECONDS', 300))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -114,7 +142,26 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # JSON через orjson (без orjson - стандартный модуль json)
+    'DEFAULT_RENDERER_CLASSES': [
+        'burnout_prevention.api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'burnout_prevention.api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
+# MessagePack (Accept: application/msgpack) доступен, если установлен пакет msgpack
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('burnout_prevention.api.renderers.MessagePackRenderer')
+
+# Максимальное количество записей в одном запросе пакетного создания
+BULK_CREATE_MAX_RECORDS = int(os.environ.get('BULK_CREATE_MAX_RECORDS', 5000))
+
+# Максимальное количество изменений в одном запросе пакетного обновления рекомендаций пользователя
+BULK_UPDATE_MAX_RECORDS = int(os.environ.get('BULK_UPDATE_MAX_RECORDS', 1000))
 
 # drf-yasg settings
 SWAGGER_SETTINGS = {
@@ -147,10 +194,32 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
     'http://localhost:3000,http://127.0.0.1:3000'
 ).split(',')
 
+# Версия модели риска выгорания (см. burnout_prevention/analytics/risk_models.py)
+BURNOUT_RISK_MODEL_VERSION = os.environ.get('BURNOUT_RISK_MODEL_VERSION', 'v1')
+
 # Celery settings
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = TIME_ZONE 
\ No newline at end of file
+CELERY_TIMEZONE = TIME_ZONE
+# Синхронное выполнение задач без брокера включается явно (локальная разработка, тесты)
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'False') == 'True'
+CELERY_BEAT_SCHEDULE = {
+    # Ежедневный снимок риска выгорания для всех пользователей
+    'compute-daily-burnout-risk': {
+        'task': 'burnout_prevention.analytics.tasks.compute_daily_burnout_risk',
+        'schedule': crontab(hour=0, minute=30),
+    },
+    # Корреляции показателей за предыдущие недели, в начале каждой недели
+    'compute-weekly-correlations': {
+        'task': 'burnout_prevention.analytics.tasks.compute_weekly_correlations',
+        'schedule': crontab(hour=1, minute=0, day_of_week='mon'),
+    },
+    # Сверка счетчиков обратной связи по рекомендациям с таблицей рекомендаций пользователей
+    'reconcile-recommendation-stats': {
+        'task': 'burnout_prevention.recommendations.tasks.reconcile_recommendation_stats',
+        'schedule': crontab(hour=2, minute=0),
+    },
+}